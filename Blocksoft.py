@@ -1,8 +1,7 @@
-﻿import tkinter as tk
-from tkinter import ttk, messagebox
-from PIL import Image, ImageGrab, ImageFilter, ImageTk, ImageOps, ImageDraw
-import pytesseract
-import time
+﻿import time
+# Cold-start reference point, taken before anything heavy is imported
+_PROCESS_START = time.perf_counter()
+from PIL import Image, ImageGrab, ImageFilter, ImageOps, ImageDraw, ImageChops
 import sys
 import gc
 import threading
@@ -10,12 +9,60 @@ import json
 import os
 import shutil
 import tempfile
-import subprocess
+import multiprocessing
+import hashlib
+import concurrent.futures
+import argparse
+import platform
+import logging
+import logging.handlers
+import ctypes
+import ctypes.util
+import importlib
+import functools
+import itertools
+import signal
+from collections import namedtuple, OrderedDict, deque, ChainMap
 
-try:
-    import pystray  # optional: enables system tray support
-except Exception:
-    pystray = None
+
+class _LazyModule:
+    """Stand-in for a module that is only imported on first attribute access.
+
+    Keeps the Tk stack and pytesseract (which pulls in NumPy) out of
+    start-up, and out of headless runs entirely.
+    """
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+tk = _LazyModule('tkinter')
+ttk = _LazyModule('tkinter.ttk')
+messagebox = _LazyModule('tkinter.messagebox')
+ImageTk = _LazyModule('PIL.ImageTk')
+pytesseract = _LazyModule('pytesseract')
+
+
+@functools.lru_cache(maxsize=None)
+def _optional_module(name):
+    """Import an optional dependency on first use; None if it is not installed.
+
+    Used for pystray (system tray), tesserocr (in-process OCR engine) and
+    NumPy (allocation-free X11 grayscale conversion).
+    """
+    try:
+        return importlib.import_module(name)
+    except Exception:
+        return None
+
+
+APP_VERSION = '1.1.0'
 
 # --- Path handling for exe distribution ---
 def get_base_dir():
@@ -27,8 +74,9 @@ def get_base_dir():
         # Running as script
         return os.path.dirname(os.path.abspath(__file__))
 
+@functools.lru_cache(maxsize=None)
 def find_tesseract():
-    """Auto-detect Tesseract installation."""
+    """Auto-detect Tesseract installation (once per process; the result is cached)."""
     possible_paths = [
         r"C:\Program Files\Tesseract-OCR\tesseract.exe",
         r"C:\Program Files (x86)\Tesseract-OCR\tesseract.exe",
@@ -37,15 +85,10 @@ def find_tesseract():
         os.path.join(get_base_dir(), 'tesseract-ocr', 'tesseract.exe')
     ]
 
-    # Also check PATH environment variable
-    try:
-        result = subprocess.run(['where', 'tesseract.exe'], capture_output=True, text=True, timeout=2)
-        if result.returncode == 0:
-            path = result.stdout.strip().split('\n')[0]
-            if os.path.exists(path):
-                return path
-    except Exception:
-        pass
+    # Also check PATH environment variable (in-process lookup, no `where` subprocess)
+    path = shutil.which('tesseract')
+    if path and os.path.exists(path):
+        return path
 
     # Check possible paths
     for path in possible_paths:
@@ -55,6 +98,14 @@ def find_tesseract():
     # Default if nothing found
     return possible_paths[0]
 
+
+def resolve_tesseract_cmd(settings):
+    """Configured tesseract path if it exists, else the auto-detected one."""
+    path = settings.get('tesseract_cmd') or ''
+    if path and os.path.exists(path):
+        return path
+    return find_tesseract()
+
 # --- Defaults / config persistence ---
 BASE_DIR = get_base_dir()
 CONFIG_PATH = os.path.join(BASE_DIR, 'psg_config.json')
@@ -69,20 +120,81 @@ DEFAULT_SETTINGS = {
     "blur_radius": 25,
     "screenshot_scale": 1.0,
     "force_gc_interval": 5,
-    "tesseract_cmd": find_tesseract(),
+    "tesseract_cmd": "",  # resolved lazily by resolve_tesseract_cmd()
     "fade_overlay": True,
+    "blur_mode": "full",
+    "blur_region_margin": 16,
+    "blur_method": "fast",
     "overlay_alpha": 0.98,
     "overlay_fade_ms": 300,
     "overlay_fade_steps": 10,
     "ocr_lang": "eng",
+    "script_routing": False,
+    "script_min_conf": 1.0,
     "ocr_psm": 6,
     "ocr_oem": 3,
+    "ocr_backend": "auto",
+    "preprocess_chain": ["grayscale", "resize"],
+    "resize_method": "reduce",
+    "autocontrast_cutoff": 1.0,
+    "threshold_radius": 8,
+    "threshold_offset": 12,
+    "tile_ocr_enabled": False,
+    "tile_size": 1024,
+    "tile_overlap": 64,
+    "ocr_workers": 0,
+    "tile_cache_enabled": False,
+    "tile_cache_max_mb": 16,
+    "text_regions_enabled": False,
+    "text_region_cell": 16,
+    "text_region_min_density": 0.04,
+    "text_region_max_density": 0.5,
+    "fuzzy_max_distance": 0,
+    "fuzzy_split_words": None,
+    "cascade_enabled": False,
+    "cascade_reduce": 3,
+    "cascade_psm": 11,
+    "cascade_partial": 0.6,
+    "cascade_dense_words": 8,
+    "cascade_min_conf": 60,
+    "cascade_margin": 12,
+    "scroll_incremental": False,
+    "scroll_strip_margin": 32,
+    "scroll_max_dirty": 0.6,
     "cleanup_enabled": True,
     "cleanup_interval_hours": 24,
     "cleanup_temp_files": True,
     "cleanup_cache": True,
+    "temp_max_age_minutes": 10,
+    "cleanup_tick_seconds": 60,
+    "cleanup_batch_size": 50,
     "start_minimized": False,
     "minimize_to_tray": True,
+    "skip_unchanged_frames": True,
+    "change_threshold": 6.0,
+    "min_check_interval": 0.5,
+    "max_check_interval": 10.0,
+    "idle_backoff": 1.5,
+    "scan_cpu_budget": 0.5,
+    "near_miss_ratio": 0.8,
+    "pipeline_enabled": False,
+    "title_prescreen": True,
+    "idle_pause_seconds": 0,
+    "pause_when_locked": True,
+    "idle_poll_interval": 1.0,
+    "status_update_interval": 0.5,
+    "cpu_budget_percent": 0,
+    "cpu_budget_window": 10,
+    "tesseract_threads": 1,
+    "process_priority": "below_normal",
+    "capture_backend": "auto",
+    "capture_monitor": -1,
+    "multi_monitor": True,
+    "metrics_log_enabled": False,
+    "metrics_log_interval": 60,
+    "metrics_log_max_kb": 1024,
+    "metrics_log_backups": 3,
+    "metrics_http_port": 0,
 }
 
 def load_settings():
@@ -99,9 +211,7 @@ def load_settings():
             # merge defaults
             settings = DEFAULT_SETTINGS.copy()
             settings.update(data)
-            # Re-verify tesseract path on load
-            if not os.path.exists(settings.get('tesseract_cmd', '')):
-                settings['tesseract_cmd'] = find_tesseract()
+            # A stale tesseract path is replaced lazily by resolve_tesseract_cmd()
             return settings
     except Exception:
         pass
@@ -124,181 +234,3888 @@ def save_settings(settings):
         except Exception as e2:
             print(f'Fallback save also failed: {e2}')
 
-def cleanup_temp_files():
-    """Clean up temporary files and cache."""
-    try:
-        temp_dir = tempfile.gettempdir()
-        removed_count = 0
-        # Look for pytesseract or PIL temporary files
-        if os.path.exists(temp_dir):
-            for filename in os.listdir(temp_dir):
-                if 'pil' in filename.lower() or 'tess' in filename.lower() or 'ocr' in filename.lower():
-                    fpath = os.path.join(temp_dir, filename)
-                    try:
-                        if os.path.isfile(fpath):
-                            os.remove(fpath)
-                            removed_count += 1
-                        elif os.path.isdir(fpath):
-                            shutil.rmtree(fpath)
-                            removed_count += 1
-                    except Exception:
-                        pass
-        return removed_count
-    except Exception as e:
-        print(f"Error during cleanup: {e}")
-        return 0
+# --- Temp file management ---
+TEMP_ROOT = os.path.join(tempfile.gettempdir(), 'PrivacyScreenGuard')
+TEMP_OWNER_MARKER = '.psg-owner'
 
 
-class BlurOverlay:
-    def __init__(self, parent, image, fade=True, alpha_target=0.98, fade_ms=300, fade_steps=10, on_close=None):
-        # image is a PIL Image sized to the screen
-        self.root = tk.Toplevel(parent)
-        self.root.overrideredirect(True)
-        self.root.attributes('-topmost', True)
+def _remove_path(path):
+    if os.path.isdir(path) and not os.path.islink(path):
+        shutil.rmtree(path)
+    else:
+        os.remove(path)
+
+
+class TempFileRegistry:
+    """Tracks the temporary files this app creates, and only those.
+
+    Each run gets a private directory under ``TEMP_ROOT`` holding an owner
+    marker. ``install()`` makes it the process default temp dir, so the
+    per-call images pytesseract writes land there as well.
+    """
+
+    def __init__(self, root=TEMP_ROOT):
+        self.root = root
+        self.path = None
+
+    def install(self):
+        if self.path is None:
+            os.makedirs(self.root, exist_ok=True)
+            self.path = tempfile.mkdtemp(prefix=f'run-{os.getpid()}-', dir=self.root)
+            with open(os.path.join(self.path, TEMP_OWNER_MARKER), 'w', encoding='utf-8') as f:
+                f.write(str(os.getpid()))
+            tempfile.tempdir = self.path
+        return self.path
+
+    def heartbeat(self):
+        """Mark this run's directory as live so other instances leave it alone."""
+        if self.path:
+            try:
+                os.utime(os.path.join(self.path, TEMP_OWNER_MARKER))
+            except OSError:
+                pass
+
+    def expire(self, max_age, limit=None):
+        """Delete up to ``limit`` of our files older than ``max_age`` seconds; return the count."""
+        now = time.time()
+        removed = 0
+        if self.path is None or not os.path.isdir(self.path):
+            return removed
+        # Only our own directory is listed, never the shared system temp dir
+        with os.scandir(self.path) as entries:
+            for entry in entries:
+                if limit is not None and removed >= limit:
+                    break
+                if entry.name == TEMP_OWNER_MARKER:
+                    continue
+                try:
+                    if now - entry.stat(follow_symlinks=False).st_mtime >= max_age:
+                        _remove_path(entry.path)
+                        removed += 1
+                except Exception:
+                    pass
+        return removed
+
+    def sweep_stale_runs(self, max_age, limit=None):
+        """Remove private directories left behind by earlier runs that crashed."""
+        now = time.time()
+        removed = 0
+        try:
+            entries = list(os.scandir(self.root))
+        except OSError:
+            return 0
+        for entry in entries:
+            if limit is not None and removed >= limit:
+                break
+            if entry.path == self.path or not entry.name.startswith('run-'):
+                continue
+            marker = os.path.join(entry.path, TEMP_OWNER_MARKER)
+            try:
+                # No marker means the directory is not one of ours
+                if now - os.stat(marker).st_mtime >= max_age:
+                    shutil.rmtree(entry.path)
+                    removed += 1
+            except Exception:
+                pass
+        return removed
+
+    def close(self):
+        if self.path is None:
+            return
+        if tempfile.tempdir == self.path:
+            tempfile.tempdir = None
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.path = None
+
+
+class CleanupWorker(threading.Thread):
+    """Low-priority thread that expires the app's temp files a few at a time.
+
+    Runs independently of detection, so cleanup never delays a scan.
+    Files younger than ``IN_USE_SECONDS`` are never removed: pytesseract's
+    input and output files only live for one OCR call on a checker thread,
+    and deleting them mid-call fails that scan.
+    """
+
+    IN_USE_SECONDS = 60
+
+    def __init__(self, settings, registry=None, metrics=None):
+        super().__init__(daemon=True)
+        self.settings = settings
+        self.registry = registry or TempFileRegistry()
+        self.metrics = metrics
+        self.total_removed = 0
+        self.last_sweep_time = time.time()
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def _lower_priority():
         try:
-            self.root.attributes('-fullscreen', True)
+            if sys.platform == 'win32':
+                kernel32 = ctypes.windll.kernel32
+                kernel32.SetThreadPriority(kernel32.GetCurrentThread(), -2)  # THREAD_PRIORITY_LOWEST
+            elif hasattr(os, 'setpriority') and hasattr(threading, 'get_native_id'):
+                # On Linux a thread id passed as PRIO_PROCESS renices just this thread
+                os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), 19)
         except Exception:
             pass
-        self.root.config(cursor='none')
-        self._on_close = on_close
-        self._alpha_target = float(alpha_target)
-        self._fade_steps = max(1, int(fade_steps))
-        self._fade_ms = max(1, int(fade_ms))
-        self._fade_step = 0
 
-        self.photo = ImageTk.PhotoImage(image)
-        self.label = tk.Label(self.root, image=self.photo)
-        self.label.pack(fill='both', expand=True)
+    def _enabled(self):
+        return (self.settings.get('cleanup_enabled', True)
+                and (self.settings.get('cleanup_temp_files', True) or self.settings.get('cleanup_cache', True)))
+
+    def step(self):
+        """One bounded unit of work; return the number of entries removed."""
+        self.registry.heartbeat()
+        if not self._enabled():
+            return 0
+        t0 = time.perf_counter()
+        max_age = max(self.IN_USE_SECONDS, float(self.settings.get('temp_max_age_minutes', 10)) * 60)
+        batch = int(self.settings.get('cleanup_batch_size', 50))
+        removed = self.registry.expire(max_age, limit=batch)
+        sweep_secs = float(self.settings.get('cleanup_interval_hours', 24)) * 3600
+        if time.time() - self.last_sweep_time > sweep_secs:
+            # A live run refreshes its marker every tick, so a day-old marker is orphaned
+            removed += self.registry.sweep_stale_runs(max(max_age, sweep_secs), limit=batch)
+            self.last_sweep_time = time.time()
+        if removed:
+            if self.metrics is not None:
+                self.metrics.record('cleanup', time.perf_counter() - t0)
+            self.total_removed += removed
+            print(f'[Cleanup] Removed {removed} temporary files.')
+        return removed
+
+    def run_now(self):
+        """Remove everything the app has left in temp, including orphaned runs, except files in use."""
+        t0 = time.perf_counter()
+        removed = self.registry.expire(self.IN_USE_SECONDS) + self.registry.sweep_stale_runs(
+            float(self.settings.get('cleanup_interval_hours', 24)) * 3600)
+        if self.metrics is not None:
+            self.metrics.record('cleanup', time.perf_counter() - t0)
+        self.total_removed += removed
+        self.last_sweep_time = time.time()
+        return removed
+
+    def run(self):
+        self._lower_priority()
+        while not self._stop_event.wait(float(self.settings.get('cleanup_tick_seconds', 60))):
+            try:
+                self.step()
+            except Exception as e:
+                print(f"Error during cleanup: {e}")
+
+    def stop(self):
+        self._stop_event.set()
+        self.registry.close()
+
+
+def start_cleanup(settings, metrics=None):
+    """Install the private temp dir and start its cleanup worker."""
+    worker = CleanupWorker(settings, metrics=metrics)
+    try:
+        worker.registry.install()
+    except Exception as e:
+        print(f'Could not create private temp dir: {e}')
+    worker.start()
+    return worker
+
+
+# --- OCR backends ---
+# box is (left, top, right, bottom) in image pixels; words sharing ``line`` are on one text line
+OcrWord = namedtuple('OcrWord', ['text', 'box', 'conf', 'line'])
+
+
+class OcrBackend:
+    """Interface for OCR engines used by ScreenChecker.
+
+    Backends are created once and reused for every check; ``close`` releases
+    whatever engine state they keep alive.
+    """
+
+    name = 'base'
+
+    def image_to_string(self, image, lang='eng', psm=6, oem=3):
+        raise NotImplementedError
+
+    def image_to_data(self, image, lang='eng', psm=6, oem=3):
+        """Return an OcrWord per recognized word, in reading order."""
+        raise NotImplementedError
+
+    def detect_script(self, image):
+        """Return ``(script, confidence)`` from orientation and script detection.
+
+        ``script`` is a tesseract OSD name such as 'Latin' or 'Cyrillic', or
+        None when there is too little text to tell.
+        """
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+
+class PytesseractBackend(OcrBackend):
+    """Fallback backend: one tesseract process (and temp image) per call."""
+
+    name = 'pytesseract'
+
+    def __init__(self, tesseract_cmd=None):
+        if sys.platform == 'win32':
+            if tesseract_cmd:
+                pytesseract.pytesseract.tesseract_cmd = tesseract_cmd
+            _install_tesseract_priority_class()
+
+    @staticmethod
+    def _nice():
+        # pytesseract runs ``nice -n N tesseract ...``; on Windows the priority class does this
+        return 0 if sys.platform == 'win32' else _priority_levels(_tesseract_priority)[0]
+
+    def image_to_string(self, image, lang='eng', psm=6, oem=3):
+        try:
+            config = f'--oem {oem} --psm {psm}'
+            return pytesseract.image_to_string(image, lang=lang, config=config, nice=self._nice())
+        except TypeError:
+            # Older pytesseract versions may not accept lang/config kw
+            return pytesseract.image_to_string(image)
+
+    def image_to_data(self, image, lang='eng', psm=6, oem=3):
+        config = f'--oem {oem} --psm {psm}'
+        data = pytesseract.image_to_data(image, lang=lang, config=config, nice=self._nice(),
+                                         output_type=pytesseract.Output.DICT)
+        words = []
+        for i, text in enumerate(data['text']):
+            # Level 5 rows are words; the others describe pages, blocks, paragraphs and lines
+            if int(data['level'][i]) != 5 or not text.strip():
+                continue
+            left, top = int(data['left'][i]), int(data['top'][i])
+            box = (left, top, left + int(data['width'][i]), top + int(data['height'][i]))
+            line = (data['block_num'][i], data['par_num'][i], data['line_num'][i])
+            words.append(OcrWord(text, box, float(data['conf'][i]), line))
+        return words
+
+    def detect_script(self, image):
+        try:
+            osd = pytesseract.image_to_osd(image, config='--psm 0', nice=self._nice(),
+                                           output_type=pytesseract.Output.DICT)
+        except pytesseract.TesseractError:
+            # Raised for regions with too few characters
+            return None, 0.0
+        return osd.get('script'), float(osd.get('script_conf', 0.0))
+
+
+class TesserocrBackend(OcrBackend):
+    """Persistent in-process engine through the tesserocr API binding.
+
+    One ``PyTessBaseAPI`` is kept per (lang, psm, oem) so traineddata is
+    loaded once; images are handed over in memory, no temp files involved.
+    """
+
+    name = 'tesserocr'
+
+    def __init__(self, tesseract_cmd=None):
+        self._tesserocr = _optional_module('tesserocr')
+        if self._tesserocr is None:
+            raise RuntimeError('tesserocr is not installed')
+        self._tessdata = self._find_tessdata(tesseract_cmd)
+        self._apis = {}
+        self._lock = threading.Lock()
+        # Fail early (and let the caller fall back) if no traineddata can be found
+        _, langs = self._tesserocr.get_languages(self._tessdata or '')
+        if not langs:
+            raise RuntimeError('no Tesseract traineddata found')
+
+    @staticmethod
+    def _find_tessdata(tesseract_cmd):
+        if tesseract_cmd:
+            candidate = os.path.join(os.path.dirname(tesseract_cmd), 'tessdata')
+            if os.path.isdir(candidate):
+                return candidate
+        return None
+
+    def _get_api(self, lang, psm, oem):
+        key = (lang, int(psm), int(oem))
+        api = self._apis.get(key)
+        if api is None:
+            kwargs = {'lang': lang, 'psm': int(psm), 'oem': int(oem)}
+            if self._tessdata:
+                kwargs['path'] = self._tessdata
+            api = self._tesserocr.PyTessBaseAPI(**kwargs)
+            self._apis[key] = api
+        return api
+
+    def image_to_string(self, image, lang='eng', psm=6, oem=3):
+        with self._lock:
+            api = self._get_api(lang, psm, oem)
+            api.SetImage(image)
+            try:
+                return api.GetUTF8Text()
+            finally:
+                api.Clear()
+
+    def image_to_data(self, image, lang='eng', psm=6, oem=3):
+        level = self._tesserocr.RIL.WORD
+        with self._lock:
+            api = self._get_api(lang, psm, oem)
+            api.SetImage(image)
+            try:
+                api.Recognize()
+                iterator = api.GetIterator()
+                if iterator is None:
+                    return []
+                words = []
+                line = 0
+                for item in self._tesserocr.iterate_level(iterator, level):
+                    if item.IsAtBeginningOf(self._tesserocr.RIL.TEXTLINE):
+                        line += 1
+                    text = item.GetUTF8Text(level)
+                    box = item.BoundingBox(level)
+                    if text and text.strip() and box:
+                        words.append(OcrWord(text, tuple(box), item.Confidence(level), line))
+                return words
+            finally:
+                api.Clear()
+
+    def detect_script(self, image):
+        with self._lock:
+            api = self._get_api('osd', self._tesserocr.PSM.OSD_ONLY, 3)
+            api.SetImage(image)
+            try:
+                osd = api.DetectOrientationScript()
+            finally:
+                api.Clear()
+        if not osd:
+            return None, 0.0
+        return osd.get('script_name'), float(osd.get('script_conf', 0.0))
+
+    def close(self):
+        with self._lock:
+            for api in self._apis.values():
+                try:
+                    api.End()
+                except Exception:
+                    pass
+            self._apis.clear()
+
+
+OCR_BACKENDS = {
+    'tesserocr': TesserocrBackend,
+    'pytesseract': PytesseractBackend,
+}
+
+# Tesseract OSD script names and the traineddata that read them
+SCRIPT_LANGS = {
+    'Latin': ('eng', 'deu', 'fra', 'spa', 'ita', 'por', 'nld', 'pol', 'ces', 'slk', 'hun', 'ron', 'tur',
+              'swe', 'dan', 'nor', 'fin', 'est', 'lav', 'lit', 'hrv', 'slv', 'vie', 'ind', 'msa'),
+    'Cyrillic': ('rus', 'ukr', 'bel', 'bul', 'srp', 'mkd', 'kaz'),
+    'Greek': ('ell', 'grc'),
+    'Arabic': ('ara', 'fas', 'urd', 'pus'),
+    'Hebrew': ('heb', 'yid'),
+    'Han': ('chi_sim', 'chi_tra', 'chi_sim_vert', 'chi_tra_vert', 'jpn'),
+    'Japanese': ('jpn', 'jpn_vert'),
+    'Katakana': ('jpn',),
+    'Hiragana': ('jpn',),
+    'Korean': ('kor', 'kor_vert'),
+    'Hangul': ('kor', 'kor_vert'),
+    'Devanagari': ('hin', 'mar', 'nep', 'san'),
+    'Thai': ('tha',),
+    'Georgian': ('kat',),
+    'Armenian': ('hye',),
+}
+
+
+def languages_for_script(script, lang):
+    """Narrow an ``ocr_lang`` string such as 'eng+rus' to the languages written in ``script``.
+
+    Returns None when the script is unknown or none of the languages use it.
+    """
+    wanted = SCRIPT_LANGS.get(script or '')
+    if not wanted:
+        return None
+    picked = [name for name in lang.split('+') if name in wanted]
+    return '+'.join(picked) or None
+
+
+def create_ocr_backend(settings):
+    """Build the OCR backend selected by ``ocr_backend``, falling back to pytesseract."""
+    choice = str(settings.get('ocr_backend', 'auto') or 'auto').lower()
+    tesseract_cmd = resolve_tesseract_cmd(settings)
+    order = ['tesserocr', 'pytesseract'] if choice == 'auto' else [choice, 'pytesseract']
+    for name in order:
+        backend_cls = OCR_BACKENDS.get(name)
+        if backend_cls is None:
+            continue
+        try:
+            return backend_cls(tesseract_cmd)
+        except Exception as e:
+            if choice != 'auto' or name != 'tesserocr':
+                print(f'OCR backend {name!r} unavailable: {e}')
+    return PytesseractBackend(tesseract_cmd)
+
+
+# --- Tile-parallel OCR ---
+TileResult = namedtuple('TileResult', ['index', 'box', 'text', 'seconds', 'status'])
+
+
+def split_tiles(width, height, tile_size, overlap):
+    """Return (left, top, right, bottom) boxes covering the frame.
+
+    Neighbouring tiles share ``overlap`` pixels so a word sitting on a tile
+    boundary is seen whole by at least one tile.
+    """
+    tile_size = max(64, int(tile_size))
+    overlap = max(0, min(int(overlap), tile_size // 2))
+    step = tile_size - overlap
+
+    def _starts(length):
+        if length <= tile_size:
+            return [0]
+        starts = list(range(0, length - tile_size, step))
+        starts.append(length - tile_size)
+        return starts
+
+    return [
+        (left, top, min(width, left + tile_size), min(height, top + tile_size))
+        for top in _starts(height)
+        for left in _starts(width)
+    ]
+
+
+_worker_backend = None
+
+
+def _init_ocr_worker(backend_settings):
+    global _worker_backend
+    if backend_settings.get('temp_dir'):
+        tempfile.tempdir = backend_settings['temp_dir']
+    # The worker only runs OCR, so the whole process (and its tesseract children) can go low
+    lower_process_priority(backend_settings.get('process_priority', 'normal'))
+    _worker_backend = create_ocr_backend(backend_settings)
+
+
+def _ocr_tile_job(index, image, lang, psm, oem):
+    """Runs in a pool process: OCR one tile with that process's resident backend."""
+    t0 = time.perf_counter()
+    text = _worker_backend.image_to_string(image, lang=lang, psm=psm, oem=oem)
+    return index, text, time.perf_counter() - t0
+
+
+class TileOcrPool:
+    """Process pool that OCRs tiles concurrently and stops at the first hit."""
+
+    def __init__(self):
+        self._executor = None
+        self._key = None
+
+    @staticmethod
+    def worker_count(settings):
+        workers = int(settings.get('ocr_workers', 0) or 0)
+        if workers <= 0:
+            workers = max(1, (os.cpu_count() or 2) - 1)
+        return workers
+
+    def _get_executor(self, settings):
+        backend_settings = {
+            'ocr_backend': settings.get('ocr_backend', 'auto'),
+            'tesseract_cmd': settings.get('tesseract_cmd'),
+            'process_priority': settings.get('process_priority', 'below_normal'),
+            # Spawned workers do not inherit tempfile.tempdir
+            'temp_dir': tempfile.gettempdir(),
+        }
+        key = (self.worker_count(settings), tuple(sorted(backend_settings.items())))
+        if self._executor is None or key != self._key:
+            self.close()
+            self._executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=key[0],
+                initializer=_init_ocr_worker,
+                initargs=(backend_settings,),
+            )
+            self._key = key
+        return self._executor
+
+    def run_jobs(self, jobs, settings, matcher, lang, psm, oem, langs=None):
+        """OCR ``(index, box, tile_image)`` jobs concurrently; return TileResults by index.
+
+        ``langs`` optionally maps a job index to its own language.  Stops at
+        the first tile whose text matches: remaining jobs are cancelled and
+        reported with status ``'cancelled'``.
+        """
+        executor = self._get_executor(settings)
+        langs = langs or {}
+        futures = {
+            executor.submit(_ocr_tile_job, index, tile, langs.get(index, lang), psm, oem): (index, box)
+            for index, box, tile in jobs
+        }
+        results = {}
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                index, text, seconds = future.result()
+                results[index] = TileResult(index, futures[future][1], text, seconds, 'done')
+                if matcher.search(text):
+                    break
+        except concurrent.futures.process.BrokenProcessPool:
+            self.close()
+            raise
+        finally:
+            for future, (index, box) in futures.items():
+                if index not in results:
+                    future.cancel()
+                    results[index] = TileResult(index, box, '', 0.0, 'cancelled')
+        return [results[i] for i in sorted(results)]
+
+    def close(self):
+        if self._executor is not None:
+            try:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            except Exception:
+                pass
+        self._executor = None
+        self._key = None
+
+
+# --- Preprocessing ---
+RESIZE_FILTERS = {
+    'nearest': Image.NEAREST,
+    'box': Image.BOX,
+    'bilinear': Image.BILINEAR,
+    'hamming': Image.HAMMING,
+    'bicubic': Image.BICUBIC,
+    'lanczos': Image.LANCZOS,
+}
+
+
+def _step_grayscale(img, settings):
+    return img if img.mode == 'L' else img.convert('L')
+
+
+def _step_resize(img, settings):
+    scale = max(0.25, float(settings.get('screenshot_scale', 1.0)))
+    if scale == 1.0:
+        return img
+    size = (max(1, int(img.width * scale)), max(1, int(img.height * scale)))
+    method = settings.get('resize_method', 'reduce')
+    if method != 'reduce':
+        return img.resize(size, RESIZE_FILTERS.get(method, Image.LANCZOS))
+    # Integer box-average first (cheap), then close any remaining gap with bilinear
+    factor = int(1.0 / scale + 1e-6)
+    if factor > 1:
+        img = img.reduce(factor)
+    if abs(img.width - size[0]) > 1 or abs(img.height - size[1]) > 1:
+        img = img.resize(size, Image.BILINEAR)
+    return img
+
+
+def _step_autocontrast(img, settings):
+    return ImageOps.autocontrast(img, cutoff=float(settings.get('autocontrast_cutoff', 1.0)))
+
+
+def _step_threshold(img, settings):
+    """Adaptive binarization: pixels that differ from their local mean become black text.
+
+    Using the absolute difference handles dark-on-light and light-on-dark
+    text alike, which a plain global threshold does not.
+    """
+    img = _step_grayscale(img, settings)
+    radius = max(1, int(settings.get('threshold_radius', 8)))
+    offset = int(settings.get('threshold_offset', 12))
+    mean = img.filter(ImageFilter.BoxBlur(radius))
+    # difference() plus a lookup-table point() measured faster than the NumPy equivalent
+    return ImageChops.difference(img, mean).point(lambda v: 0 if v > offset else 255)
+
+
+# Applied in the order listed by the 'preprocess_chain' setting
+PREPROCESS_STEPS = OrderedDict([
+    ('grayscale', _step_grayscale),
+    ('resize', _step_resize),
+    ('autocontrast', _step_autocontrast),
+    ('threshold', _step_threshold),
+])
+
+DEFAULT_PREPROCESS_CHAIN = ['grayscale', 'resize']
+
+
+def preprocess_chain(settings):
+    """Return the configured step names, ignoring unknown ones; the result is always grayscale."""
+    chain = [name for name in (settings.get('preprocess_chain') or DEFAULT_PREPROCESS_CHAIN)
+             if name in PREPROCESS_STEPS]
+    if 'grayscale' not in chain:
+        chain.append('grayscale')
+    return chain
+
+
+def run_preprocess(img, settings, record=None):
+    """Run ``img`` through the preprocessing chain; ``record(step, seconds)`` gets each timing."""
+    for name in preprocess_chain(settings):
+        t0 = time.perf_counter()
+        img = PREPROCESS_STEPS[name](img, settings)
+        if record is not None:
+            record(name, time.perf_counter() - t0)
+    return img
+
+
+# --- Text region proposals ---
+def _merge_boxes(boxes, gap):
+    """Merge (left, top, right, bottom) boxes that overlap or lie within ``gap`` pixels."""
+    boxes = list(boxes)
+    merged = True
+    while merged:
+        merged = False
+        out = []
+        while boxes:
+            l, t, r, b = boxes.pop()
+            i = 0
+            while i < len(boxes):
+                l2, t2, r2, b2 = boxes[i]
+                if l2 <= r + gap and l <= r2 + gap and t2 <= b + gap and t <= b2 + gap:
+                    l, t, r, b = min(l, l2), min(t, t2), max(r, r2), max(b, b2)
+                    boxes.pop(i)
+                    merged = True
+                else:
+                    i += 1
+            out.append((l, t, r, b))
+        boxes = out
+    return boxes
+
+
+def propose_text_regions(gray, settings):
+    """Return boxes of ``gray`` likely to contain text, in reading order.
+
+    The frame is cut into ``text_region_cell``-pixel cells and each cell's
+    density of strong edges is measured (edge filter, threshold, box
+    reduce: all in C).  Text has a moderate density; flat backgrounds have
+    almost none and photos or video mostly have soft gradients or dense
+    texture, so cells outside [min, max] density are dropped.  Neighbouring
+    text cells are grouped and their boxes merged, with one cell of margin;
+    hollow groups (the outline of a picture) are discarded.
+    """
+    cell = max(4, int(settings.get('text_region_cell', 16)))
+    lo = float(settings.get('text_region_min_density', 0.04)) * 255
+    hi = float(settings.get('text_region_max_density', 0.5)) * 255
+    width, height = gray.size
+    edges = gray.filter(ImageFilter.FIND_EDGES).point(lambda v: 255 if v > 48 else 0)
+    # Kernel filters leave the outermost pixels unfiltered; they are not edges
+    ImageDraw.Draw(edges).rectangle((0, 0, width - 1, height - 1), outline=0)
+    density = edges.reduce(cell)
+    cols, rows = density.size
+    data = density.tobytes()
+    mask = [lo <= v <= hi for v in data]
+
+    boxes = []
+    seen = bytearray(len(mask))
+    for start, on in enumerate(mask):
+        if not on or seen[start]:
+            continue
+        seen[start] = 1
+        stack = [start]
+        count = 0
+        c0 = c1 = start % cols
+        r0 = r1 = start // cols
+        while stack:
+            idx = stack.pop()
+            count += 1
+            r, c = divmod(idx, cols)
+            c0, c1, r0, r1 = min(c0, c), max(c1, c), min(r0, r), max(r1, r)
+            # 8-connectivity plus a one-cell gap, so letters and words join into lines
+            for dr in (-2, -1, 0, 1, 2):
+                rr = r + dr
+                if rr < 0 or rr >= rows:
+                    continue
+                for dc in (-2, -1, 0, 1, 2):
+                    cc = c + dc
+                    if 0 <= cc < cols:
+                        n = rr * cols + cc
+                        if mask[n] and not seen[n]:
+                            seen[n] = 1
+                            stack.append(n)
+        span = (c1 - c0 + 1) * (r1 - r0 + 1)
+        if span >= 64 and count < span * 0.15:
+            # A hollow ring of edge cells is the outline of a picture or panel, not text
+            continue
+        boxes.append((
+            max(0, (c0 - 1) * cell), max(0, (r0 - 1) * cell),
+            min(width, (c1 + 2) * cell), min(height, (r1 + 2) * cell),
+        ))
+    boxes = _merge_boxes(boxes, cell)
+    return sorted(boxes, key=lambda b: (b[1], b[0]))
+
+
+class TileTextCache:
+    """Bounded LRU cache of recognized text keyed by a hash of the tile pixels.
+
+    Memory is capped at ``max_bytes`` (approximate size of keys and texts);
+    the least recently used entries are evicted first.
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        self.max_bytes = int(max_bytes)
+        self._entries = OrderedDict()
+        self.bytes_used = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key_for(tile, *extra):
+        """Content address of a tile: its pixels plus anything that changes the OCR result."""
+        h = hashlib.blake2b(tile.tobytes(), digest_size=16)
+        h.update(repr((tile.mode, tile.size) + extra).encode('utf-8'))
+        return h.hexdigest()
+
+    @staticmethod
+    def _entry_size(key, text):
+        return sys.getsizeof(key) + sys.getsizeof(text)
+
+    def get(self, key):
+        text = self._entries.get(key)
+        if text is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return text
+
+    def put(self, key, text):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.bytes_used -= self._entry_size(key, old)
+        self._entries[key] = text
+        self.bytes_used += self._entry_size(key, text)
+        while self.bytes_used > self.max_bytes and len(self._entries) > 1:
+            old_key, old_text = self._entries.popitem(last=False)
+            self.bytes_used -= self._entry_size(old_key, old_text)
+            self.evictions += 1
+
+    def clear(self):
+        self._entries.clear()
+        self.bytes_used = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'bytes': self.bytes_used,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': (self.hits / lookups) if lookups else 0.0,
+        }
+
+
+class ChangeDetector:
+    """Cheap frame fingerprinting used to skip OCR on a static screen.
+
+    The fingerprint is a tiny box-averaged grayscale thumbnail, so each cell
+    holds the mean brightness of a block of the screen.  A frame counts as
+    changed when any cell moved by more than ``threshold`` (0-255): a new line
+    of text changes its cells a lot, a blinking cursor barely moves them.
+    Frames are compared with the last *changed* one, i.e. the last frame sent
+    to OCR, so a slow fade that never jumps by ``threshold`` between two
+    grabs is still caught once it has drifted that far in total.
+    """
+
+    FINGERPRINT_SIZE = (64, 36)
+
+    def __init__(self, threshold=6.0):
+        self.threshold = float(threshold)
+        self._last = None
+        self.last_score = 0.0
+
+    def fingerprint(self, img):
+        thumb = img.resize(self.FINGERPRINT_SIZE, Image.BOX)
+        return ImageOps.grayscale(thumb)
+
+    def has_changed(self, img):
+        """Return True if ``img`` differs meaningfully from the last frame sent to OCR.
+
+        A changed frame becomes the new reference; an unchanged one is dropped.
+        """
+        fp = self.fingerprint(img)
+        last = self._last
+        if last is None or last.size != fp.size:
+            self.last_score = 255.0
+            self._last = fp
+            return True
+        # Largest per-cell difference; getextrema() on 'L' returns (min, max)
+        self.last_score = float(ImageChops.difference(fp, last).getextrema()[1])
+        if self.last_score <= self.threshold:
+            return False
+        self._last = fp
+        return True
+
+    def reset(self):
+        """Forget the previous frame so the next one is always treated as changed."""
+        self._last = None
+
+
+class ScrollTracker:
+    """Reuses positioned OCR words across a scroll so only newly exposed strips are read.
+
+    The rows (or columns) of the area that changed since the last OCR'd
+    frame are hashed, and the offset most rows agree on is taken as the
+    scroll.  Words that moved with the content keep their text at the new
+    position; rows that match neither frame are returned for OCR.
+    """
+
+    # A row hash seen this often (rules, blank gaps, repeated lines) votes for too many offsets
+    MAX_ROW_REPEATS = 32
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._image = None
+        self._key = None
+        self.words = []
+
+    def commit(self, image, key, words):
+        """Remember ``words`` (boxes in ``image`` pixels) as the text of ``image``.
+
+        The image is copied: capture sources and later stages may reuse its buffer.
+        """
+        self._image = image.copy()
+        self._key = key
+        self.words = list(words)
+
+    @staticmethod
+    def _line_hashes(img, box, axis):
+        """Hash each row of ``img.crop(box)`` (each column for axis 'x'); also flag blank lines."""
+        crop = img.crop(box)
+        if axis == 'x':
+            crop = crop.transpose(Image.TRANSPOSE)
+        data = crop.tobytes()
+        stride = len(data) // crop.height if crop.height else 0
+        pixel = len(crop.getbands())
+        hashes = []
+        blank = []
+        for i in range(crop.height):
+            row = data[i * stride:(i + 1) * stride]
+            hashes.append(hash(row))
+            blank.append(row == row[:pixel] * (stride // pixel))
+        return hashes, blank
+
+    def _best_offset(self, prev, cur, blank):
+        """Offset ``d`` with ``cur[i] == prev[i + d]`` for the most non-blank lines (0 if none)."""
+        where = {}
+        for j, h in enumerate(prev):
+            where.setdefault(h, []).append(j)
+        votes = {}
+        for i, h in enumerate(cur):
+            rows = where.get(h)
+            if blank[i] or not rows or len(rows) > self.MAX_ROW_REPEATS:
+                continue
+            for j in rows:
+                if j != i:
+                    votes[j - i] = votes.get(j - i, 0) + 1
+        if not votes:
+            return 0, 0
+        offset = max(votes, key=votes.get)
+        return offset, votes[offset]
+
+    def plan(self, image, key, margin=32, max_dirty=0.6):
+        """Work out what to OCR in ``image``; return ``(boxes, words)`` or None for a full pass.
+
+        ``words`` are the remembered words still valid in ``image`` (moved
+        by the scroll where needed) and ``boxes`` the strips left to read.
+        Each strip is widened by ``margin`` pixels so a text line cut at its
+        edge is read whole.
+        """
+        last = self._image
+        if last is None or key != self._key or image.size != last.size or image.mode != last.mode:
+            return None
+        bbox = ImageChops.difference(image, last).getbbox()
+        if bbox is None:
+            return [], list(self.words)
+        best = None
+        for axis in ('y', 'x'):
+            prev, _ = self._line_hashes(last, bbox, axis)
+            cur, blank = self._line_hashes(image, bbox, axis)
+            offset, votes = self._best_offset(prev, cur, blank)
+            if offset and (best is None or votes > best[2]):
+                best = (axis, offset, votes, prev, cur)
+        if best is None:
+            return None
+        axis, offset, _, prev, cur = best
+        # Work along the scrolled axis: box indices for it and for the other one, in image pixels
+        lo_i, hi_i, cross_lo, cross_hi = (1, 3, 0, 2) if axis == 'y' else (0, 2, 1, 3)
+        origin, end = bbox[lo_i], bbox[hi_i]
+        length = image.size[1] if axis == 'y' else image.size[0]
+
+        spans = []
+        for i in range(len(cur)):
+            if 0 <= i + offset < len(cur) and cur[i] == prev[i + offset]:
+                continue
+            if spans and spans[-1][1] >= origin + i - margin:
+                spans[-1][1] = origin + i + 1
+            else:
+                spans.append([origin + i, origin + i + 1])
+        spans = [[max(0, a - margin), min(length, z + margin)] for a, z in spans]
+
+        kept = []
+        near = []
+        for word in self.words:
+            box = word.box
+            across = box[cross_lo] < bbox[cross_hi] and box[cross_hi] > bbox[cross_lo]
+            if not across or box[hi_i] <= origin or box[lo_i] >= end:
+                # Unchanged pixels; still re-read below if a strip reaches it
+                near.append((box[lo_i], box[hi_i], word, across))
+                continue
+            if box[cross_lo] < bbox[cross_lo] or box[cross_hi] > bbox[cross_hi]:
+                # Text straddles the side of the changed area: not a plain scroll
+                return None
+            if box[lo_i] < origin or box[hi_i] > end:
+                # Partly changed, e.g. cut by the screen edge where the rows happen to match: read it again
+                spans.append([box[lo_i], box[hi_i]])
+                continue
+            a, z = box[lo_i] - offset, box[hi_i] - offset
+            if origin <= a and z <= end:
+                moved = list(box)
+                moved[lo_i], moved[hi_i] = a, z
+                near.append((a, z, word._replace(box=tuple(moved)), True))
+            elif a < end and z > origin:
+                # Partly scrolled out of view: read what is left of it again
+                spans.append([max(origin, a), min(end, z)])
+
+        # Words overlapping a strip are read again with it, so the strip grows to cover them
+        grown = True
+        while grown:
+            grown = False
+            for a, z, word, across in near:
+                if not across:
+                    continue
+                for span in spans:
+                    if a < span[1] and z > span[0] and (a < span[0] or z > span[1]):
+                        if word.box[cross_lo] < bbox[cross_lo] or word.box[cross_hi] > bbox[cross_hi]:
+                            return None
+                        span[0], span[1] = min(span[0], a), max(span[1], z)
+                        grown = True
+        spans = sorted((t, b) for _, t, _, b in _merge_boxes([(0, a, 1, z) for a, z in spans], 0))
+        if sum(z - a for a, z in spans) > max_dirty * (end - origin):
+            return None
+
+        for a, z, word, across in near:
+            if not (across and any(a < sz and z > sa for sa, sz in spans)):
+                kept.append(word)
+        if axis == 'y':
+            boxes = [(bbox[0], a, bbox[2], z) for a, z in spans]
+        else:
+            boxes = [(a, bbox[1], z, bbox[3]) for a, z in spans]
+        return boxes, kept
+
+
+class ScrollStats:
+    """Counters for scroll-aware incremental OCR."""
+
+    FIELDS = ('frames', 'incremental', 'unchanged', 'full', 'strips', 'reused_words')
+
+    def __init__(self):
+        for name in self.FIELDS:
+            setattr(self, name, 0)
+        self.ocr_area = 0.0
+
+    @classmethod
+    def combined(cls, parts):
+        total = cls()
+        for part in parts:
+            for name in cls.FIELDS:
+                setattr(total, name, getattr(total, name) + getattr(part, name))
+            total.ocr_area += part.ocr_area
+        return total
+
+    def snapshot(self):
+        data = {name: getattr(self, name) for name in self.FIELDS}
+        data['incremental_rate'] = (self.incremental / self.frames) if self.frames else 0.0
+        # Mean share of the frame OCR'd on incremental frames
+        data['ocr_area'] = (self.ocr_area / self.incremental) if self.incremental else 0.0
+        return data
+
+
+def words_in_reading_order(words):
+    """Order words line by line, top to bottom, keeping the order within each line."""
+    lines = OrderedDict()
+    for word in words:
+        lines.setdefault(word.line, []).append(word)
+    ordered = sorted(lines.values(), key=lambda line: (min(w.box[1] for w in line), min(w.box[0] for w in line)))
+    return [word for line in ordered for word in line]
+
+
+# --- Keyword matching ---
+# Characters tesseract commonly confuses, folded onto one canonical letter.
+# Keywords go through the same folding, so "p0rn" and "porn" compare equal.
+OCR_CONFUSIONS = {
+    '0': 'o',
+    '1': 'l', 'i': 'l', '|': 'l', '!': 'l',
+    '5': 's', '$': 's',
+    '@': 'a',
+}
+
+KeywordHit = namedtuple('KeywordHit', ['keyword', 'start', 'end', 'distance'], defaults=(0,))
+
+
+def normalize_ocr_text(text):
+    """Normalize OCR text for keyword matching.
+
+    Lowercases, folds OCR_CONFUSIONS, drops punctuation sitting between two
+    letters ("p.o.r.n" -> "porn"), turns other punctuation into spaces and
+    collapses whitespace runs.  Returns ``(normalized, offsets)`` where
+    ``offsets[i]`` is the index in ``text`` that produced ``normalized[i]``.
+    """
+    folded = [OCR_CONFUSIONS.get(ch, ch) for ch in text.lower()]
+    out = []
+    offsets = []
+    n = len(folded)
+    for i, ch in enumerate(folded):
+        if not ch.isalnum():
+            if not ch.isspace() and out and out[-1].isalnum() and i + 1 < n and folded[i + 1].isalnum():
+                continue
+            ch = ' '
+            if not out or out[-1] == ' ':
+                continue
+        out.append(ch)
+        offsets.append(i)
+    return ''.join(out), offsets
+
+
+def words_to_text(words):
+    """Join OcrWords into text; return ``(text, spans)`` with a (start, end, box) per word."""
+    parts = []
+    spans = []
+    pos = 0
+    last_line = None
+    for word in words:
+        if parts:
+            parts.append('\n' if word.line != last_line else ' ')
+            pos += 1
+        parts.append(word.text)
+        spans.append((pos, pos + len(word.text), word.box))
+        pos += len(word.text)
+        last_line = word.line
+    return ''.join(parts), spans
+
+
+def boxes_for_hits(hits, spans):
+    """Return one box per hit: the union of the span boxes its text overlaps."""
+    boxes = []
+    for hit in hits:
+        covered = [box for start, end, box in spans if start < hit.end and end > hit.start]
+        if covered:
+            boxes.append((min(b[0] for b in covered), min(b[1] for b in covered),
+                          max(b[2] for b in covered), max(b[3] for b in covered)))
+    return boxes
+
+
+def _myers_peq(pattern):
+    """Bit masks of where each character occurs in ``pattern``, for _myers_scan."""
+    peq = {}
+    for i, ch in enumerate(pattern):
+        peq[ch] = peq.get(ch, 0) | (1 << i)
+    return peq
+
+
+def _myers_scan(peq, m, text, anchored=False):
+    """Yield ``(index, distance)``: the fewest edits turning ``pattern`` into a substring of
+    ``text`` ending at ``index`` (with ``anchored``, into ``text[:index + 1]``).
+
+    Myers' bit-parallel algorithm: one column of the edit-distance table per
+    character, held in two bit vectors, so a text position costs a handful of
+    integer operations whatever the pattern length.
+    """
+    full = (1 << m) - 1
+    high = 1 << (m - 1)
+    vp, vn, score = full, 0, m
+    for j, ch in enumerate(text):
+        eq = peq.get(ch, 0)
+        xv = eq | vn
+        xh = (((eq & vp) + vp) ^ vp) | eq
+        hp = (vn | ~(xh | vp)) & full
+        hn = vp & xh
+        if hp & high:
+            score += 1
+        elif hn & high:
+            score -= 1
+        # Unanchored, row 0 stays 0 so a match may start anywhere in the text
+        hp = ((hp << 1) | anchored) & full
+        hn = (hn << 1) & full
+        vp = (hn | ~(xv | hp)) & full
+        vn = hp & xv
+        yield j, score
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over the normalized keyword list.
+
+    Built once per keyword list; ``search`` finds every keyword occurrence in
+    a single pass over the text regardless of how many keywords there are.
+
+    Approximate matching: a keyword written ``kw~N`` may be up to N edits away;
+    others get a budget from their length, capped by ``max_distance``.  Only
+    whole words are compared, so "gonzaga" or "all sexes" never blur for a
+    keyword that is merely nearby.  A match with at most k edits must contain
+    one of k + 1 disjoint pieces of the keyword exactly, so the pieces go into
+    a second automaton and only the words holding their occurrences are
+    verified with _myers_scan.  Keywords containing spaces match exactly.
+    With ``split_words``, a keyword spelled across whole words ("mi lf") also
+    matches, with one unit of distance per gap.
+    """
+
+    def __init__(self, keywords, max_distance=0, split_words=None):
+        self.keywords = []
+        self.max_distance = int(max_distance)
+        self.split_words = self.max_distance > 0 if split_words is None else split_words
+        self._goto = [{}]
+        self._fail = [0]
+        self._out = [[]]
+        self._depth = [0]
+        self._min_len = [0]
+        # Per keyword: (normalized text, edit budget, Myers masks)
+        self._fuzzy = []
+        pieces = []
+        self._piece_owner = []
+        for kw in keywords:
+            kw, budget = self._parse(kw)
+            norm = normalize_ocr_text(kw)[0].strip()
+            if not norm:
+                continue
+            index = len(self.keywords)
+            self._add(norm, index)
+            self.keywords.append((kw.strip(), len(norm)))
+            if budget is None:
+                budget = min(self.max_distance, self.auto_budget(len(norm)))
+            budget = min(int(budget), len(norm) - 1)
+            if ' ' in norm:
+                budget = 0
+            self._fuzzy.append((norm, budget, _myers_peq(norm)))
+            if budget > 0:
+                step = len(norm) / (budget + 1)
+                for p in range(budget + 1):
+                    pieces.append(norm[int(p * step):int((p + 1) * step)])
+                    self._piece_owner.append(index)
+        self._build()
+        self._pieces = KeywordMatcher(pieces, split_words=False) if pieces else None
+
+    @staticmethod
+    def _parse(kw):
+        """Split ``"kw~N"`` into (keyword, N); the budget is None when not given."""
+        text, sep, budget = kw.rpartition('~')
+        if sep and budget.strip().isdigit():
+            return text, int(budget)
+        return kw, None
+
+    @staticmethod
+    def auto_budget(length):
+        """Edits allowed for a keyword of ``length`` characters when none is given."""
+        if length <= 5:
+            return 0
+        return 1 if length <= 8 else 2
+
+    def _add(self, word, index):
+        node = 0
+        for ch in word:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+                self._depth.append(self._depth[node] + 1)
+                self._min_len.append(len(word))
+            node = nxt
+            self._min_len[node] = min(self._min_len[node], len(word))
+        self._out[node].append(index)
+
+    def _build(self):
+        queue = list(self._goto[0].values())
+        for node in queue:
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def __bool__(self):
+        return bool(self.keywords)
+
+    def search(self, text):
+        """Return a KeywordHit per occurrence, with offsets into ``text``."""
+        return self.scan(text)[0]
+
+    def _scan_normalized(self, norm):
+        """Exact pass over normalized text: ``([(start, end, index)], partial)``."""
+        goto, fail, out = self._goto, self._fail, self._out
+        depth, min_len = self._depth, self._min_len
+        found = []
+        best_node = 0
+        best = 0.0
+        node = 0
+        for i, ch in enumerate(norm):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            if node != best_node and depth[node] > best * min_len[node]:
+                best = depth[node] / min_len[node]
+                best_node = node
+            for index in out[node]:
+                found.append((i - self.keywords[index][1] + 1, i + 1, index))
+        return found, best
+
+    def _approximate(self, norm, exact):
+        """Whole words within a keyword's budget, as ``(start, end, index, distance)``.
+
+        Spans already matched exactly are skipped.
+        """
+        words = set()
+        for start, _, piece in self._pieces._scan_normalized(norm)[0]:
+            # Pieces hold no spaces, so each occurrence lies inside one word
+            s = norm.rfind(' ', 0, start) + 1
+            e = norm.find(' ', start)
+            words.add((s, len(norm) if e < 0 else e, self._piece_owner[piece]))
+        found = []
+        for s, e, index in sorted(words):
+            pattern, budget, peq = self._fuzzy[index]
+            if abs(e - s - len(pattern)) > budget:
+                continue
+            if any(a < e and s < b for a, b, i in exact if i == index):
+                continue
+            dist = budget + 1
+            for _, dist in _myers_scan(peq, len(pattern), norm[s:e], anchored=True):
+                pass
+            if dist <= budget:
+                found.append((s, e, index, dist))
+        return found
+
+    def _split(self, norm, exact):
+        """Keywords spelled across whole words, as ``(start, end, index, gaps)``."""
+        squeezed = []
+        where = []
+        for i, ch in enumerate(norm):
+            if ch != ' ':
+                squeezed.append(ch)
+                where.append(i)
+        found = []
+        exact_spans = {(s, e) for s, e, _ in exact}
+        for start, end, index in self._scan_normalized(''.join(squeezed))[0]:
+            s, e = where[start], where[end - 1] + 1
+            gaps = norm.count(' ', s, e)
+            if not gaps or (s, e) in exact_spans:
+                continue
+            # Only whole words, so "up or not" never yields "porn"
+            if (s == 0 or norm[s - 1] == ' ') and (e == len(norm) or norm[e] == ' '):
+                found.append((s, e, index, gaps))
+        return found
+
+    def scan(self, text):
+        """Return ``(hits, partial)`` for ``text``.
+
+        ``partial`` is the largest fraction of a keyword seen as a prefix
+        anywhere in the text (1.0 when something matched), a cheap
+        "nearly matched" signal for the scheduler.  Each hit carries its
+        edit ``distance`` (0 for exact matches).
+        """
+        if not self.keywords:
+            return [], 0.0
+        norm, offsets = normalize_ocr_text(text)
+        exact, best = self._scan_normalized(norm)
+        found = [(s, e, i, 0) for s, e, i in exact]
+        if self._pieces is not None:
+            found += self._approximate(norm, exact)
+        if self.split_words:
+            found += self._split(norm, exact)
+        best_of = {}
+        for s, e, i, d in found:
+            if best_of.get((s, e, i), d + 1) > d:
+                best_of[(s, e, i)] = d
+        hits = [KeywordHit(self.keywords[i][0], offsets[s], offsets[e - 1] + 1, d)
+                for (s, e, i), d in sorted(best_of.items())]
+        return hits, (1.0 if hits else best)
+
+
+class ScanScheduler:
+    """Decides how long the checker waits before the next scan.
+
+    Fast content (a big change or a near keyword match) pulls the interval
+    down to ``min_check_interval``; a static screen backs off exponentially
+    towards ``max_check_interval``.  The delay never lets the checker be busy
+    for more than ``scan_cpu_budget`` of wall time.  Cooldown after a hit is
+    a state with a deadline rather than a sleep.  CpuGovernor may stretch the
+    returned delay further, so of the two budgets the stricter one wins.
+    """
+
+    def __init__(self, settings):
+        self.settings = settings
+        self.state = 'active'
+        self.interval = float(settings.get('check_interval', 2.0))
+        self.cooldown_until = 0.0
+
+    def _bounds(self):
+        lo = max(0.05, float(self.settings.get('min_check_interval', 0.5)))
+        hi = max(lo, float(self.settings.get('max_check_interval', 10.0)))
+        return lo, hi
+
+    def reset(self):
+        self.state = 'active'
+        self.interval = float(self.settings.get('check_interval', 2.0))
+        self.cooldown_until = 0.0
+
+    def enter_cooldown(self, seconds, now=None):
+        now = time.monotonic() if now is None else now
+        self.cooldown_until = now + max(0.0, float(seconds))
+        self.state = 'cooldown'
+
+    def cooldown_remaining(self, now=None):
+        now = time.monotonic() if now is None else now
+        return max(0.0, self.cooldown_until - now)
+
+    def next_delay(self, changed, change_score=0.0, partial=0.0, busy_seconds=0.0, now=None):
+        """Return the delay before the next scan given the outcome of this one."""
+        lo, hi = self._bounds()
+        base = min(hi, max(lo, float(self.settings.get('check_interval', 2.0))))
+        remaining = self.cooldown_remaining(now)
+        if remaining > 0:
+            self.state = 'cooldown'
+            return remaining
+
+        threshold = float(self.settings.get('change_threshold', 6.0))
+        if partial >= float(self.settings.get('near_miss_ratio', 0.8)) or (changed and change_score > 4 * threshold):
+            self.state = 'fast'
+            self.interval = lo
+        elif changed:
+            self.state = 'active'
+            self.interval = base
+        else:
+            self.state = 'idle'
+            backoff = max(1.0, float(self.settings.get('idle_backoff', 1.5)))
+            self.interval = min(hi, max(self.interval, base) * backoff)
+
+        # Keep busy / (busy + delay) within the CPU budget
+        budget = min(1.0, max(0.01, float(self.settings.get('scan_cpu_budget', 0.5))))
+        budget_delay = busy_seconds * (1.0 - budget) / budget
+        return min(hi, max(lo, self.interval, budget_delay))
+
+
+class CpuGovernor:
+    """Keeps detection within ``cpu_budget_percent`` of one core.
+
+    CPU use is measured from process and finished-child CPU time (so
+    tesseract runs count) over a rolling window, not from wall time.  Over
+    budget, the governor first stretches the scan interval, then lowers the
+    OCR scale, then caps how many tiles or regions are OCR'd per frame.
+    Back under budget, it undoes these steps in reverse order.  One
+    governor is shared by all of a group's checkers.  It works on top of
+    ScanScheduler's per-scan ``scan_cpu_budget``, never in place of it.
+    """
+
+    MAX_FACTOR = 8.0
+    # (scale multiplier, boxes OCR'd per frame) per degradation level
+    LEVELS = ((1.0, None), (0.75, None), (0.5, None), (0.5, 4))
+
+    def __init__(self, settings):
+        self.settings = settings
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._samples = deque()
+            self.usage = 0.0
+            self.interval_factor = 1.0
+            self.level = 0
+            self._last_change = None
+
+    @property
+    def budget(self):
+        """Budget as a fraction of one core; 0 when the governor is off."""
+        return max(0.0, float(self.settings.get('cpu_budget_percent', 0))) / 100.0
+
+    def observe(self, now=None, cpu=None):
+        """Sample CPU time after a scan and adjust the degradation steps."""
+        now = time.monotonic() if now is None else now
+        cpu = _cpu_seconds() if cpu is None else cpu
+        window = max(1.0, float(self.settings.get('cpu_budget_window', 10)))
+        with self._lock:
+            self._samples.append((now, cpu))
+            if self._last_change is None:
+                self._last_change = now
+            while len(self._samples) > 2 and now - self._samples[1][0] >= window:
+                self._samples.popleft()
+            first_time, first_cpu = self._samples[0]
+            if now - first_time <= 0:
+                return
+            self.usage = max(0.0, (cpu - first_cpu) / (now - first_time))
+            budget = self.budget
+            # Let each step show its effect for half a window before taking the next
+            if not budget or now - self._last_change < window / 2:
+                return
+            if self.usage > budget:
+                if self.interval_factor < self.MAX_FACTOR:
+                    self.interval_factor = min(self.MAX_FACTOR, self.interval_factor * 1.5)
+                elif self.level < len(self.LEVELS) - 1:
+                    self.level += 1
+                else:
+                    return
+            elif self.usage < 0.7 * budget:
+                if self.level > 0:
+                    self.level -= 1
+                elif self.interval_factor > 1.0:
+                    self.interval_factor = max(1.0, self.interval_factor / 1.5)
+                else:
+                    return
+            else:
+                return
+            self._last_change = now
+
+    def delay(self, delay):
+        return delay * self.interval_factor if self.budget else delay
+
+    def scale(self, scale):
+        return max(0.25, scale * self.LEVELS[self.level][0]) if self.budget else scale
+
+    @property
+    def max_boxes(self):
+        return self.LEVELS[self.level][1] if self.budget else None
+
+    @property
+    def state(self):
+        if not self.budget:
+            return 'off'
+        if self.level:
+            return f'degraded (level {self.level})'
+        if self.interval_factor > 1.0:
+            return f'throttled (interval x{self.interval_factor:.1f})'
+        return 'within budget'
+
+    def snapshot(self):
+        return {
+            'budget_percent': self.budget * 100.0,
+            'usage_percent': self.usage * 100.0,
+            'interval_factor': self.interval_factor,
+            'level': self.level,
+            'scale_factor': self.LEVELS[self.level][0],
+            'max_boxes': self.max_boxes,
+            'state': self.state,
+        }
+
+
+# process_priority -> (nice increment, Windows priority class)
+PROCESS_PRIORITIES = {'normal': (0, 0x20), 'below_normal': (10, 0x4000), 'idle': (19, 0x40)}
+# Priority of the tesseract processes this process starts; set by apply_process_limits
+_tesseract_priority = 'normal'
+_pytesseract_subprocess_args = None
+
+
+def _priority_levels(priority):
+    return PROCESS_PRIORITIES.get(str(priority).lower(), PROCESS_PRIORITIES['normal'])
+
+
+def _tesseract_subprocess_args(include_stdout=True):
+    """pytesseract's Popen arguments plus the priority class for tesseract (Windows)."""
+    kwargs = _pytesseract_subprocess_args(include_stdout)
+    kwargs['creationflags'] = kwargs.get('creationflags', 0) | _priority_levels(_tesseract_priority)[1]
+    return kwargs
+
+
+def _install_tesseract_priority_class():
+    """Make pytesseract start tesseract.exe with the priority class of ``process_priority``."""
+    global _pytesseract_subprocess_args
+    module = pytesseract.pytesseract
+    if module.subprocess_args is not _tesseract_subprocess_args:
+        _pytesseract_subprocess_args = module.subprocess_args
+        module.subprocess_args = _tesseract_subprocess_args
+
+
+def lower_process_priority(priority):
+    """Lower this whole process (and the children it starts later) to ``priority``.
+
+    Only for processes that do nothing but OCR, such as the tile workers.
+    """
+    nice, priority_class = _priority_levels(priority)
+    try:
+        if sys.platform == 'win32':
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), priority_class)
+        elif hasattr(os, 'nice'):
+            current = os.nice(0)
+            # Raising priority again needs privileges, so only ever lower it
+            if nice > current:
+                os.nice(nice - current)
+    except Exception as e:
+        print(f'Could not set process priority: {e}')
+
+
+def apply_process_limits(settings):
+    """Cap tesseract's OpenMP threads and set the priority of the OCR processes.
+
+    Call before any checker thread or tesseract process starts; tesserocr
+    reads the thread limit when it is loaded.  ``process_priority`` applies
+    to tesseract processes and tile workers only: the app itself keeps its
+    priority so the UI and the blur overlay stay responsive.  OCR that
+    tesserocr runs inside the app is not lowered.
+    """
+    global _tesseract_priority
+    threads = int(settings.get('tesseract_threads', 1))
+    if threads > 0:
+        os.environ['OMP_THREAD_LIMIT'] = str(threads)
+    _tesseract_priority = str(settings.get('process_priority', 'below_normal')).lower()
+
+
+def blur_image(image, settings):
+    """Blur ``image`` the way the overlay shows it (``blur_method`` / ``blur_radius``)."""
+    radius = int(settings.get('blur_radius', 25))
+    if settings.get('blur_method', 'fast') == 'fast':
+        return fast_blur(image, radius)
+    return image.filter(ImageFilter.GaussianBlur(radius))
+
+
+def fast_blur(image, radius):
+    """Cheap approximation of ``GaussianBlur(radius)`` for large radii.
+
+    Box-averages the image down by a factor tied to the radius, blurs the
+    small copy and scales it back up; for overlay purposes the result is
+    indistinguishable from a full-resolution Gaussian at a fraction of the cost.
+    """
+    radius = max(1, int(radius))
+    factor = max(1, min(16, radius // 3))
+    if factor == 1:
+        return image.filter(ImageFilter.GaussianBlur(radius))
+    small = image.reduce(factor)
+    small = small.filter(ImageFilter.GaussianBlur(max(1.0, radius / factor)))
+    return small.resize(image.size, Image.BILINEAR)
+
+
+class BlurOverlay:
+    """Topmost window that shows the blurred screenshot.
+
+    The window is created once, hidden, when the app starts; ``show`` only
+    swaps the image in and maps it, and ``close`` withdraws it again, so a
+    detection never pays for building a Toplevel.  ``geometry`` is the
+    (left, top, width, height) it covers; None means the full screen.
+    Small region overlays pass ``grab_focus=False`` so the rest of the
+    screen stays usable.
+    """
+
+    def __init__(self, parent, on_close=None, geometry=None, grab_focus=True):
+        self.root = tk.Toplevel(parent)
+        self.root.withdraw()
+        self.root.overrideredirect(True)
+        self.geometry = None
+        if geometry is not None:
+            self.place(geometry)
+        self.grab_focus = grab_focus
+        self.root.attributes('-topmost', True)
+        if grab_focus:
+            self.root.config(cursor='none')
+        self._on_close = on_close
+        self._alpha_target = 0.98
+        self._fade_steps = 10
+        self._fade_ms = 300
+        self._fade_step = 0
+        self._fade_token = 0
+        self._on_covered = None
+        self.visible = False
+
+        self.photo = None
+        self.label = tk.Label(self.root, bd=0, highlightthickness=0)
+        self.label.pack(fill='both', expand=True)
+
+        self.root.bind('<Button-1>', self.close)
+        self.root.bind('<Key>', self.close)
+
+    def place(self, geometry):
+        """Move the (hidden or shown) overlay to cover (left, top, width, height)."""
+        self.geometry = geometry
+        left, top, width, height = geometry
+        self.root.geometry(f'{width}x{height}+{left}+{top}')
+
+    def show(self, image, fade=True, alpha_target=0.98, fade_ms=300, fade_steps=10, on_covered=None):
+        """Show ``image`` (a PIL image sized to the covered area); ``on_covered`` fires once fully opaque."""
+        if self.photo is not None and (self.photo.width(), self.photo.height()) == image.size:
+            self.photo.paste(image)
+        else:
+            self.photo = ImageTk.PhotoImage(image)
+            self.label.configure(image=self.photo)
+        self._alpha_target = float(alpha_target)
+        self._fade_steps = max(1, int(fade_steps))
+        self._fade_ms = max(1, int(fade_ms))
+        self._fade_step = 0
+        self._fade_token += 1
+        self._on_covered = on_covered
+
+        if self.geometry is None:
+            try:
+                self.root.attributes('-fullscreen', True)
+            except Exception:
+                pass
+        try:
+            self.root.attributes('-alpha', 0.0 if fade else self._alpha_target)
+        except Exception:
+            pass
+        self.root.deiconify()
+        self.root.lift()
+        self.visible = True
+        if self.grab_focus:
+            try:
+                self.root.focus_force()
+            except Exception:
+                pass
+        self.root.update_idletasks()
+
+        if fade:
+            self._fade_in(self._fade_token)
+        else:
+            self._covered()
+
+    def _covered(self):
+        callback, self._on_covered = self._on_covered, None
+        if callable(callback):
+            callback()
+
+    def _fade_in(self, token):
+        if token != self._fade_token or not self.visible:
+            return
+        try:
+            self._fade_step += 1
+            a = (self._alpha_target / self._fade_steps) * self._fade_step
+            self.root.attributes('-alpha', min(self._alpha_target, a))
+            if self._fade_step < self._fade_steps:
+                delay = int(self._fade_ms / self._fade_steps)
+                self.root.after(max(1, delay), self._fade_in, token)
+            else:
+                self._covered()
+        except Exception:
+            pass
+
+    def close(self, event=None):
+        try:
+            self._fade_token += 1
+            self._on_covered = None
+            self.visible = False
+            self.root.withdraw()
+            if callable(self._on_close):
+                self._on_close()
+        finally:
+            gc.collect()
+
+    def destroy(self):
+        try:
+            self.root.destroy()
+        except Exception:
+            pass
+        self.photo = None
+
+
+# --- Capture sources ---
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+
+class CaptureSource:
+    """Where ScreenChecker gets its frames from.
+
+    ``grab`` returns a PIL image, or None once a finite source is exhausted.
+    ``last_name`` / ``last_labels`` describe the frame just returned, for
+    sources that carry ground truth.
+    """
+
+    name = 'base'
+    last_name = None
+    last_labels = None
+
+    def grab(self):
+        raise NotImplementedError
+
+    def rewind(self):
+        """Start a finite source over from its first frame."""
+
+    def color_snapshot(self, image):
+        """Full-color version of a grabbed frame, for the blur overlay."""
+        return image
+
+    def labeled_keywords(self):
+        """Every keyword mentioned in the source's ground truth."""
+        return set()
+
+    def close(self):
+        pass
+
+
+class ScreenCaptureSource(CaptureSource):
+    """Live screen through PIL.ImageGrab."""
+
+    name = 'screen'
+
+    def __init__(self, region=None):
+        # region: (left, top, width, height) in virtual-desktop coordinates
+        self.region = region
+
+    def grab(self):
+        if self.region is None:
+            return ImageGrab.grab()
+        left, top, width, height = self.region
+        return ImageGrab.grab(bbox=(left, top, left + width, top + height), all_screens=True)
+
+
+class _XImage(ctypes.Structure):
+    # Leading fields of Xlib's XImage; only ever used through a pointer
+    _fields_ = [
+        ('width', ctypes.c_int), ('height', ctypes.c_int), ('xoffset', ctypes.c_int), ('format', ctypes.c_int),
+        ('data', ctypes.c_void_p), ('byte_order', ctypes.c_int), ('bitmap_unit', ctypes.c_int),
+        ('bitmap_bit_order', ctypes.c_int), ('bitmap_pad', ctypes.c_int), ('depth', ctypes.c_int),
+        ('bytes_per_line', ctypes.c_int), ('bits_per_pixel', ctypes.c_int),
+        ('red_mask', ctypes.c_ulong), ('green_mask', ctypes.c_ulong), ('blue_mask', ctypes.c_ulong),
+    ]
+
+
+class _XShmSegmentInfo(ctypes.Structure):
+    _fields_ = [
+        ('shmseg', ctypes.c_ulong), ('shmid', ctypes.c_int),
+        ('shmaddr', ctypes.c_void_p), ('readOnly', ctypes.c_int),
+    ]
+
+
+class _XineramaScreenInfo(ctypes.Structure):
+    _fields_ = [
+        ('screen_number', ctypes.c_int), ('x_org', ctypes.c_short), ('y_org', ctypes.c_short),
+        ('width', ctypes.c_short), ('height', ctypes.c_short),
+    ]
+
+
+def _load_lib(name, fallback):
+    return ctypes.CDLL(ctypes.util.find_library(name) or fallback)
+
+
+def list_x11_monitors(display_name=None):
+    """Return (left, top, width, height) per monitor via Xinerama, or [] if unavailable."""
+    try:
+        x11 = _load_lib('X11', 'libX11.so.6')
+        xinerama = _load_lib('Xinerama', 'libXinerama.so.1')
+    except OSError:
+        return []
+    x11.XOpenDisplay.restype = ctypes.c_void_p
+    x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+    x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+    x11.XFree.argtypes = [ctypes.c_void_p]
+    xinerama.XineramaIsActive.argtypes = [ctypes.c_void_p]
+    xinerama.XineramaQueryScreens.restype = ctypes.POINTER(_XineramaScreenInfo)
+    xinerama.XineramaQueryScreens.argtypes = [ctypes.c_void_p, ctypes.POINTER(ctypes.c_int)]
+    display = x11.XOpenDisplay(display_name.encode() if display_name else None)
+    if not display:
+        return []
+    try:
+        if not xinerama.XineramaIsActive(display):
+            return []
+        count = ctypes.c_int(0)
+        screens = xinerama.XineramaQueryScreens(display, ctypes.byref(count))
+        if not screens:
+            return []
+        try:
+            return [(screens[i].x_org, screens[i].y_org, screens[i].width, screens[i].height)
+                    for i in range(count.value)]
+        finally:
+            x11.XFree(screens)
+    finally:
+        x11.XCloseDisplay(display)
+
+
+def _list_windows_monitors():
+    """Return (left, top, width, height) per monitor via EnumDisplayMonitors."""
+    from ctypes import wintypes
+    monitors = []
+    callback_type = ctypes.WINFUNCTYPE(ctypes.c_int, wintypes.HMONITOR, wintypes.HDC,
+                                       ctypes.POINTER(wintypes.RECT), wintypes.LPARAM)
+
+    def _callback(hmonitor, hdc, rect, data):
+        r = rect.contents
+        monitors.append((r.left, r.top, r.right - r.left, r.bottom - r.top))
+        return 1
+
+    ctypes.windll.user32.EnumDisplayMonitors(None, None, callback_type(_callback), 0)
+    return monitors
+
+
+def list_monitors():
+    """Return (left, top, width, height) per monitor in virtual-desktop coordinates, or [] if unknown."""
+    try:
+        if sys.platform == 'win32':
+            return _list_windows_monitors()
+        if sys.platform.startswith('linux') and os.environ.get('DISPLAY'):
+            return list_x11_monitors()
+    except Exception as e:
+        print(f'Could not enumerate monitors: {e}')
+    return []
+
+class X11ShmCaptureSource(CaptureSource):
+    """Linux/X11 capture through the MIT-SHM extension into reused buffers.
+
+    The X server writes each frame straight into one shared-memory segment
+    allocated at start-up; ``grab`` converts it to an 'L' image without an
+    intermediate RGB copy.  With NumPy the luma is computed into
+    preallocated scratch buffers; without it PIL reads the segment in place.
+    Either way each grab allocates one grayscale image (a copy of the
+    scratch buffer, or the output of ``convert('L')``), so images returned
+    by ``grab`` own their pixels and stay valid after later grabs.
+    ``color_snapshot`` rebuilds an RGB image on demand, which only happens
+    when a keyword was found.
+    """
+
+    name = 'x11shm'
+    ZPIXMAP = 2
+    IPC_PRIVATE = 0
+    IPC_CREAT = 0o1000
+    IPC_RMID = 0
+
+    def __init__(self, region=None, monitor=None, display_name=None):
+        self._x11 = _load_lib('X11', 'libX11.so.6')
+        self._xext = _load_lib('Xext', 'libXext.so.6')
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        self._declare()
+        self._lock = threading.Lock()
+        self._display = self._x11.XOpenDisplay(display_name.encode() if display_name else None)
+        if not self._display:
+            raise RuntimeError('cannot open X display')
+        self._ximage = None
+        self._seg = None
+        try:
+            if not self._xext.XShmQueryExtension(self._display):
+                raise RuntimeError('MIT-SHM extension not available')
+            screen = self._x11.XDefaultScreen(self._display)
+            self._root = self._x11.XDefaultRootWindow(self._display)
+            screen_w = self._x11.XDisplayWidth(self._display, screen)
+            screen_h = self._x11.XDisplayHeight(self._display, screen)
+            if monitor is not None and region is None:
+                monitors = list_x11_monitors(display_name)
+                if 0 <= monitor < len(monitors):
+                    region = monitors[monitor]
+            left, top, width, height = region or (0, 0, screen_w, screen_h)
+            # Out-of-bounds XShmGetImage is a fatal X error, so clamp up front
+            left = max(0, min(int(left), screen_w - 1))
+            top = max(0, min(int(top), screen_h - 1))
+            self.region = (left, top, max(1, min(int(width), screen_w - left)), max(1, min(int(height), screen_h - top)))
+            self._create_image(screen)
+        except Exception:
+            self.close()
+            raise
+
+    def _declare(self):
+        x11, xext, libc = self._x11, self._xext, self._libc
+        vp, ci, cu, cul = ctypes.c_void_p, ctypes.c_int, ctypes.c_uint, ctypes.c_ulong
+        x11.XOpenDisplay.restype = vp
+        x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x11.XCloseDisplay.argtypes = [vp]
+        x11.XDefaultScreen.argtypes = [vp]
+        x11.XDefaultRootWindow.restype = cul
+        x11.XDefaultRootWindow.argtypes = [vp]
+        x11.XDefaultVisual.restype = vp
+        x11.XDefaultVisual.argtypes = [vp, ci]
+        x11.XDefaultDepth.argtypes = [vp, ci]
+        x11.XDisplayWidth.argtypes = [vp, ci]
+        x11.XDisplayHeight.argtypes = [vp, ci]
+        x11.XDestroyImage.argtypes = [ctypes.POINTER(_XImage)]
+        x11.XSync.argtypes = [vp, ci]
+        xext.XShmQueryExtension.argtypes = [vp]
+        xext.XShmCreateImage.restype = ctypes.POINTER(_XImage)
+        xext.XShmCreateImage.argtypes = [vp, vp, cu, ci, ctypes.c_char_p, ctypes.POINTER(_XShmSegmentInfo), cu, cu]
+        xext.XShmAttach.argtypes = [vp, ctypes.POINTER(_XShmSegmentInfo)]
+        xext.XShmDetach.argtypes = [vp, ctypes.POINTER(_XShmSegmentInfo)]
+        xext.XShmGetImage.argtypes = [vp, cul, ctypes.POINTER(_XImage), ci, ci, cul]
+        libc.shmget.restype = ci
+        libc.shmget.argtypes = [ci, ctypes.c_size_t, ci]
+        libc.shmat.restype = vp
+        libc.shmat.argtypes = [ci, vp, ci]
+        libc.shmdt.argtypes = [vp]
+        libc.shmctl.argtypes = [ci, ci, vp]
+
+    def _create_image(self, screen):
+        x11, xext, libc = self._x11, self._xext, self._libc
+        _, _, width, height = self.region
+        self._seg = _XShmSegmentInfo()
+        visual = x11.XDefaultVisual(self._display, screen)
+        depth = x11.XDefaultDepth(self._display, screen)
+        self._ximage = xext.XShmCreateImage(self._display, visual, depth, self.ZPIXMAP, None,
+                                            ctypes.byref(self._seg), width, height)
+        if not self._ximage:
+            raise RuntimeError('XShmCreateImage failed')
+        xi = self._ximage.contents
+        if xi.bits_per_pixel != 32:
+            raise RuntimeError(f'unsupported pixel format ({xi.bits_per_pixel} bpp)')
+        self._stride = xi.bytes_per_line
+        size = self._stride * height
+        self._seg.shmid = libc.shmget(self.IPC_PRIVATE, size, self.IPC_CREAT | 0o600)
+        if self._seg.shmid < 0:
+            raise RuntimeError(f'shmget failed (errno {ctypes.get_errno()})')
+        addr = libc.shmat(self._seg.shmid, None, 0)
+        if addr in (None, ctypes.c_void_p(-1).value):
+            libc.shmctl(self._seg.shmid, self.IPC_RMID, None)
+            self._seg.shmid = -1
+            raise RuntimeError(f'shmat failed (errno {ctypes.get_errno()})')
+        self._seg.shmaddr = addr
+        self._seg.readOnly = 0
+        xi.data = addr
+        if not xext.XShmAttach(self._display, ctypes.byref(self._seg)):
+            raise RuntimeError('XShmAttach failed')
+        x11.XSync(self._display, 0)
+        # Mark for removal now; the kernel frees it once both sides detach
+        libc.shmctl(self._seg.shmid, self.IPC_RMID, None)
+        self._buffer = (ctypes.c_ubyte * size).from_address(addr)
+
+        self._gray = None
+        self._np = np = _optional_module('numpy')
+        if np is not None:
+            pixels = np.frombuffer(self._buffer, dtype=np.uint8).reshape(height, self._stride // 4, 4)[:, :width]
+            # BGRX byte order on little-endian 24/32-bit visuals
+            self._channels = (pixels[..., 2], pixels[..., 1], pixels[..., 0])
+            self._acc = np.empty((height, width), dtype=np.uint16)
+            self._tmp = np.empty((height, width), dtype=np.uint16)
+            self._gray = np.empty((height, width), dtype=np.uint8)
+
+    def _fetch(self):
+        left, top, _, _ = self.region
+        if not self._xext.XShmGetImage(self._display, self._root, self._ximage, left, top, 0xFFFFFFFF):
+            raise RuntimeError('XShmGetImage failed')
+
+    def grab(self):
+        _, _, width, height = self.region
+        with self._lock:
+            self._fetch()
+            if self._gray is not None:
+                np = self._np
+                r, g, b = self._channels
+                acc, tmp = self._acc, self._tmp
+                # Integer BT.601 luma: (77 R + 150 G + 29 B) >> 8, all into preallocated buffers
+                np.multiply(r, np.uint16(77), out=acc)
+                np.multiply(g, np.uint16(150), out=tmp)
+                np.add(acc, tmp, out=acc)
+                np.multiply(b, np.uint16(29), out=tmp)
+                np.add(acc, tmp, out=acc)
+                np.right_shift(acc, 8, out=acc)
+                np.copyto(self._gray, acc, casting='unsafe')
+                # Copy out of the scratch buffer: frames are kept by later stages and the pipeline
+                return Image.frombuffer('L', (width, height), self._gray, 'raw', 'L', 0, 1).copy()
+            # In-place view of the segment; PIL's RGB weights land on swapped
+            # R/B channels, which is irrelevant for text contrast.
+            view = Image.frombuffer('RGBX', (width, height), self._buffer, 'raw', 'RGBX', self._stride, 1)
+            return view.convert('L')
+
+    def color_snapshot(self, image):
+        _, _, width, height = self.region
+        with self._lock:
+            self._fetch()
+            return Image.frombuffer('RGB', (width, height), self._buffer, 'raw', 'BGRX', self._stride, 1).copy()
+
+    def close(self):
+        if getattr(self, '_display', None):
+            if self._seg is not None and self._seg.shmaddr:
+                self._buffer = None
+                self._channels = None
+                self._xext.XShmDetach(self._display, ctypes.byref(self._seg))
+                self._libc.shmdt(self._seg.shmaddr)
+                self._seg.shmaddr = None
+            if self._ximage:
+                # The data pointer belongs to the segment, not to Xlib's allocator
+                self._ximage.contents.data = None
+                self._x11.XDestroyImage(self._ximage)
+                self._ximage = None
+            self._x11.XCloseDisplay(self._display)
+            self._display = None
+
+
+def create_capture_source(settings, region=None):
+    """Pick the live capture backend from ``capture_backend``; ImageGrab is the fallback."""
+    choice = str(settings.get('capture_backend', 'auto') or 'auto').lower()
+    monitor = int(settings.get('capture_monitor', -1))
+    monitor = monitor if monitor >= 0 else None
+    if choice in ('auto', 'x11shm') and sys.platform.startswith('linux') and os.environ.get('DISPLAY'):
+        try:
+            return X11ShmCaptureSource(region=region, monitor=monitor)
+        except Exception as e:
+            print(f'X11 shared-memory capture unavailable, using ImageGrab: {e}')
+    if region is None and monitor is not None:
+        monitors = list_monitors()
+        if monitor < len(monitors):
+            region = monitors[monitor]
+    return ScreenCaptureSource(region=region)
+
+
+class DirectoryCaptureSource(CaptureSource):
+    """Image files of a directory in name order.
+
+    An optional ``labels.json`` maps file names to the keywords expected on
+    that frame.
+    """
+
+    name = 'directory'
+
+    def __init__(self, path, loop=False):
+        self.path = path
+        self.loop = loop
+        self.files = sorted(f for f in os.listdir(path) if f.lower().endswith(IMAGE_EXTENSIONS))
+        self.labels = {}
+        labels_path = os.path.join(path, 'labels.json')
+        if os.path.exists(labels_path):
+            with open(labels_path, 'r', encoding='utf-8') as f:
+                self.labels = json.load(f)
+        self._index = 0
+
+    def __len__(self):
+        return len(self.files)
+
+    def rewind(self):
+        self._index = 0
+
+    def labeled_keywords(self):
+        found = set()
+        for keywords in self.labels.values():
+            found.update(keywords)
+        return found
+
+    def grab(self):
+        if self._index >= len(self.files):
+            if not self.loop or not self.files:
+                return None
+            self._index = 0
+        name = self.files[self._index]
+        self._index += 1
+        self.last_name = name
+        self.last_labels = self.labels.get(name)
+        with Image.open(os.path.join(self.path, name)) as img:
+            return img.convert('RGB')
+
+
+class BlurredCaptureSource(CaptureSource):
+    """Frames of another source blurred as the overlay would show them.
+
+    Replaying it through the checker tells whether any keyword is still
+    readable behind the blur; blur times are kept in ``blur_seconds``.
+    """
+
+    name = 'blurred'
+
+    def __init__(self, source, settings):
+        self.source = source
+        self.settings = settings
+        self.blur_seconds = []
+
+    def rewind(self):
+        self.source.rewind()
+
+    def labeled_keywords(self):
+        return self.source.labeled_keywords()
+
+    def grab(self):
+        image = self.source.grab()
+        self.last_name = self.source.last_name
+        self.last_labels = self.source.last_labels
+        if image is None:
+            return None
+        t0 = time.perf_counter()
+        image = blur_image(image, self.settings)
+        self.blur_seconds.append(time.perf_counter() - t0)
+        return image
+
+    def close(self):
+        self.source.close()
+
+
+class RecordedCaptureSource(CaptureSource):
+    """A recorded frame sequence described by a JSON-lines manifest.
+
+    Each line is ``{"file": "frame_0001.png", "keywords": ["..."]}``; file
+    paths are relative to the manifest.
+    """
+
+    name = 'recording'
+
+    def __init__(self, manifest_path, loop=False):
+        self.manifest_path = manifest_path
+        self.loop = loop
+        base = os.path.dirname(os.path.abspath(manifest_path))
+        self.entries = []
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entry = json.loads(line)
+                    entry['path'] = os.path.join(base, entry['file'])
+                    self.entries.append(entry)
+        self._index = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def rewind(self):
+        self._index = 0
+
+    def labeled_keywords(self):
+        found = set()
+        for entry in self.entries:
+            found.update(entry.get('keywords') or [])
+        return found
+
+    def grab(self):
+        if self._index >= len(self.entries):
+            if not self.loop or not self.entries:
+                return None
+            self._index = 0
+        entry = self.entries[self._index]
+        self._index += 1
+        self.last_name = entry['file']
+        self.last_labels = entry.get('keywords')
+        with Image.open(entry['path']) as img:
+            return img.convert('RGB')
+
+
+def open_capture_source(path, loop=False):
+    """Recorded sequence for a manifest (or a directory holding frames.jsonl), else a PNG directory."""
+    if os.path.isfile(path):
+        return RecordedCaptureSource(path, loop=loop)
+    manifest = os.path.join(path, 'frames.jsonl')
+    if os.path.exists(manifest):
+        return RecordedCaptureSource(manifest, loop=loop)
+    return DirectoryCaptureSource(path, loop=loop)
+
+
+# --- Idle detection ---
+class IdleSource:
+    """Tells the checker how long the user has been away and whether the screen is locked.
+
+    ``idle_seconds`` returns None when unknown; such sources never pause
+    scanning.
+    """
+
+    name = 'none'
+
+    def idle_seconds(self):
+        return None
+
+    def is_locked(self):
+        return False
+
+    def close(self):
+        pass
+
+
+class ManualIdleSource(IdleSource):
+    """Stand-in driven by hand, for tests and replays."""
+
+    name = 'manual'
+
+    def __init__(self, idle=0.0, locked=False):
+        self.idle = float(idle)
+        self.locked = locked
+
+    def idle_seconds(self):
+        return self.idle
+
+    def is_locked(self):
+        return self.locked
+
+
+class _XScreenSaverInfo(ctypes.Structure):
+    _fields_ = [
+        ('window', ctypes.c_ulong), ('state', ctypes.c_int), ('kind', ctypes.c_int),
+        ('til_or_since', ctypes.c_ulong), ('idle', ctypes.c_ulong), ('event_mask', ctypes.c_ulong),
+    ]
+
+
+class X11IdleSource(IdleSource):
+    """Input idle time from the X11 MIT-SCREEN-SAVER extension (libXss).
+
+    A running screen saver counts as locked: screen lockers on X11 keep it active.
+    """
+
+    name = 'x11'
+    SCREEN_SAVER_ON = 1
+
+    def __init__(self, display_name=None):
+        self._x11 = _load_lib('X11', 'libX11.so.6')
+        self._xss = _load_lib('Xss', 'libXss.so.1')
+        self._x11.XOpenDisplay.restype = ctypes.c_void_p
+        self._x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        self._x11.XDefaultRootWindow.restype = ctypes.c_ulong
+        self._x11.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        self._x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        self._x11.XFree.argtypes = [ctypes.c_void_p]
+        self._xss.XScreenSaverQueryExtension.argtypes = [
+            ctypes.c_void_p, ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int)]
+        self._xss.XScreenSaverAllocInfo.restype = ctypes.POINTER(_XScreenSaverInfo)
+        self._xss.XScreenSaverQueryInfo.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(_XScreenSaverInfo)]
+        self._display = self._x11.XOpenDisplay(display_name.encode() if display_name else None)
+        if not self._display:
+            raise OSError('cannot open X display')
+        event_base, error_base = ctypes.c_int(0), ctypes.c_int(0)
+        if not self._xss.XScreenSaverQueryExtension(self._display, ctypes.byref(event_base), ctypes.byref(error_base)):
+            self._x11.XCloseDisplay(self._display)
+            raise OSError('X server lacks the MIT-SCREEN-SAVER extension')
+        self._root = self._x11.XDefaultRootWindow(self._display)
+        self._info = self._xss.XScreenSaverAllocInfo()
+        self._lock = threading.Lock()
+
+    def _query(self):
+        with self._lock:
+            if not self._display:
+                return None
+            self._xss.XScreenSaverQueryInfo(self._display, self._root, self._info)
+            return self._info.contents.idle, self._info.contents.state
+
+    def idle_seconds(self):
+        info = self._query()
+        return info[0] / 1000.0 if info else None
+
+    def is_locked(self):
+        info = self._query()
+        return bool(info) and info[1] == self.SCREEN_SAVER_ON
+
+    def close(self):
+        with self._lock:
+            if self._display:
+                self._x11.XFree(self._info)
+                self._x11.XCloseDisplay(self._display)
+                self._display = None
+
+
+class WindowsIdleSource(IdleSource):
+    """GetLastInputInfo for idle time; the input desktop cannot be switched to while locked."""
+
+    name = 'windows'
+    DESKTOP_SWITCHDESKTOP = 0x0100
+
+    class _LastInputInfo(ctypes.Structure):
+        _fields_ = [('cbSize', ctypes.c_uint), ('dwTime', ctypes.c_uint)]
+
+    def __init__(self):
+        self._user32 = ctypes.windll.user32
+        self._kernel32 = ctypes.windll.kernel32
+
+    def idle_seconds(self):
+        info = self._LastInputInfo()
+        info.cbSize = ctypes.sizeof(info)
+        if not self._user32.GetLastInputInfo(ctypes.byref(info)):
+            return None
+        # Both are 32-bit millisecond tick counts, so wrap the difference
+        return ((self._kernel32.GetTickCount() - info.dwTime) & 0xFFFFFFFF) / 1000.0
+
+    def is_locked(self):
+        desktop = self._user32.OpenInputDesktop(0, False, self.DESKTOP_SWITCHDESKTOP)
+        if not desktop:
+            return True
+        try:
+            return not self._user32.SwitchDesktop(desktop)
+        finally:
+            self._user32.CloseDesktop(desktop)
+
+
+def create_idle_source():
+    """Pick the platform idle source; the fallback never reports idle."""
+    try:
+        if sys.platform == 'win32':
+            return WindowsIdleSource()
+        if sys.platform.startswith('linux') and os.environ.get('DISPLAY'):
+            return X11IdleSource()
+    except Exception as e:
+        print(f'Idle detection unavailable: {e}')
+    return IdleSource()
+
+
+# --- Window titles ---
+# box is (left, top, right, bottom) in desktop pixels, None when unknown
+WindowInfo = namedtuple('WindowInfo', ['title', 'box', 'active'])
+
+
+class TitleSource:
+    """Lists the visible windows and their titles, for matching before any OCR."""
+
+    name = 'none'
+
+    def windows(self):
+        """Return a WindowInfo per visible window, the active one first."""
+        return []
+
+    def close(self):
+        pass
+
+
+class StaticTitleSource(TitleSource):
+    """Fixed window list, for tests and replays."""
+
+    name = 'static'
+
+    def __init__(self, windows=()):
+        self.items = [w if isinstance(w, WindowInfo) else WindowInfo(w, None, False) for w in windows]
+
+    def windows(self):
+        return list(self.items)
+
+
+_X_ERROR_HANDLER = ctypes.CFUNCTYPE(ctypes.c_int, ctypes.c_void_p, ctypes.c_void_p)
+
+
+class X11TitleSource(TitleSource):
+    """Window titles from EWMH properties of the X11 root and client windows.
+
+    Lists ``_NET_CLIENT_LIST``, drops minimized windows and windows on other
+    desktops, and reads ``_NET_WM_NAME`` (falling back to ``WM_NAME``).
+    Windows can close between listing and querying them, so an error
+    handler that ignores errors on this connection is installed for the
+    duration of each ``windows`` call and the previous one restored after;
+    errors on other connections (Tk's) still go to the previous handler.
+    """
+
+    name = 'x11'
+    ANY_PROPERTY_TYPE = 0
+    ALL_DESKTOPS = 0xFFFFFFFF
+
+    def __init__(self, display_name=None):
+        x11 = self._x11 = _load_lib('X11', 'libX11.so.6')
+        x11.XOpenDisplay.restype = ctypes.c_void_p
+        x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        x11.XDefaultRootWindow.restype = ctypes.c_ulong
+        x11.XDefaultRootWindow.argtypes = [ctypes.c_void_p]
+        x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        x11.XFree.argtypes = [ctypes.c_void_p]
+        x11.XInternAtom.restype = ctypes.c_ulong
+        x11.XInternAtom.argtypes = [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_int]
+        x11.XGetWindowProperty.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_long, ctypes.c_long, ctypes.c_int,
+            ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_int),
+            ctypes.POINTER(ctypes.c_ulong), ctypes.POINTER(ctypes.c_ulong),
+            ctypes.POINTER(ctypes.POINTER(ctypes.c_ubyte))]
+        x11.XGetGeometry.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.POINTER(ctypes.c_ulong),
+            ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int),
+            ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint),
+            ctypes.POINTER(ctypes.c_uint), ctypes.POINTER(ctypes.c_uint)]
+        x11.XTranslateCoordinates.argtypes = [
+            ctypes.c_void_p, ctypes.c_ulong, ctypes.c_ulong, ctypes.c_int, ctypes.c_int,
+            ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_int), ctypes.POINTER(ctypes.c_ulong)]
+        x11.XSetErrorHandler.argtypes = [ctypes.c_void_p]
+        x11.XSetErrorHandler.restype = ctypes.c_void_p
+        self._display = x11.XOpenDisplay(display_name.encode() if display_name else None)
+        if not self._display:
+            raise OSError('cannot open X display')
+        self._previous_handler = None
+        self._error_handler = _X_ERROR_HANDLER(self._on_x_error)
+        self._root = x11.XDefaultRootWindow(self._display)
+        self._atoms = {name: x11.XInternAtom(self._display, name.encode(), False) for name in (
+            '_NET_ACTIVE_WINDOW', '_NET_CLIENT_LIST', '_NET_CURRENT_DESKTOP', '_NET_WM_DESKTOP',
+            '_NET_WM_STATE', '_NET_WM_STATE_HIDDEN', '_NET_WM_NAME', 'WM_NAME')}
+        self._lock = threading.Lock()
+
+    def _on_x_error(self, display, event):
+        if display != self._display and self._previous_handler:
+            return _X_ERROR_HANDLER(self._previous_handler)(display, event)
+        # Xlib's default handler would exit the process
+        return 0
+
+    def _property(self, window, name, length=4096):
+        """Return a property as a list of ints (format 32) or bytes (format 8); None if unset."""
+        actual_type, fmt = ctypes.c_ulong(), ctypes.c_int()
+        nitems, after = ctypes.c_ulong(), ctypes.c_ulong()
+        prop = ctypes.POINTER(ctypes.c_ubyte)()
+        status = self._x11.XGetWindowProperty(
+            self._display, window, self._atoms[name], 0, length, False, self.ANY_PROPERTY_TYPE,
+            ctypes.byref(actual_type), ctypes.byref(fmt), ctypes.byref(nitems), ctypes.byref(after), ctypes.byref(prop))
+        if status != 0 or not prop:
+            return None
+        try:
+            if fmt.value == 32:
+                # Format 32 items are C longs, whatever their size
+                return list(ctypes.cast(prop, ctypes.POINTER(ctypes.c_ulong))[:nitems.value])
+            if fmt.value == 8:
+                return ctypes.string_at(prop, nitems.value)
+            return None
+        finally:
+            self._x11.XFree(prop)
+
+    def _box(self, window):
+        root = ctypes.c_ulong()
+        x, y = ctypes.c_int(), ctypes.c_int()
+        width, height, border, depth = ctypes.c_uint(), ctypes.c_uint(), ctypes.c_uint(), ctypes.c_uint()
+        if not self._x11.XGetGeometry(self._display, window, ctypes.byref(root), ctypes.byref(x), ctypes.byref(y),
+                                      ctypes.byref(width), ctypes.byref(height), ctypes.byref(border), ctypes.byref(depth)):
+            return None
+        child = ctypes.c_ulong()
+        if not self._x11.XTranslateCoordinates(self._display, window, self._root, 0, 0,
+                                               ctypes.byref(x), ctypes.byref(y), ctypes.byref(child)):
+            return None
+        return x.value, y.value, x.value + width.value, y.value + height.value
+
+    def _title(self, window):
+        title = self._property(window, '_NET_WM_NAME') or self._property(window, 'WM_NAME')
+        return title.decode('utf-8', 'replace') if isinstance(title, bytes) else ''
+
+    def windows(self):
+        with self._lock:
+            if not self._display:
+                return []
+            self._previous_handler = self._x11.XSetErrorHandler(ctypes.cast(self._error_handler, ctypes.c_void_p))
+            try:
+                return self._windows()
+            finally:
+                self._x11.XSetErrorHandler(self._previous_handler)
+                self._previous_handler = None
+
+    def _windows(self):
+        active = (self._property(self._root, '_NET_ACTIVE_WINDOW') or [0])[0]
+        clients = self._property(self._root, '_NET_CLIENT_LIST', length=65536) or []
+        desktop = (self._property(self._root, '_NET_CURRENT_DESKTOP') or [None])[0]
+        hidden = self._atoms['_NET_WM_STATE_HIDDEN']
+        result = []
+        for window in [active] + [w for w in reversed(clients) if w != active]:
+            if not window:
+                continue
+            on = (self._property(window, '_NET_WM_DESKTOP') or [None])[0]
+            if desktop is not None and on not in (None, desktop, self.ALL_DESKTOPS):
+                continue
+            if hidden in (self._property(window, '_NET_WM_STATE') or []):
+                continue
+            title = self._title(window)
+            if title:
+                result.append(WindowInfo(title, self._box(window), window == active))
+        return result
+
+    def close(self):
+        with self._lock:
+            if self._display:
+                self._x11.XCloseDisplay(self._display)
+                self._display = None
+
+
+class WindowsTitleSource(TitleSource):
+    """Titles of visible, non-minimized top-level windows through EnumWindows."""
+
+    name = 'windows'
+
+    class _Rect(ctypes.Structure):
+        _fields_ = [('left', ctypes.c_long), ('top', ctypes.c_long), ('right', ctypes.c_long), ('bottom', ctypes.c_long)]
+
+    def __init__(self):
+        self._user32 = ctypes.windll.user32
+        self._user32.GetForegroundWindow.restype = ctypes.c_void_p
+        self._enum_proc = ctypes.WINFUNCTYPE(ctypes.c_bool, ctypes.c_void_p, ctypes.c_void_p)
+
+    def _title(self, hwnd):
+        length = self._user32.GetWindowTextLengthW(hwnd)
+        if length <= 0:
+            return ''
+        buf = ctypes.create_unicode_buffer(length + 1)
+        self._user32.GetWindowTextW(hwnd, buf, length + 1)
+        return buf.value
+
+    def windows(self):
+        user32 = self._user32
+        active = user32.GetForegroundWindow()
+        result = []
+
+        def _visit(hwnd, _):
+            if user32.IsWindowVisible(hwnd) and not user32.IsIconic(hwnd):
+                title = self._title(hwnd)
+                if title:
+                    rect = self._Rect()
+                    box = ((rect.left, rect.top, rect.right, rect.bottom)
+                           if user32.GetWindowRect(hwnd, ctypes.byref(rect)) else None)
+                    result.append(WindowInfo(title, box, hwnd == active))
+            return True
+
+        user32.EnumWindows(self._enum_proc(_visit), 0)
+        # Active window first, the rest in z-order as EnumWindows returns them
+        result.sort(key=lambda w: not w.active)
+        return result
+
+
+def create_title_source():
+    """Pick the platform window-title source; the fallback lists nothing."""
+    try:
+        if sys.platform == 'win32':
+            return WindowsTitleSource()
+        if sys.platform.startswith('linux') and os.environ.get('DISPLAY'):
+            return X11TitleSource()
+    except Exception as e:
+        print(f'Window titles unavailable: {e}')
+    return TitleSource()
+
+
+# --- Metrics ---
+METRICS_LOG_PATH = os.path.join(BASE_DIR, 'psg_metrics.jsonl')
+
+
+def _percentile(values, q):
+    """Linear-interpolated percentile (0-100) of ``values``."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+class StageMetrics:
+    """Rolling per-stage timing windows, cheap enough to feed on every check.
+
+    ``record`` is an append under a lock; percentiles are only computed when
+    a snapshot is taken.
+    """
+
+    WINDOW = 512
+
+    def __init__(self, window=WINDOW):
+        self.window = int(window)
+        self._samples = {}
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def record(self, stage, seconds):
+        with self._lock:
+            samples = self._samples.get(stage)
+            if samples is None:
+                samples = self._samples[stage] = deque(maxlen=self.window)
+                self._counts[stage] = 0
+            samples.append(seconds)
+            self._counts[stage] += 1
+
+    def snapshot(self):
+        with self._lock:
+            data = {stage: (list(samples), self._counts[stage]) for stage, samples in self._samples.items()}
+        result = {}
+        for stage, (samples, count) in data.items():
+            result[stage] = {
+                'count': count,
+                'last_ms': samples[-1] * 1000.0,
+                'mean_ms': sum(samples) / len(samples) * 1000.0,
+                'p50_ms': _percentile(samples, 50) * 1000.0,
+                'p95_ms': _percentile(samples, 95) * 1000.0,
+                'p99_ms': _percentile(samples, 99) * 1000.0,
+                'max_ms': max(samples) * 1000.0,
+            }
+        return result
+
+
+class MetricsExporter:
+    """Publishes metric snapshots outside the app.
+
+    Writes one JSON line every ``metrics_log_interval`` seconds to a rotating
+    ``psg_metrics.jsonl`` and, when ``metrics_http_port`` is set, serves the
+    latest snapshot as JSON on http://127.0.0.1:<port>/metrics.
+    """
+
+    def __init__(self, snapshot_fn, settings, log_path=METRICS_LOG_PATH):
+        self.snapshot_fn = snapshot_fn
+        self.settings = settings
+        self.log_path = log_path
+        self._stop = threading.Event()
+        self._thread = None
+        self._server = None
+        self._logger = None
+
+    def start(self):
+        if self.settings.get('metrics_log_enabled', False) and self._thread is None:
+            self._logger = logging.getLogger('psg.metrics')
+            self._logger.propagate = False
+            self._logger.setLevel(logging.INFO)
+            handler = logging.handlers.RotatingFileHandler(
+                self.log_path,
+                maxBytes=int(self.settings.get('metrics_log_max_kb', 1024)) * 1024,
+                backupCount=int(self.settings.get('metrics_log_backups', 3)),
+                encoding='utf-8',
+            )
+            handler.setFormatter(logging.Formatter('%(message)s'))
+            self._logger.addHandler(handler)
+            self._thread = threading.Thread(target=self._log_loop, daemon=True, name='psg-metrics-log')
+            self._thread.start()
+
+        port = int(self.settings.get('metrics_http_port', 0) or 0)
+        if port and self._server is None:
+            import http.server  # only needed when the endpoint is enabled
+            try:
+                self._server = http.server.ThreadingHTTPServer(('127.0.0.1', port), self._make_handler())
+                threading.Thread(target=self._server.serve_forever, daemon=True, name='psg-metrics-http').start()
+                print(f'Metrics endpoint: http://127.0.0.1:{port}/metrics')
+            except OSError as e:
+                print(f'Could not start metrics endpoint on port {port}: {e}')
+                self._server = None
+
+    def _log_loop(self):
+        interval = max(1.0, float(self.settings.get('metrics_log_interval', 60)))
+        while not self._stop.wait(interval):
+            try:
+                self._logger.info(json.dumps(self.snapshot_fn()))
+            except Exception as e:
+                print(f'Could not write metrics: {e}')
+
+    def _make_handler(self):
+        import http.server
+        exporter = self
+
+        class _Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip('/') not in ('', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = json.dumps(exporter.snapshot_fn()).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return _Handler
+
+    def stop(self):
+        self._stop.set()
+        if self._server is not None:
+            try:
+                self._server.shutdown()
+                self._server.server_close()
+            except Exception:
+                pass
+            self._server = None
+        if self._logger is not None:
+            for handler in list(self._logger.handlers):
+                handler.close()
+                self._logger.removeHandler(handler)
+
+
+# --- Detection pipeline ---
+class Frame:
+    """One captured screen moving through the detection stages."""
+
+    def __init__(self, seq, image):
+        self.seq = seq
+        self.image = image
+        self.captured_at = time.perf_counter()
+        self.changed = True
+        self.proc = None
+        self.text = ''
+        # (start, end, box) pieces of ``text`` with their place in ``proc``; used to locate hits
+        self.text_spans = []
+        # Offset in ``text`` where the cascade's full-resolution text starts
+        self.cascade_split = None
+        self.tile_results = []
+        self.hits = []
+        self.partial = 0.0
+        self.timings = {}
+        self.labels = None
+        self.skipped_fraction = 0.0
+        self.generation = 0
+        self.enqueued_at = self.captured_at
+
+
+class StageQueue:
+    """Bounded hand-off between two stages.
+
+    With ``drop_stale`` a full queue discards its oldest item on ``put`` so
+    the consumer always gets the newest frame; otherwise ``put`` blocks.
+    After ``close``, ``get`` returns None (the stop sentinel) and puts are ignored.
+    """
+
+    def __init__(self, maxsize=1, drop_stale=True):
+        self.maxsize = max(1, int(maxsize))
+        self.drop_stale = drop_stale
+        self.dropped = 0
+        self._items = []
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def put(self, item):
+        with self._cond:
+            while len(self._items) >= self.maxsize and not self._closed:
+                if self.drop_stale:
+                    self._items.pop(0)
+                    self.dropped += 1
+                else:
+                    self._cond.wait()
+            if self._closed:
+                return
+            self._items.append(item)
+            self._cond.notify_all()
+
+    def get(self):
+        with self._cond:
+            while not self._items and not self._closed:
+                self._cond.wait()
+            if not self._items:
+                return None
+            item = self._items.pop(0)
+            self._cond.notify_all()
+            return item
+
+    def clear(self):
+        with self._cond:
+            self.dropped += len(self._items)
+            self._items.clear()
+            self._cond.notify_all()
+
+    def close(self):
+        """Drop what is queued and wake the consumer with the None sentinel."""
+        with self._cond:
+            self.dropped += len(self._items)
+            self._items.clear()
+            self._closed = True
+            self._cond.notify_all()
+
+    def __len__(self):
+        return len(self._items)
+
+
+class StageStats:
+    """Per-stage counters: processed frames and smoothed queue wait / work time."""
+
+    SMOOTHING = 0.2
+
+    def __init__(self):
+        self.processed = 0
+        self.wait_seconds = 0.0
+        self.work_seconds = 0.0
+
+    def record(self, wait_seconds, work_seconds):
+        if self.processed == 0:
+            self.wait_seconds, self.work_seconds = wait_seconds, work_seconds
+        else:
+            a = self.SMOOTHING
+            self.wait_seconds += a * (wait_seconds - self.wait_seconds)
+            self.work_seconds += a * (work_seconds - self.work_seconds)
+        self.processed += 1
+
+
+class DetectionPipeline:
+    """Runs preprocess, OCR and match on separate threads behind bounded queues.
+
+    The checker thread only captures, so grabbing frame N+1 overlaps the OCR
+    of frame N.  Preprocess and OCR inputs keep just the newest frame.
+    """
+
+    STAGES = ('preprocess', 'ocr', 'match')
+
+    def __init__(self, checker):
+        self.checker = checker
+        self.queues = {
+            'preprocess': StageQueue(1, drop_stale=True),
+            'ocr': StageQueue(1, drop_stale=True),
+            'match': StageQueue(4, drop_stale=False),
+        }
+        self.stats = {name: StageStats() for name in self.STAGES}
+        self._threads = []
+        self._generation = 0
+        self._stopped = False
+
+    def _ensure_started(self):
+        if self._threads or self._stopped:
+            return
+        for index, name in enumerate(self.STAGES):
+            nxt = self.STAGES[index + 1] if index + 1 < len(self.STAGES) else None
+            t = threading.Thread(target=self._stage_loop, args=(name, nxt), daemon=True, name=f'psg-{name}')
+            t.start()
+            self._threads.append(t)
+
+    def submit(self, frame):
+        self._ensure_started()
+        frame.generation = self._generation
+        frame.enqueued_at = time.perf_counter()
+        self.queues['preprocess'].put(frame)
+
+    def flush(self):
+        """Drop frames still in flight, e.g. when a hit started a cooldown."""
+        self._generation += 1
+        for q in self.queues.values():
+            q.clear()
+
+    def stop(self, timeout=5.0):
+        """End the stage threads; a stage busy with a frame finishes it first."""
+        self._stopped = True
+        self._generation += 1
+        for q in self.queues.values():
+            q.close()
+        for t in self._threads:
+            t.join(timeout)
+        self._threads = []
+
+    def bottleneck_seconds(self):
+        return max(st.work_seconds for st in self.stats.values())
+
+    def _stage_loop(self, name, nxt):
+        work = {
+            'preprocess': self.checker._preprocess,
+            'ocr': self.checker._ocr,
+            'match': self.checker._match,
+        }[name]
+        q = self.queues[name]
+        while True:
+            frame = q.get()
+            if frame is None:
+                return
+            if frame.generation != self._generation:
+                continue
+            t0 = time.perf_counter()
+            try:
+                work(frame)
+            except Exception as e:
+                self.checker._on_stage_error(e)
+                continue
+            t1 = time.perf_counter()
+            self.stats[name].record(t0 - frame.enqueued_at, t1 - t0)
+            if nxt is not None and frame.generation == self._generation:
+                frame.enqueued_at = t1
+                self.queues[nxt].put(frame)
+
+    def snapshot(self):
+        """Queue depth, dropped frames and smoothed latency for every stage."""
+        return {
+            name: {
+                'depth': len(self.queues[name]),
+                'dropped': self.queues[name].dropped,
+                'processed': self.stats[name].processed,
+                'wait_ms': self.stats[name].wait_seconds * 1000.0,
+                'work_ms': self.stats[name].work_seconds * 1000.0,
+            }
+            for name in self.STAGES
+        }
 
-        self.root.bind('<Button-1>', self.close)
-        self.root.bind('<Key>', self.close)
 
-        if fade:
-            try:
-                self.root.attributes('-alpha', 0.0)
-                self._fade_in()
-            except Exception:
-                pass
-        else:
-            try:
-                self.root.attributes('-alpha', self._alpha_target)
-            except Exception:
-                pass
+class CascadeStats:
+    """Counters for the two-tier OCR cascade and the rates used to tune it."""
 
-    def _fade_in(self):
-        try:
-            self._fade_step += 1
-            a = (self._alpha_target / self._fade_steps) * self._fade_step
-            self.root.attributes('-alpha', min(self._alpha_target, a))
-            if self._fade_step < self._fade_steps:
-                delay = int(self._fade_ms / self._fade_steps)
-                self.root.after(max(1, delay), self._fade_in)
-        except Exception:
-            pass
+    FIELDS = ('frames', 'tier1_hits', 'escalated', 'escalated_regions', 'tier2_hits')
 
-    def close(self, event=None):
-        try:
-            self.label.destroy()
-            self.root.destroy()
-            if callable(self._on_close):
-                self._on_close()
-        finally:
-            gc.collect()
+    def __init__(self):
+        for name in self.FIELDS:
+            setattr(self, name, 0)
+        self.escalated_area = 0.0
+
+    @classmethod
+    def combined(cls, parts):
+        total = cls()
+        for part in parts:
+            for name in cls.FIELDS:
+                setattr(total, name, getattr(total, name) + getattr(part, name))
+            total.escalated_area += part.escalated_area
+        return total
+
+    def snapshot(self):
+        data = {name: getattr(self, name) for name in self.FIELDS}
+        data['tier1_hit_rate'] = (self.tier1_hits / self.frames) if self.frames else 0.0
+        data['escalation_rate'] = (self.escalated / self.frames) if self.frames else 0.0
+        data['tier2_hit_rate'] = (self.tier2_hits / self.escalated) if self.escalated else 0.0
+        # Mean share of the frame OCR'd again at full resolution when escalating
+        data['escalated_area'] = (self.escalated_area / self.escalated) if self.escalated else 0.0
+        return data
 
 
 class ScreenChecker(threading.Thread):
-    def __init__(self, settings, on_detect=None):
+    def __init__(self, settings, on_detect=None, capture_source=None, monitor=None, idle_source=None,
+                 title_source=None):
         super().__init__(daemon=True)
         self.settings = settings
         self.on_detect = on_detect
+        # monitor: (left, top, width, height) this checker covers; None is the whole desktop
+        self.monitor = monitor
+        # A source passed in belongs to the caller, who may reuse it after close()
+        self.capture_source = capture_source or create_capture_source(settings, region=monitor)
+        self._owns_capture_source = capture_source is None
+        # Created on first use when idle or lock pausing is enabled; a shared one is not ours to close
+        self.idle_source = idle_source
+        self._owns_idle_source = idle_source is None
+        self.title_source = title_source
+        self._owns_title_source = title_source is None
         self.on_status = None
         self._running = threading.Event()
         self._running.clear()
+        self._closed = False
+        self._wake = threading.Event()
         self.check_count = 0
-        self.last_cleanup_time = time.time()
+        self.frames_skipped = 0
+        self.frames_ocrd = 0
+        self.change_detector = ChangeDetector(settings.get('change_threshold', 6.0))
+        self.scheduler = ScanScheduler(settings)
+        self.last_partial = 0.0
+        self.ocr_backend = None
+        self._ocr_backend_key = None
+        self._matcher = None
+        self._matcher_key = None
+        self.last_hits = []
+        self.tile_pool = TileOcrPool()
+        self.last_tile_results = []
+        self.tile_cache = TileTextCache(float(settings.get('tile_cache_max_mb', 16)) * 1024 * 1024)
+        # Script detected per image content, for routing regions to one language
+        self.script_cache = TileTextCache(256 * 1024)
+        self.last_skipped_fraction = 0.0
+        self.cascade_stats = CascadeStats()
+        self.scroll_tracker = ScrollTracker()
+        self.scroll_stats = ScrollStats()
+        self.governor = CpuGovernor(settings)
+        self._box_cursor = 0
+        self.pipeline = DetectionPipeline(self)
+        self.metrics = StageMetrics()
 
     def start_checking(self):
+        self.change_detector.threshold = float(self.settings.get('change_threshold', 6.0))
+        self.change_detector.reset()
+        self.scheduler.settings = self.settings
+        self.scheduler.reset()
+        self.governor.settings = self.settings
         self._running.set()
+        self._wake.set()
         if not self.is_alive():
             self.start()
 
     def stop_checking(self):
         self._running.clear()
+        self._wake.set()
+        self.pipeline.flush()
 
-    def run(self):
-        if sys.platform == 'win32' and self.settings.get('tesseract_cmd'):
-            pytesseract.pytesseract.tesseract_cmd = self.settings['tesseract_cmd']
+    def close(self):
+        """Stop checking, end the thread and release the OCR engine and worker processes."""
+        self.stop_checking()
+        self._closed = True
+        self._running.set()
+        self.pipeline.stop()
+        self.tile_pool.close()
+        if self._owns_capture_source:
+            self.capture_source.close()
+        if self._owns_idle_source and self.idle_source is not None:
+            self.idle_source.close()
+        if self._owns_title_source and self.title_source is not None:
+            self.title_source.close()
+        if self.ocr_backend is not None:
+            self.ocr_backend.close()
+            self.ocr_backend = None
 
-        while True:
-            if not self._running.is_set():
-                # notify UI that we're idle
-                try:
-                    if callable(self.on_status):
-                        self.on_status(False, self.check_count)
-                except Exception:
-                    pass
-                time.sleep(0.1)
+    def _get_ocr_backend(self):
+        """Return the shared OCR backend, rebuilding it only when its settings change."""
+        key = (self.settings.get('ocr_backend', 'auto'), self.settings.get('tesseract_cmd'))
+        if self.ocr_backend is None or key != self._ocr_backend_key:
+            if self.ocr_backend is not None:
+                self.ocr_backend.close()
+            self.ocr_backend = create_ocr_backend(self.settings)
+            self._ocr_backend_key = key
+            print(f'Using OCR backend: {self.ocr_backend.name}')
+        return self.ocr_backend
+
+    def _get_matcher(self):
+        """Return the compiled keyword matcher, rebuilding it only when the keywords change."""
+        key = (tuple(self.settings.get('sensitive_keywords', [])),
+               int(self.settings.get('fuzzy_max_distance', 0)),
+               self.settings.get('fuzzy_split_words'))
+        if self._matcher is None or key != self._matcher_key:
+            # None leaves split-word matching to follow fuzzy_max_distance
+            split = None if key[2] is None else bool(key[2])
+            self._matcher = KeywordMatcher(key[0], max_distance=key[1], split_words=split)
+            self._matcher_key = key
+        return self._matcher
+
+    def _route_lang(self, frame, image, lang):
+        """Narrow ``lang`` to the languages of the script seen in ``image``; ``lang`` when unsure.
+
+        Only active with ``script_routing`` and a multi-language ``ocr_lang``.
+        Detected scripts are cached by image content.
+        """
+        if '+' not in lang or not self.settings.get('script_routing', False):
+            return lang
+        key = self.script_cache.key_for(image)
+        script = self.script_cache.get(key)
+        if script is None:
+            t0 = time.perf_counter()
+            try:
+                script, conf = self._get_ocr_backend().detect_script(image)
+            except NotImplementedError:
+                script, conf = None, 0.0
+            except Exception as e:
+                print(f'Script detection failed: {e}')
+                script, conf = None, 0.0
+            if conf < float(self.settings.get('script_min_conf', 1.0)):
+                script = None
+            self._add_timing(frame, 'osd', time.perf_counter() - t0)
+            script = script or ''
+            self.script_cache.put(key, script)
+        return languages_for_script(script, lang) or lang
+
+    def _run_ocr(self, frame, method, image, lang, psm, oem):
+        """Call the backend's ``method`` with the routed language, timed per language."""
+        lang = self._route_lang(frame, image, lang)
+        t0 = time.perf_counter()
+        result = getattr(self._get_ocr_backend(), method)(image, lang=lang, psm=psm, oem=oem)
+        self._add_timing(frame, 'ocr:' + lang, time.perf_counter() - t0)
+        return result
+
+    def _ocr_boxes(self, img_proc, boxes, lang, psm, oem, frame=None):
+        """OCR the given boxes of ``img_proc``; return (text, tile_results, spans).
+
+        With the tile cache enabled, boxes whose pixels were seen before are
+        served from it and only dirty ones are OCR'd; those run on the tile
+        pool when parallel tile OCR is on.  The text is reassembled in box
+        order, and ``spans`` maps each box's piece of it back to the box.
+        """
+        use_cache = self.settings.get('tile_cache_enabled', False)
+        self.tile_cache.max_bytes = int(float(self.settings.get('tile_cache_max_mb', 16)) * 1024 * 1024)
+        matcher = self._get_matcher()
+        results = {}
+        dirty = []
+        keys = {}
+        for index, box in enumerate(boxes):
+            tile = img_proc.crop(box)
+            if use_cache:
+                keys[index] = self.tile_cache.key_for(tile, lang, psm, oem)
+                text = self.tile_cache.get(keys[index])
+                if text is not None:
+                    results[index] = TileResult(index, box, text, 0.0, 'cached')
+                    continue
+            dirty.append((index, box, tile))
+
+        limit = self.governor.max_boxes
+        if limit is not None and len(dirty) > limit:
+            # Over the CPU budget: OCR a rotating subset and cover the rest on later frames
+            start = self._box_cursor % len(dirty)
+            rotated = dirty[start:] + dirty[:start]
+            dirty = rotated[:limit]
+            for index, box, _ in rotated[limit:]:
+                results[index] = TileResult(index, box, '', 0.0, 'skipped')
+            self._box_cursor += limit
+            self.change_detector.reset()
+
+        if dirty:
+            if self.settings.get('tile_ocr_enabled', False) and len(dirty) > 1:
+                langs = {index: self._route_lang(frame, tile, lang) for index, _, tile in dirty}
+                fresh = self.tile_pool.run_jobs(dirty, self.settings, matcher, lang, psm, oem, langs=langs)
+                for result in fresh:
+                    if result.status == 'done':
+                        self._add_timing(frame, 'ocr:' + langs[result.index], result.seconds)
+            else:
+                fresh = []
+                for index, box, tile in dirty:
+                    t0 = time.perf_counter()
+                    text = self._run_ocr(frame, 'image_to_string', tile, lang, psm, oem)
+                    fresh.append(TileResult(index, box, text, time.perf_counter() - t0, 'done'))
+            for result in fresh:
+                if use_cache and result.status == 'done':
+                    self.tile_cache.put(keys[result.index], result.text)
+                results[result.index] = result
+
+        ordered = [results[i] for i in sorted(results)]
+        parts = []
+        spans = []
+        pos = 0
+        for r in ordered:
+            if r.status in ('cancelled', 'skipped'):
                 continue
+            if parts:
+                parts.append('\n')
+                pos += 1
+            parts.append(r.text)
+            spans.append((pos, pos + len(r.text), r.box))
+            pos += len(r.text)
+        return ''.join(parts), ordered, spans
 
-            self.check_count += 1
-            # notify UI that we're active
+    # --- Detection stages ---
+    def _record(self, frame, stage, seconds):
+        frame.timings[stage] = seconds
+        self.metrics.record(stage, seconds)
+
+    def _add_timing(self, frame, stage, seconds):
+        """Like ``_record`` for stages run several times per frame: the frame's timing adds up."""
+        if frame is not None:
+            frame.timings[stage] = frame.timings.get(stage, 0.0) + seconds
+        self.metrics.record(stage, seconds)
+
+    def metrics_snapshot(self):
+        """Everything the Performance tab and the exporters show, as plain data."""
+        return {
+            'timestamp': time.time(),
+            'app_version': APP_VERSION,
+            'stages': self.metrics.snapshot(),
+            'counters': {
+                'checks': self.check_count,
+                'frames_ocrd': self.frames_ocrd,
+                'frames_skipped': self.frames_skipped,
+                'scheduler_state': self.scheduler.state,
+                'interval': self.scheduler.interval,
+            },
+            'pipeline': self.pipeline.snapshot() if self.settings.get('pipeline_enabled', False) else None,
+            'tile_cache': self.tile_cache.stats(),
+            'region_skipped_fraction': self.last_skipped_fraction,
+            'cascade': self.cascade_stats.snapshot() if self.settings.get('cascade_enabled', False) else None,
+            'scroll': self.scroll_stats.snapshot() if self.settings.get('scroll_incremental', False) else None,
+            'governor': self.governor.snapshot(),
+        }
+
+    def _capture(self):
+        """Grab a frame; it has ``changed`` False when OCR can be skipped.
+
+        Returns None when a finite capture source is exhausted.
+        """
+        t0 = time.perf_counter()
+        image = self.capture_source.grab()
+        if image is None:
+            return None
+        frame = Frame(self.check_count, image)
+        frame.labels = self.capture_source.last_labels
+        if self.settings.get('skip_unchanged_frames', True) and not self.change_detector.has_changed(frame.image):
+            frame.changed = False
+            self.frames_skipped += 1
+        self._record(frame, 'grab', time.perf_counter() - t0)
+        return frame
+
+    def _preprocess(self, frame):
+        settings = self.settings
+        if self.governor.level:
+            scale = self.governor.scale(float(settings.get('screenshot_scale', 1.0)))
+            settings = ChainMap({'screenshot_scale': scale}, settings)
+        frame.proc = run_preprocess(frame.image, settings,
+                                    record=lambda step, s: self._record(frame, step, s))
+
+    def _ocr(self, frame):
+        t0 = time.perf_counter()
+        self.frames_ocrd += 1
+        lang = self.settings.get('ocr_lang', 'eng') or 'eng'
+        psm = int(self.settings.get('ocr_psm', 6))
+        oem = int(self.settings.get('ocr_oem', 3))
+        if self.settings.get('scroll_incremental', False):
             try:
-                if callable(self.on_status):
-                    self.on_status(True, self.check_count)
-            except Exception:
+                self._ocr_scroll(frame, lang, psm, oem)
+                self._record(frame, 'ocr', time.perf_counter() - t0)
+                return
+            except NotImplementedError:
                 pass
+        if self.settings.get('cascade_enabled', False):
             try:
-                img = ImageGrab.grab()
+                self._ocr_cascade(frame, lang, psm, oem)
+                self._record(frame, 'ocr', time.perf_counter() - t0)
+                return
+            except NotImplementedError:
+                pass
+        boxes = None
+        if self.settings.get('text_regions_enabled', False):
+            t1 = time.perf_counter()
+            boxes = propose_text_regions(frame.proc, self.settings)
+            self._record(frame, 'regions', time.perf_counter() - t1)
+            total = frame.proc.width * frame.proc.height
+            covered = sum((r - l) * (b - t) for l, t, r, b in boxes)
+            frame.skipped_fraction = 1.0 - (covered / total if total else 0.0)
+            self.last_skipped_fraction = frame.skipped_fraction
+        elif self.settings.get('tile_cache_enabled', False) or self.settings.get('tile_ocr_enabled', False):
+            boxes = split_tiles(frame.proc.width, frame.proc.height,
+                                self.settings.get('tile_size', 1024), self.settings.get('tile_overlap', 64))
+        if boxes is None:
+            words = None
+            if self.settings.get('blur_mode', 'full') == 'regions':
+                try:
+                    words = self._run_ocr(frame, 'image_to_data', frame.proc, lang, psm, oem)
+                except NotImplementedError:
+                    pass
+            if words is None:
+                frame.text = self._run_ocr(frame, 'image_to_string', frame.proc, lang, psm, oem)
+            else:
+                frame.text, frame.text_spans = words_to_text(words)
+        else:
+            frame.text, frame.tile_results, frame.text_spans = self._ocr_boxes(frame.proc, boxes, lang, psm, oem, frame)
+        if frame.tile_results:
+            self.last_tile_results = frame.tile_results
+        self._record(frame, 'ocr', time.perf_counter() - t0)
 
-                scale = max(0.25, float(self.settings.get('screenshot_scale', 1.0)))
-                if scale != 1.0:
-                    new_size = (int(img.width * scale), int(img.height * scale))
-                    img_small = img.resize(new_size, Image.LANCZOS)
-                else:
-                    img_small = img
+    def _ocr_scroll(self, frame, lang, psm, oem):
+        """Word-level OCR that, after a scroll, reads only the newly exposed strips.
 
-                # Improve OCR contrast
-                img_proc = ImageOps.grayscale(img_small)
-                # Let pytesseract run (timeout may not be available in all versions)
-                try:
-                    lang = self.settings.get('ocr_lang', 'eng') or 'eng'
-                    psm = int(self.settings.get('ocr_psm', 6))
-                    oem = int(self.settings.get('ocr_oem', 3))
-                    config = f'--oem {oem} --psm {psm}'
-                    text = pytesseract.image_to_string(img_proc, lang=lang, config=config).lower()
-                except TypeError:
-                    # Older pytesseract versions may not accept timeout kw
-                    text = pytesseract.image_to_string(img_proc).lower()
-
-                for kw in self.settings.get('sensitive_keywords', []):
-                    if kw.strip().lower() and kw.lower() in text:
-                        print(f"Detected keyword: {kw}")
-                        if callable(self.on_detect):
-                            self.on_detect(img, self.settings)
-                        # cooldown
-                        time.sleep(float(self.settings.get('cooldown', 5.0)))
-                        break
-
-            except pytesseract.TesseractNotFoundError:
-                print('Tesseract not found. Update path in settings.')
-                self._running.clear()
+        The words of the last OCR'd frame are kept with their boxes; the
+        ScrollTracker moves them by the detected offset and returns the strips
+        that still need reading.  Anything that does not look like a scroll
+        (or a governor scale change) falls back to a full pass.
+        """
+        tracker = self.scroll_tracker
+        stats = self.scroll_stats
+        key = (lang, psm, oem)
+        t0 = time.perf_counter()
+        plan = tracker.plan(frame.proc, key,
+                            margin=int(self.settings.get('scroll_strip_margin', 32)),
+                            max_dirty=float(self.settings.get('scroll_max_dirty', 0.6)))
+        self._record(frame, 'scroll', time.perf_counter() - t0)
+        if plan is None:
+            words = [w._replace(line=(frame.seq, 0, w.line))
+                     for w in self._run_ocr(frame, 'image_to_data', frame.proc, lang, psm, oem)]
+            stats.full += 1
+        else:
+            boxes, words = plan
+            if boxes:
+                stats.incremental += 1
+                total = frame.proc.width * frame.proc.height
+                stats.ocr_area += sum((r - l) * (b - t) for l, t, r, b in boxes) / total if total else 0.0
+            else:
+                stats.unchanged += 1
+            stats.strips += len(boxes)
+            stats.reused_words += len(words)
+            for n, (left, top, right, bottom) in enumerate(boxes, 1):
+                strip = self._run_ocr(frame, 'image_to_data', frame.proc.crop((left, top, right, bottom)), lang, psm, oem)
+                # Line ids are per OCR call, so tag them with the frame and strip they came from
+                words.extend(w._replace(box=(w.box[0] + left, w.box[1] + top, w.box[2] + left, w.box[3] + top),
+                                        line=(frame.seq, n, w.line)) for w in strip)
+            words = words_in_reading_order(words)
+        stats.frames += 1
+        tracker.commit(frame.proc, key, words)
+        frame.text, frame.text_spans = words_to_text(words)
+
+    def _ocr_cascade(self, frame, lang, psm, oem):
+        """Two-tier OCR: a sparse-text pass over a reduced frame, then full resolution where needed.
+
+        The coarse pass uses ``cascade_psm`` on ``frame.proc`` reduced by
+        ``cascade_reduce``.  Only areas where it saw a partial keyword, dense
+        text or low-confidence words are OCR'd again at full resolution with
+        the normal settings.
+        """
+        matcher = self._get_matcher()
+        stats = self.cascade_stats
+        factor = max(1, int(self.settings.get('cascade_reduce', 3)))
+        t0 = time.perf_counter()
+        coarse = frame.proc.reduce(factor) if factor > 1 else frame.proc
+        words = self._run_ocr(frame, 'image_to_data', coarse, lang, int(self.settings.get('cascade_psm', 11)), oem)
+        stats.frames += 1
+        words = [w._replace(box=tuple(v * factor for v in w.box)) for w in words]
+        frame.text, frame.text_spans = words_to_text(words)
+        self._record(frame, 'ocr_coarse', time.perf_counter() - t0)
+        if matcher.search(frame.text):
+            stats.tier1_hits += 1
+            return
+
+        boxes = self._escalation_boxes(words, matcher, frame.proc.size)
+        if not boxes:
+            return
+        stats.escalated += 1
+        stats.escalated_regions += len(boxes)
+        total = frame.proc.width * frame.proc.height
+        stats.escalated_area += sum((r - l) * (b - t) for l, t, r, b in boxes) / total if total else 0.0
+        t1 = time.perf_counter()
+        fine_text, frame.tile_results, fine_spans = self._ocr_boxes(frame.proc, boxes, lang, psm, oem, frame)
+        self._record(frame, 'ocr_fine', time.perf_counter() - t1)
+        split = len(frame.text) + 1
+        frame.text = frame.text + '\n' + fine_text
+        frame.text_spans = frame.text_spans + [(s + split, e + split, box) for s, e, box in fine_spans]
+        frame.cascade_split = split
+
+    def _escalation_boxes(self, words, matcher, size):
+        """Boxes (in ``proc`` pixels) of coarse-pass word clusters worth a full-resolution look."""
+        gap = int(self.settings.get('cascade_margin', 12))
+        min_partial = float(self.settings.get('cascade_partial', 0.6))
+        dense_words = int(self.settings.get('cascade_dense_words', 8))
+        min_conf = float(self.settings.get('cascade_min_conf', 60))
+        width, height = size
+        boxes = []
+        # Sparse-text PSM gives no reliable line grouping, so cluster words by proximity
+        for cl, ct, cr, cb in _merge_boxes([w.box for w in words], gap):
+            inside = [w for w in words
+                      if cl <= (w.box[0] + w.box[2]) // 2 <= cr and ct <= (w.box[1] + w.box[3]) // 2 <= cb]
+            if not inside:
+                continue
+            inside.sort(key=lambda w: (w.box[1], w.box[0]))
+            partial = matcher.scan(' '.join(w.text for w in inside))[1]
+            conf = sum(w.conf for w in inside) / len(inside)
+            if partial >= min_partial or len(inside) >= dense_words or conf < min_conf:
+                boxes.append((max(0, cl - gap), max(0, ct - gap), min(width, cr + gap), min(height, cb + gap)))
+        return _merge_boxes(boxes, 0)
+
+    def _match(self, frame):
+        t0 = time.perf_counter()
+        frame.hits, frame.partial = self._get_matcher().scan(frame.text)
+        self.last_hits, self.last_partial = frame.hits, frame.partial
+        if frame.cascade_split is not None and any(hit.start >= frame.cascade_split for hit in frame.hits):
+            self.cascade_stats.tier2_hits += 1
+        self._record(frame, 'match', time.perf_counter() - t0)
+        if frame.hits:
+            self._handle_hit(frame)
+
+    def _handle_hit(self, frame):
+        found = sorted({(hit.keyword, hit.distance) for hit in frame.hits})
+        print('Detected keyword: ' + ', '.join(kw if not d else f'{kw} (distance {d})' for kw, d in found))
+        # Re-check this content after the cooldown even if the screen stays static
+        self.change_detector.reset()
+        self.scheduler.enter_cooldown(float(self.settings.get('cooldown', 5.0)))
+        self.pipeline.flush()
+        if callable(self.on_detect):
+            regions = self._hit_regions(frame) if self.settings.get('blur_mode', 'full') == 'regions' else None
+            self.on_detect(self.capture_source.color_snapshot(frame.image), self.settings, self.monitor, regions)
+
+    def _hit_regions(self, frame):
+        """Boxes around the hits in ``frame.image`` pixels, with the blur margin; None if unknown."""
+        boxes = boxes_for_hits(frame.hits, frame.text_spans)
+        if not boxes:
+            return None
+        width, height = frame.image.size
+        sx = width / frame.proc.width
+        sy = height / frame.proc.height
+        margin = int(self.settings.get('blur_region_margin', 16))
+        return [(max(0, int(l * sx) - margin), max(0, int(t * sy) - margin),
+                 min(width, int(r * sx + 0.5) + margin), min(height, int(b * sy + 0.5) + margin))
+                for l, t, r, b in boxes]
+
+    def _check_titles(self):
+        """Match the titles of the windows on this monitor before any OCR.
+
+        On a hit the screen is grabbed and handled like an OCR hit straight
+        away; in ``regions`` blur mode the matching windows are blurred.
+        Returns that frame, or None when nothing matched.
+        """
+        if not self.settings.get('title_prescreen', True):
+            return None
+        if self.title_source is None:
+            self.title_source = create_title_source()
+        t0 = time.perf_counter()
+        try:
+            windows = self.title_source.windows()
+        except Exception as e:
+            print(f'Could not read window titles: {e}')
+            windows = []
+        left, top = self.monitor[:2] if self.monitor else (0, 0)
+        right, bottom = (left + self.monitor[2], top + self.monitor[3]) if self.monitor else (None, None)
+        parts = []
+        spans = []
+        pos = 0
+        for window in windows:
+            box = window.box
+            if box is not None and self.monitor is not None:
+                if box[2] <= left or box[0] >= right or box[3] <= top or box[1] >= bottom:
+                    continue
+            if parts:
+                parts.append('\n')
+                pos += 1
+            parts.append(window.title)
+            if box is not None:
+                # Frame pixels are relative to the monitor
+                spans.append((pos, pos + len(window.title), (box[0] - left, box[1] - top, box[2] - left, box[3] - top)))
+            pos += len(window.title)
+        text = ''.join(parts)
+        hits = self._get_matcher().scan(text)[0] if text else []
+        self.metrics.record('titles', time.perf_counter() - t0)
+        if not hits:
+            return None
+        image = self.capture_source.grab()
+        if image is None:
+            return None
+        frame = Frame(self.check_count, image)
+        frame.proc = image
+        frame.text = text
+        frame.hits = hits
+        covered = boxes_for_hits(hits, spans)
+        if len(covered) == len(hits):
+            width, height = image.size
+            frame.text_spans = [(s, e, (max(0, l), max(0, t), min(width, r), min(height, b))) for s, e, (l, t, r, b) in spans]
+        print('Keyword in window title: ' + ', '.join(sorted({text[h.start:h.end] for h in hits})))
+        self._handle_hit(frame)
+        return frame
+
+    def check_once(self):
+        """Run one full capture -> preprocess -> OCR -> match cycle and return the frame."""
+        frame = self._capture()
+        if frame is not None and frame.changed:
+            self._preprocess(frame)
+            self._ocr(frame)
+            self._match(frame)
+        return frame
+
+    def _on_stage_error(self, error):
+        if isinstance(error, pytesseract.TesseractNotFoundError):
+            print('Tesseract not found. Update path in settings.')
+            self._running.clear()
+        else:
+            print(f'Error during check: {error}')
+
+    def _notify_status(self, running):
+        try:
+            if callable(self.on_status):
+                self.on_status(running, self.check_count)
+        except Exception:
+            pass
+
+    def _pause_reason(self):
+        """Return 'locked' or 'away' when scanning should pause, else None."""
+        idle_after = float(self.settings.get('idle_pause_seconds', 0))
+        when_locked = self.settings.get('pause_when_locked', True)
+        if idle_after <= 0 and not when_locked:
+            return None
+        if self.idle_source is None:
+            self.idle_source = create_idle_source()
+        try:
+            if when_locked and self.idle_source.is_locked():
+                return 'locked'
+            idle = self.idle_source.idle_seconds()
+        except Exception as e:
+            print(f'Idle detection failed: {e}')
+            return None
+        if idle_after > 0 and idle is not None and idle >= idle_after:
+            return 'away'
+        return None
+
+    def run(self):
+        while not self._closed:
+            if not self._running.is_set():
+                # Stopped: block until started (or closed), no periodic wakeups
+                self._notify_status(False)
+                self._running.wait()
+                continue
+
+            paused = self._pause_reason()
+            if paused:
+                if self.scheduler.state != paused:
+                    print(f'Scanning paused: {paused}')
+                    self.scheduler.state = paused
+                    self._notify_status(True)
+                # Poll the (cheap) idle source so activity resumes scanning within a second
+                self._wake.clear()
+                self._wake.wait(float(self.settings.get('idle_poll_interval', 1.0)))
+                continue
+            if self.scheduler.state in ('away', 'locked'):
+                print('Scanning resumed')
+                self.scheduler.reset()
+                self.change_detector.reset()
+
+            self.check_count += 1
+            self._notify_status(True)
+            self._wake.clear()
+            started = time.perf_counter()
+            changed = True
+            try:
+                # Titles cost microseconds; a hit there needs no OCR at all
+                frame = self._check_titles()
+                if frame is None and self.settings.get('pipeline_enabled', False):
+                    # Later stages run on their own threads; only capture happens here
+                    frame = self._capture()
+                    changed = frame is not None and frame.changed
+                    if changed:
+                        self.pipeline.submit(frame)
+                elif frame is None:
+                    frame = self.check_once()
+                    changed = frame is not None and frame.changed
+                if frame is None:
+                    print(f'Capture source {self.capture_source.name!r} exhausted.')
+                    self._running.clear()
             except Exception as e:
-                print(f'Error during check: {e}')
+                self._on_stage_error(e)
             finally:
                 if self.check_count % int(self.settings.get('force_gc_interval', 5)) == 0:
                     gc.collect()
+                self.governor.observe()
+
+                busy = time.perf_counter() - started
+                if self.settings.get('pipeline_enabled', False):
+                    # Capture is cheap; budget against the slowest stage instead
+                    busy = max(busy, self.pipeline.bottleneck_seconds())
+                delay = self.scheduler.next_delay(
+                    changed,
+                    change_score=self.change_detector.last_score,
+                    partial=self.last_partial if changed else 0.0,
+                    busy_seconds=busy,
+                )
+                if self.scheduler.state != 'cooldown':
+                    # The cooldown is a deadline; only scan intervals are stretched
+                    delay = self.governor.delay(delay)
+                # Interruptible wait: stop/start wakes the thread immediately
+                self._wake.wait(delay)
+
+
+class MonitorCheckerGroup:
+    """One ScreenChecker per monitor, presented to the app as a single checker.
+
+    Each monitor gets its own capture region, change detector and scheduler,
+    so a busy screen does not speed up checks of an idle one. The checkers
+    run on separate threads. OCR happens in tesseract processes or in
+    tesserocr calls that release the GIL, so the monitors are scanned in
+    parallel across cores.
+    """
+
+    def __init__(self, settings, on_detect=None):
+        self._settings = settings
+        self.on_detect = on_detect
+        self.on_status = None
+        self.metrics = StageMetrics()
+        self.governor = CpuGovernor(settings)
+        # One idle source and one title source (one display connection each) shared by all checkers
+        self.idle_source = None
+        self.title_source = None
+        self.checkers = []
+        self._sync_monitors()
+
+    @staticmethod
+    def detect_monitors(settings):
+        """Geometries to scan; [None] means the whole desktop with a single checker."""
+        if not settings.get('multi_monitor', True):
+            return [None]
+        monitors = list_monitors()
+        index = int(settings.get('capture_monitor', -1))
+        if 0 <= index < len(monitors):
+            return [monitors[index]]
+        return monitors if len(monitors) > 1 else [None]
+
+    @property
+    def monitors(self):
+        return [checker.monitor for checker in self.checkers]
+
+    def _sync_monitors(self):
+        """(Re)build the checkers when the monitor layout changed; only called while stopped."""
+        wanted = self.detect_monitors(self._settings)
+        if wanted == self.monitors:
+            return
+        for checker in self.checkers:
+            checker.close()
+        self.checkers = []
+        for geometry in wanted:
+            checker = ScreenChecker(self._settings, on_detect=self.on_detect, monitor=geometry)
+            checker.metrics = self.metrics
+            checker.governor = self.governor
+            checker.on_status = self._child_status
+            self.checkers.append(checker)
+        if len(wanted) > 1:
+            print(f'Scanning {len(wanted)} monitors: ' + ', '.join(f'{w}x{h}+{x}+{y}' for x, y, w, h in wanted))
+
+    def _child_status(self, running, count):
+        if callable(self.on_status):
+            self.on_status(running, self.check_count)
+
+    @property
+    def settings(self):
+        return self._settings
+
+    @settings.setter
+    def settings(self, settings):
+        self._settings = settings
+        self.governor.settings = settings
+        for checker in self.checkers:
+            checker.settings = settings
+
+    @property
+    def check_count(self):
+        return sum(checker.check_count for checker in self.checkers)
+
+    @property
+    def frames_ocrd(self):
+        return sum(checker.frames_ocrd for checker in self.checkers)
+
+    @property
+    def frames_skipped(self):
+        return sum(checker.frames_skipped for checker in self.checkers)
+
+    @property
+    def scheduler_state(self):
+        return '/'.join(checker.scheduler.state for checker in self.checkers)
+
+    def start_checking(self):
+        if not any(checker._running.is_set() for checker in self.checkers):
+            self._sync_monitors()
+        if self.idle_source is None:
+            self.idle_source = create_idle_source()
+        if self.title_source is None and self._settings.get('title_prescreen', True):
+            self.title_source = create_title_source()
+        for checker in self.checkers:
+            checker.idle_source = self.idle_source
+            checker._owns_idle_source = False
+            if self.title_source is not None:
+                checker.title_source = self.title_source
+                checker._owns_title_source = False
+            checker.start_checking()
+
+    def stop_checking(self):
+        for checker in self.checkers:
+            checker.stop_checking()
+
+    def close(self):
+        for checker in self.checkers:
+            checker.close()
+        if self.idle_source is not None:
+            self.idle_source.close()
+        if self.title_source is not None:
+            self.title_source.close()
+
+    def metrics_snapshot(self):
+        snaps = [checker.metrics_snapshot() for checker in self.checkers]
+        if len(snaps) == 1:
+            return snaps[0]
+        cache = {key: sum(s['tile_cache'][key] for s in snaps)
+                 for key in ('entries', 'bytes', 'hits', 'misses', 'evictions')}
+        lookups = cache['hits'] + cache['misses']
+        cache['hit_rate'] = (cache['hits'] / lookups) if lookups else 0.0
+        pipeline = {}
+        for index, s in enumerate(snaps):
+            for name, stats in (s['pipeline'] or {}).items():
+                pipeline[f'{name}[{index}]'] = stats
+        return {
+            'timestamp': time.time(),
+            'app_version': APP_VERSION,
+            'stages': self.metrics.snapshot(),
+            'counters': {
+                'checks': self.check_count,
+                'frames_ocrd': self.frames_ocrd,
+                'frames_skipped': self.frames_skipped,
+                'scheduler_state': self.scheduler_state,
+                'interval': min(s['counters']['interval'] for s in snaps),
+            },
+            'pipeline': pipeline or None,
+            'tile_cache': cache,
+            'region_skipped_fraction': sum(s['region_skipped_fraction'] for s in snaps) / len(snaps),
+            'cascade': (CascadeStats.combined(c.cascade_stats for c in self.checkers).snapshot()
+                        if self._settings.get('cascade_enabled', False) else None),
+            'scroll': (ScrollStats.combined(c.scroll_stats for c in self.checkers).snapshot()
+                       if self._settings.get('scroll_incremental', False) else None),
+            'governor': self.governor.snapshot(),
+            'monitors': [dict(s['counters'], geometry=checker.monitor) for checker, s in zip(self.checkers, snaps)],
+        }
+
+
+# --- Benchmark harness ---
+def _summarize(values):
+    return {
+        'count': len(values),
+        'mean_ms': (sum(values) / len(values) * 1000.0) if values else 0.0,
+        'p50_ms': _percentile(values, 50) * 1000.0,
+        'p95_ms': _percentile(values, 95) * 1000.0,
+        'p99_ms': _percentile(values, 99) * 1000.0,
+    }
+
+
+def _cpu_seconds():
+    """CPU time of this process plus finished child processes (tesseract)."""
+    t = os.times()
+    return t.user + t.system + t.children_user + t.children_system
+
+
+def _peak_memory_bytes():
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+        return peak if sys.platform == 'darwin' else peak * 1024
+    except ImportError:
+        pass
+    try:
+        from ctypes import wintypes
+
+        class PROCESS_MEMORY_COUNTERS(ctypes.Structure):
+            _fields_ = [
+                ('cb', wintypes.DWORD), ('PageFaultCount', wintypes.DWORD),
+                ('PeakWorkingSetSize', ctypes.c_size_t), ('WorkingSetSize', ctypes.c_size_t),
+                ('QuotaPeakPagedPoolUsage', ctypes.c_size_t), ('QuotaPagedPoolUsage', ctypes.c_size_t),
+                ('QuotaPeakNonPagedPoolUsage', ctypes.c_size_t), ('QuotaNonPagedPoolUsage', ctypes.c_size_t),
+                ('PagefileUsage', ctypes.c_size_t), ('PeakPagefileUsage', ctypes.c_size_t),
+            ]
+
+        counters = PROCESS_MEMORY_COUNTERS()
+        counters.cb = ctypes.sizeof(counters)
+        handle = ctypes.windll.kernel32.GetCurrentProcess()
+        if ctypes.windll.psapi.GetProcessMemoryInfo(handle, ctypes.byref(counters), counters.cb):
+            return counters.PeakWorkingSetSize
+    except Exception:
+        pass
+    return None
+
+
+def run_benchmark(source, settings, repeat=1):
+    """Replay ``source`` through the real detection stages and return a JSON-able report.
+
+    Labeled keywords are added to the keyword list so recall measures the
+    OCR, not the configuration.  Frames skipped as unchanged inherit the
+    previous frame's detections, as they would in the live app.
+    """
+    settings = dict(settings)
+    labeled = source.labeled_keywords()
+    keywords = list(settings.get('sensitive_keywords', []))
+    known = {k.strip().lower() for k in keywords}
+    keywords += [k for k in sorted(labeled) if k.strip().lower() not in known]
+    settings['sensitive_keywords'] = keywords
+
+    checker = ScreenChecker(settings, capture_source=source)
+    stage_times = {}
+    totals = []
+    tp = fp = fn = 0
+    frames = skipped = 0
+    previous = set()
+    # Per edit distance: hits, and how many of them were labeled correct
+    distances = {}
+
+    cpu0 = _cpu_seconds()
+    wall0 = time.perf_counter()
+    try:
+        for _ in range(max(1, int(repeat))):
+            source.rewind()
+            checker.change_detector.reset()
+            while True:
+                checker.check_count += 1
+                t0 = time.perf_counter()
+                frame = checker.check_once()
+                if frame is None:
+                    break
+                totals.append(time.perf_counter() - t0)
+                frames += 1
+                for stage, seconds in frame.timings.items():
+                    stage_times.setdefault(stage, []).append(seconds)
+                if frame.changed:
+                    previous = {hit.keyword.lower() for hit in frame.hits}
+                else:
+                    skipped += 1
+                if frame.labels is not None:
+                    expected = {k.strip().lower() for k in frame.labels}
+                    if frame.changed:
+                        for hit in frame.hits:
+                            counts = distances.setdefault(hit.distance, {'hits': 0, 'correct': 0})
+                            counts['hits'] += 1
+                            counts['correct'] += hit.keyword.lower() in expected
+                    tp += len(previous & expected)
+                    fp += len(previous - expected)
+                    fn += len(expected - previous)
+    finally:
+        checker.close()
+    wall = time.perf_counter() - wall0
+
+    return {
+        'app_version': APP_VERSION,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'source': getattr(source, 'path', None) or getattr(source, 'manifest_path', None),
+        'settings': {k: settings.get(k) for k in (
+            'screenshot_scale', 'preprocess_chain', 'resize_method', 'ocr_backend', 'ocr_lang', 'ocr_psm', 'ocr_oem',
+            'skip_unchanged_frames', 'fuzzy_max_distance', 'cascade_enabled', 'scroll_incremental', 'tile_ocr_enabled', 'tile_cache_enabled', 'ocr_workers')},
+        'frames': frames,
+        'frames_skipped': skipped,
+        'wall_seconds': wall,
+        'fps': (frames / wall) if wall > 0 else 0.0,
+        'cpu_seconds': _cpu_seconds() - cpu0,
+        'peak_memory_bytes': _peak_memory_bytes(),
+        'stages': {stage: _summarize(values) for stage, values in stage_times.items()},
+        'total': _summarize(totals),
+        'true_positives': tp,
+        'false_positives': fp,
+        'false_negatives': fn,
+        'recall': (tp / (tp + fn)) if (tp + fn) else None,
+        'precision': (tp / (tp + fp)) if (tp + fp) else None,
+        'cascade': checker.cascade_stats.snapshot() if settings.get('cascade_enabled', False) else None,
+        'scroll': checker.scroll_stats.snapshot() if settings.get('scroll_incremental', False) else None,
+        'hit_distances': {str(d): counts for d, counts in sorted(distances.items())},
+    }
+
+
+# Chains compared by --bench-preprocess; the first is the original resize-then-grayscale path
+PREPROCESS_CANDIDATES = [
+    {'preprocess_chain': ['resize', 'grayscale'], 'resize_method': 'lanczos'},
+    {'preprocess_chain': ['grayscale', 'resize'], 'resize_method': 'lanczos'},
+    {'preprocess_chain': ['grayscale', 'resize'], 'resize_method': 'bilinear'},
+    {'preprocess_chain': ['grayscale', 'resize'], 'resize_method': 'reduce'},
+    {'preprocess_chain': ['grayscale', 'resize', 'autocontrast'], 'resize_method': 'reduce'},
+    {'preprocess_chain': ['grayscale', 'resize', 'threshold'], 'resize_method': 'reduce'},
+]
+
+
+def run_preprocess_benchmark(source, settings, repeat=1, candidates=PREPROCESS_CANDIDATES):
+    """Benchmark each preprocessing chain on ``source``.
+
+    Returns per-step timings, OCR time and recall for every candidate, plus
+    the fastest candidate whose recall is at least the baseline's.
+    """
+    results = []
+    for candidate in candidates:
+        report = run_benchmark(source, dict(settings, **candidate), repeat=repeat)
+        steps = {name: report['stages'][name] for name in candidate['preprocess_chain'] if name in report['stages']}
+        results.append({
+            'preprocess_chain': candidate['preprocess_chain'],
+            'resize_method': candidate['resize_method'],
+            'steps': steps,
+            'preprocess_p50_ms': sum(s['p50_ms'] for s in steps.values()),
+            'ocr': report['stages'].get('ocr'),
+            'total': report['total'],
+            'recall': report['recall'],
+            'precision': report['precision'],
+        })
+    baseline = results[0]['recall'] if results else None
+    keeps_accuracy = [r for r in results
+                      if baseline is None or (r['recall'] is not None and r['recall'] >= baseline)]
+    best = min(keeps_accuracy, key=lambda r: r['total']['p50_ms'], default=None)
+    return {
+        'app_version': APP_VERSION,
+        'source': getattr(source, 'path', None) or getattr(source, 'manifest_path', None),
+        'screenshot_scale': settings.get('screenshot_scale', 1.0),
+        'candidates': results,
+        'recommended': best and {k: best[k] for k in ('preprocess_chain', 'resize_method')},
+    }
+
+
+# Values swept by --autotune: every OCR combination, then blur radius and interval for the winner
+AUTOTUNE_GRID = OrderedDict([
+    ('screenshot_scale', (0.5, 0.75, 1.0)),
+    ('ocr_psm', (3, 6, 11)),
+    ('ocr_oem', (1, 3)),
+])
+AUTOTUNE_BLUR_RADII = (6, 10, 15, 20, 25, 35, 50)
+AUTOTUNE_INTERVALS = (0.5, 1.0, 1.5, 2.0, 3.0, 5.0)
 
-                # Periodic cleanup if enabled
-                if self.settings.get('cleanup_enabled', True):
-                    cleanup_interval_hours = float(self.settings.get('cleanup_interval_hours', 24))
-                    cleanup_interval_secs = cleanup_interval_hours * 3600
-                    if time.time() - self.last_cleanup_time > cleanup_interval_secs:
-                        if self.settings.get('cleanup_temp_files', True) or self.settings.get('cleanup_cache', True):
-                            removed = cleanup_temp_files()
-                            print(f'[Cleanup] Removed {removed} temporary files.')
-                            self.last_cleanup_time = time.time()
 
-                time.sleep(float(self.settings.get('check_interval', 2.0)))
+def pareto_front(results):
+    """Results not beaten on both latency (``p50_ms``) and ``recall`` by another one."""
+    front = []
+    for r in results:
+        dominated = any(
+            o['p50_ms'] <= r['p50_ms'] and o['recall'] >= r['recall']
+            and (o['p50_ms'] < r['p50_ms'] or o['recall'] > r['recall'])
+            for o in results
+        )
+        if not dominated:
+            front.append(r)
+    return sorted(front, key=lambda r: r['p50_ms'])
+
+
+def run_autotune(source, settings, recall_target=None, repeat=1):
+    """Pick the fastest OCR configuration on ``source`` that meets ``recall_target``.
+
+    Every ``AUTOTUNE_GRID`` combination is benchmarked (skipping of unchanged
+    frames off, so each sample is OCR'd).  The winner is the lowest-latency
+    point of the latency/recall Pareto front that reaches the target, by
+    default the recall of the current settings.  For it, ``blur_radius`` is
+    the smallest radius behind which OCR finds no labeled keyword, and
+    ``check_interval`` the shortest interval whose p95 scan time fits
+    ``scan_cpu_budget``.  Returns a JSON-able report; ``recommended`` is None
+    when nothing qualifies.
+    """
+    if not source.labeled_keywords():
+        raise ValueError('autotune needs labeled samples (labels.json or a frames.jsonl manifest)')
+    settings = dict(settings, skip_unchanged_frames=False)
+    if recall_target is None:
+        recall_target = run_benchmark(source, settings, repeat=repeat)['recall'] or 0.0
+
+    results = []
+    for values in itertools.product(*AUTOTUNE_GRID.values()):
+        config = dict(zip(AUTOTUNE_GRID, values))
+        try:
+            report = run_benchmark(source, dict(settings, **config), repeat=repeat)
+        except Exception as e:
+            print(f'Autotune: {config} failed: {e}')
+            continue
+        result = dict(config, p50_ms=report['total']['p50_ms'], p95_ms=report['total']['p95_ms'],
+                      recall=report['recall'] or 0.0, precision=report['precision'])
+        print(f"Autotune: {config} p50 {result['p50_ms']:.0f} ms, recall {result['recall']:.0%}")
+        results.append(result)
+
+    front = pareto_front(results)
+    best = next((r for r in front if r['recall'] >= recall_target), None)
+    recommended = None
+    blur = []
+    if best is not None:
+        tuned = dict(settings, **{k: best[k] for k in AUTOTUNE_GRID})
+        radius = None
+        for candidate in AUTOTUNE_BLUR_RADII:
+            blurred = BlurredCaptureSource(source, dict(tuned, blur_radius=candidate))
+            report = run_benchmark(blurred, tuned, repeat=1)
+            blur.append({'blur_radius': candidate, 'leaked': report['true_positives'],
+                         'blur_ms': _summarize(blurred.blur_seconds)['p50_ms']})
+            if report['true_positives'] == 0:
+                radius = candidate
+                break
+        budget = min(1.0, max(0.01, float(settings.get('scan_cpu_budget', 0.5))))
+        interval = next((i for i in AUTOTUNE_INTERVALS if best['p95_ms'] / 1000.0 <= budget * i), AUTOTUNE_INTERVALS[-1])
+        recommended = {k: best[k] for k in AUTOTUNE_GRID}
+        recommended['check_interval'] = interval
+        if radius is not None:
+            recommended['blur_radius'] = radius
+    return {
+        'app_version': APP_VERSION,
+        'source': getattr(source, 'path', None) or getattr(source, 'manifest_path', None),
+        'recall_target': recall_target,
+        'candidates': results,
+        'pareto_front': front,
+        'blur': blur,
+        'recommended': recommended,
+    }
 
 
 def _make_tray_image(size=64):
@@ -317,13 +4134,14 @@ class TrayController:
 
     @property
     def available(self):
-        return pystray is not None
+        return _optional_module('pystray') is not None
 
     def start(self):
         if not self.available:
             return False
         if self.icon is not None:
             return True
+        pystray = _optional_module('pystray')
 
         def _ui(fn, *args):
             try:
@@ -358,12 +4176,17 @@ class TrayController:
 
 
 class App:
+    # Most small overlays blur_mode 'regions' keeps around at once
+    MAX_REGION_OVERLAYS = 16
+
     def __init__(self, root):
         self.root = root
         self.root.title('Privacy Screen Guard')
         self.root.minsize(560, 540)
         self.root.resizable(True, True)
         self.settings = load_settings()
+        self.settings['tesseract_cmd'] = resolve_tesseract_cmd(self.settings)
+        apply_process_limits(self.settings)
 
         self.style = ttk.Style(self.root)
         try:
@@ -377,18 +4200,34 @@ class App:
         except Exception:
             pass
 
-        self._overlay_active = False
-        self._overlay = None
+        # Overlays and the ones showing, keyed by monitor geometry (None = full screen)
+        self._overlays = {}
+        self._active_overlays = set()
+        # Latest (running, count) from the checker threads, flushed to the UI on a timer
+        self._status_lock = threading.Lock()
+        self._status_pending = None
+        # Small overlays for blur_mode 'regions', reused once hidden, and
+        # the (monitor, expiry) of each one showing
+        self._region_overlays = []
+        self._region_shown = {}
         self._ignore_unmap = False
         self.tray = TrayController(self)
 
         # First-run setup check
         self._check_first_run()
 
-        self.checker = ScreenChecker(self.settings, on_detect=self._on_detect_threadsafe)
+        self.checker = MonitorCheckerGroup(self.settings, on_detect=self._on_detect_threadsafe)
+        self.metrics_exporter = MetricsExporter(self.checker.metrics_snapshot, self.settings)
+        self.metrics_exporter.start()
+        self.cleanup_worker = start_cleanup(self.settings, self.checker.metrics)
 
         self._build_ui()
         self._set_initial_geometry()
+        # Pre-warmed, hidden until a detection
+        for monitor in self.checker.monitors:
+            self._overlay_for(monitor)
+        if self.settings.get('blur_mode', 'full') == 'regions':
+            self._region_overlay()
 
         self.root.bind('<Unmap>', self._on_unmap)
         self.root.protocol('WM_DELETE_WINDOW', self._on_close)
@@ -461,9 +4300,11 @@ class App:
     def quit_app(self):
         try:
             try:
-                self.checker.stop_checking()
+                self.checker.close()
             except Exception:
                 pass
+            self.metrics_exporter.stop()
+            self.cleanup_worker.stop()
             self.tray.stop()
         except Exception:
             pass
@@ -475,16 +4316,126 @@ class App:
             except Exception:
                 pass
 
-    def _on_detect_threadsafe(self, screenshot_image, settings):
+    def _on_detect_threadsafe(self, screenshot_image, settings, monitor=None, regions=None):
+        # Runs on the checker thread: do the expensive blur here, not on the Tk thread
+        detected_at = time.perf_counter()
         try:
-            self.root.after(0, lambda: self._handle_detect(screenshot_image, settings))
-        except Exception:
-            pass
+            if regions:
+                # Blur only the crops around the hits; the full frame is never blurred
+                crops = [(box, self._blur_image(screenshot_image.crop(box), settings)) for box in regions]
+                self.root.after(0, lambda: self.show_region_blur(crops, settings, detected_at, monitor))
+                return
+            blurred = self._blur_image(screenshot_image, settings)
+            self.root.after(0, lambda: self._handle_detect(blurred, settings, detected_at, monitor))
+        except Exception as e:
+            print(f'Could not show blur: {e}')
 
-    def _handle_detect(self, screenshot_image, settings):
-        if self._overlay_active:
+    def _blur_image(self, image, settings):
+        t0 = time.perf_counter()
+        blurred = blur_image(image, settings)
+        self.checker.metrics.record('blur', time.perf_counter() - t0)
+        return blurred
+
+    def _handle_detect(self, blurred_image, settings, detected_at=None, monitor=None):
+        if monitor in self._active_overlays:
             return
-        self.show_blur(screenshot_image, settings)
+        self.show_blur(blurred_image, settings, detected_at, monitor)
+
+    def _region_overlay(self, busy=()):
+        """A hidden region overlay, or None once MAX_REGION_OVERLAYS are all in ``busy``."""
+        for overlay in self._region_overlays:
+            if not overlay.visible:
+                return overlay
+        if len(self._region_overlays) < self.MAX_REGION_OVERLAYS:
+            overlay = BlurOverlay(self.root, geometry=(0, 0, 1, 1), grab_focus=False)
+            self._region_overlays.append(overlay)
+            return overlay
+        # Pool is full: take over the one closest to expiring
+        idle = [o for o in self._region_overlays if o not in busy]
+        if not idle:
+            return None
+        return min(idle, key=lambda o: self._region_shown.get(o, (None, 0.0))[1])
+
+    def _covering_overlay(self, geometry):
+        """The visible region overlay that already covers ``geometry``, if any."""
+        left, top, width, height = geometry
+        for overlay in self._region_shown:
+            if not overlay.visible or overlay.geometry is None:
+                continue
+            ol, ot, ow, oh = overlay.geometry
+            if ol <= left and ot <= top and ol + ow >= left + width and ot + oh >= top + height:
+                return overlay
+        return None
+
+    def _expire_region_overlays(self):
+        """Hide region overlays no hit has refreshed within their cooldown."""
+        now = time.monotonic()
+        for overlay, (_, expires) in list(self._region_shown.items()):
+            if not overlay.visible or expires <= now:
+                self._region_shown.pop(overlay, None)
+                if overlay.visible:
+                    overlay.close()
+
+    def show_region_blur(self, crops, settings, detected_at=None, monitor=None):
+        """Cover each ``(box, blurred_crop)`` with its own small overlay; boxes are monitor-relative.
+
+        Boxes already under a visible overlay only refresh it.  Overlays on the
+        same monitor that this hit does not refresh are hidden, and the rest
+        hide once ``cooldown`` passes without another hit.
+        """
+        t0 = time.perf_counter()
+        left, top = (monitor[0], monitor[1]) if monitor is not None else (0, 0)
+        cooldown = float(settings.get('cooldown', 5.0))
+        expires = time.monotonic() + cooldown
+
+        def _on_covered():
+            if detected_at is not None:
+                self.checker.metrics.record('detect_to_cover', time.perf_counter() - detected_at)
+
+        try:
+            kept = set()
+            fresh = []
+            for box, image in crops:
+                geometry = (left + box[0], top + box[1], box[2] - box[0], box[3] - box[1])
+                overlay = self._covering_overlay(geometry)
+                if overlay is None:
+                    fresh.append((geometry, image))
+                else:
+                    kept.add(overlay)
+            for overlay, (shown_on, _) in list(self._region_shown.items()):
+                if overlay not in kept and (shown_on == monitor or not overlay.visible):
+                    self._region_shown.pop(overlay)
+                    if overlay.visible:
+                        overlay.close()
+            for overlay in kept:
+                self._region_shown[overlay] = (monitor, expires)
+            for i, (geometry, image) in enumerate(fresh):
+                overlay = self._region_overlay(busy=kept)
+                if overlay is None:
+                    print(f'Region overlay limit reached; {len(fresh) - i} region(s) not blurred')
+                    break
+                kept.add(overlay)
+                self._region_shown[overlay] = (monitor, expires)
+                overlay.place(geometry)
+                overlay.show(
+                    image,
+                    fade=settings.get('fade_overlay', True),
+                    alpha_target=settings.get('overlay_alpha', 0.98),
+                    fade_ms=settings.get('overlay_fade_ms', 300),
+                    fade_steps=settings.get('overlay_fade_steps', 10),
+                    on_covered=_on_covered if i == len(fresh) - 1 else None,
+                )
+            self.root.after(int(cooldown * 1000) + 50, self._expire_region_overlays)
+            self.checker.metrics.record('overlay', time.perf_counter() - t0)
+        except Exception as e:
+            print(f'Could not show region blur: {e}')
+
+    def _overlay_for(self, monitor):
+        overlay = self._overlays.get(monitor)
+        if overlay is None:
+            overlay = self._overlays[monitor] = BlurOverlay(
+                self.root, on_close=lambda: self._on_overlay_closed(monitor), geometry=monitor)
+        return overlay
 
     def _build_ui(self):
         container = ttk.Frame(self.root, padding=12)
@@ -499,8 +4450,11 @@ class App:
 
         tab_main = ttk.Frame(notebook, padding=12)
         tab_settings = ttk.Frame(notebook, padding=12)
+        tab_perf = ttk.Frame(notebook, padding=12)
         notebook.add(tab_main, text='Main')
         notebook.add(tab_settings, text='Settings')
+        notebook.add(tab_perf, text='Performance')
+        self._build_perf_tab(tab_perf)
 
         # --- Main tab ---
         tab_main.grid_columnconfigure(0, weight=1)
@@ -630,11 +4584,162 @@ class App:
         self.overlay_fade_steps_var = tk.IntVar(value=int(self.settings.get('overlay_fade_steps', 10)))
         ttk.Spinbox(settings_frame, from_=1, to=60, increment=1, textvariable=self.overlay_fade_steps_var, width=10).grid(row=22, column=1, sticky='w')
 
+        ttk.Separator(settings_frame, orient='horizontal').grid(row=23, column=0, columnspan=2, sticky='ew', pady=10)
+
+        self.skip_unchanged_var = tk.BooleanVar(value=self.settings.get('skip_unchanged_frames', True))
+        ttk.Checkbutton(settings_frame, text='Skip OCR when screen is unchanged', variable=self.skip_unchanged_var).grid(row=24, column=0, columnspan=2, sticky='w')
+
+        ttk.Label(settings_frame, text='Change threshold (0-255):').grid(row=25, column=0, sticky='w')
+        self.change_threshold_var = tk.DoubleVar(value=float(self.settings.get('change_threshold', 6.0)))
+        ttk.Spinbox(settings_frame, from_=0, to=255, increment=1, textvariable=self.change_threshold_var, width=10).grid(row=25, column=1, sticky='w')
+
+        self.tile_ocr_var = tk.BooleanVar(value=self.settings.get('tile_ocr_enabled', False))
+        ttk.Checkbutton(settings_frame, text='Parallel tile OCR', variable=self.tile_ocr_var).grid(row=26, column=0, columnspan=2, sticky='w', pady=(10, 0))
+
+        ttk.Label(settings_frame, text='OCR workers (0 = auto):').grid(row=27, column=0, sticky='w')
+        self.ocr_workers_var = tk.IntVar(value=int(self.settings.get('ocr_workers', 0)))
+        ttk.Spinbox(settings_frame, from_=0, to=64, increment=1, textvariable=self.ocr_workers_var, width=10).grid(row=27, column=1, sticky='w')
+
+        ttk.Label(settings_frame, text='Tile size (px):').grid(row=28, column=0, sticky='w')
+        self.tile_size_var = tk.IntVar(value=int(self.settings.get('tile_size', 1024)))
+        ttk.Spinbox(settings_frame, from_=256, to=4096, increment=128, textvariable=self.tile_size_var, width=10).grid(row=28, column=1, sticky='w')
+
+        ttk.Label(settings_frame, text='Min / max interval (s):').grid(row=29, column=0, sticky='w', pady=(10, 0))
+        interval_row = ttk.Frame(settings_frame)
+        interval_row.grid(row=29, column=1, sticky='w', pady=(10, 0))
+        self.min_interval_var = tk.DoubleVar(value=float(self.settings.get('min_check_interval', 0.5)))
+        ttk.Spinbox(interval_row, from_=0.1, to=60, increment=0.1, textvariable=self.min_interval_var, width=8).grid(row=0, column=0, sticky='w')
+        self.max_interval_var = tk.DoubleVar(value=float(self.settings.get('max_check_interval', 10.0)))
+        ttk.Spinbox(interval_row, from_=0.5, to=600, increment=0.5, textvariable=self.max_interval_var, width=8).grid(row=0, column=1, sticky='w', padx=6)
+
+        self.pipeline_var = tk.BooleanVar(value=self.settings.get('pipeline_enabled', False))
+        ttk.Checkbutton(settings_frame, text='Pipelined detection (capture while OCR runs)', variable=self.pipeline_var).grid(row=30, column=0, columnspan=2, sticky='w')
+
+        ttk.Label(settings_frame, text='Resize method:').grid(row=31, column=0, sticky='w', pady=(10, 0))
+        self.resize_method_var = tk.StringVar(value=self.settings.get('resize_method', 'reduce'))
+        ttk.Combobox(settings_frame, textvariable=self.resize_method_var, values=['reduce'] + list(RESIZE_FILTERS),
+                     state='readonly', width=10).grid(row=31, column=1, sticky='w', pady=(10, 0))
+
+        self.autocontrast_var = tk.BooleanVar(value='autocontrast' in preprocess_chain(self.settings))
+        ttk.Checkbutton(settings_frame, text='Stretch contrast before OCR', variable=self.autocontrast_var).grid(row=32, column=0, columnspan=2, sticky='w')
+
+        self.threshold_var = tk.BooleanVar(value='threshold' in preprocess_chain(self.settings))
+        ttk.Checkbutton(settings_frame, text='Adaptive threshold before OCR', variable=self.threshold_var).grid(row=33, column=0, columnspan=2, sticky='w')
+
+        self.multi_monitor_var = tk.BooleanVar(value=self.settings.get('multi_monitor', True))
+        ttk.Checkbutton(settings_frame, text='Scan and blur each monitor separately', variable=self.multi_monitor_var).grid(row=34, column=0, columnspan=2, sticky='w', pady=(10, 0))
+
+        ttk.Label(settings_frame, text='Blur mode:').grid(row=35, column=0, sticky='w')
+        self.blur_mode_var = tk.StringVar(value=self.settings.get('blur_mode', 'full'))
+        ttk.Combobox(settings_frame, textvariable=self.blur_mode_var, values=['full', 'regions'],
+                     state='readonly', width=10).grid(row=35, column=1, sticky='w')
+
+        ttk.Label(settings_frame, text='Region blur margin (px):').grid(row=36, column=0, sticky='w')
+        self.blur_margin_var = tk.IntVar(value=int(self.settings.get('blur_region_margin', 16)))
+        ttk.Spinbox(settings_frame, from_=0, to=200, increment=4, textvariable=self.blur_margin_var, width=10).grid(row=36, column=1, sticky='w')
+
+        self.cascade_var = tk.BooleanVar(value=self.settings.get('cascade_enabled', False))
+        ttk.Checkbutton(settings_frame, text='Two-tier OCR (coarse pass, full resolution only where needed)', variable=self.cascade_var).grid(row=37, column=0, columnspan=2, sticky='w', pady=(10, 0))
+
+        ttk.Label(settings_frame, text='CPU budget (% of one core, 0 = off):').grid(row=38, column=0, sticky='w', pady=(10, 0))
+        self.cpu_budget_var = tk.DoubleVar(value=float(self.settings.get('cpu_budget_percent', 0)))
+        ttk.Spinbox(settings_frame, from_=0, to=400, increment=5, textvariable=self.cpu_budget_var, width=10).grid(row=38, column=1, sticky='w', pady=(10, 0))
+
+        ttk.Label(settings_frame, text='Tesseract threads (0 = default):').grid(row=39, column=0, sticky='w')
+        self.tess_threads_var = tk.IntVar(value=int(self.settings.get('tesseract_threads', 1)))
+        ttk.Spinbox(settings_frame, from_=0, to=64, increment=1, textvariable=self.tess_threads_var, width=10).grid(row=39, column=1, sticky='w')
+
+        ttk.Label(settings_frame, text='OCR process priority (on restart):').grid(row=40, column=0, sticky='w')
+        self.priority_var = tk.StringVar(value=self.settings.get('process_priority', 'below_normal'))
+        ttk.Combobox(settings_frame, textvariable=self.priority_var, values=['normal', 'below_normal', 'idle'],
+                     state='readonly', width=12).grid(row=40, column=1, sticky='w')
+
+        ttk.Label(settings_frame, text='Pause after idle (seconds, 0 = off):').grid(row=41, column=0, sticky='w', pady=(10, 0))
+        self.idle_pause_var = tk.IntVar(value=int(self.settings.get('idle_pause_seconds', 0)))
+        ttk.Spinbox(settings_frame, from_=0, to=3600, increment=30, textvariable=self.idle_pause_var, width=10).grid(row=41, column=1, sticky='w', pady=(10, 0))
+
+        self.pause_locked_var = tk.BooleanVar(value=self.settings.get('pause_when_locked', True))
+        ttk.Checkbutton(settings_frame, text='Pause while the screen is locked', variable=self.pause_locked_var).grid(row=42, column=0, columnspan=2, sticky='w')
+
+        self.scroll_var = tk.BooleanVar(value=self.settings.get('scroll_incremental', False))
+        ttk.Checkbutton(settings_frame, text='Scroll-aware OCR (read only newly scrolled-in text)', variable=self.scroll_var).grid(row=43, column=0, columnspan=2, sticky='w', pady=(10, 0))
+
+        self.script_routing_var = tk.BooleanVar(value=self.settings.get('script_routing', False))
+        ttk.Checkbutton(settings_frame, text='Detect script and OCR with only the matching language (needs osd.traineddata)',
+                        variable=self.script_routing_var).grid(row=44, column=0, columnspan=2, sticky='w')
+
+        self.title_prescreen_var = tk.BooleanVar(value=self.settings.get('title_prescreen', True))
+        ttk.Checkbutton(settings_frame, text='Check window titles for keywords before OCR',
+                        variable=self.title_prescreen_var).grid(row=45, column=0, columnspan=2, sticky='w')
+
+    PERF_STAGES = ('titles', 'grab', 'grayscale', 'resize', 'autocontrast', 'threshold', 'regions', 'scroll', 'osd', 'ocr', 'ocr_coarse', 'ocr_fine', 'match', 'cleanup', 'blur', 'overlay', 'detect_to_cover')
+    PERF_COLUMNS = ('count', 'last_ms', 'mean_ms', 'p50_ms', 'p95_ms', 'p99_ms')
+
+    def _build_perf_tab(self, tab_perf):
+        tab_perf.grid_rowconfigure(0, weight=1)
+        tab_perf.grid_columnconfigure(0, weight=1)
+
+        self.perf_tree = ttk.Treeview(tab_perf, columns=self.PERF_COLUMNS, height=len(self.PERF_STAGES))
+        self.perf_tree.heading('#0', text='Stage')
+        self.perf_tree.column('#0', width=110, stretch=False)
+        headings = {'count': 'Count', 'last_ms': 'Last ms', 'mean_ms': 'Mean ms',
+                    'p50_ms': 'p50 ms', 'p95_ms': 'p95 ms', 'p99_ms': 'p99 ms'}
+        for col in self.PERF_COLUMNS:
+            self.perf_tree.heading(col, text=headings[col])
+            self.perf_tree.column(col, width=70, anchor='e')
+        for stage in self.PERF_STAGES:
+            self.perf_tree.insert('', 'end', iid=stage, text=stage, values=('0',) + ('-',) * (len(self.PERF_COLUMNS) - 1))
+        self.perf_tree.grid(row=0, column=0, sticky='nsew')
+
+        self.perf_info_var = tk.StringVar(value='')
+        ttk.Label(tab_perf, textvariable=self.perf_info_var, font=('monospace', 8), justify='left').grid(row=1, column=0, sticky='w', pady=(10, 0))
+        self.root.after(1000, self._refresh_perf_tab)
+
+    def _refresh_perf_tab(self):
+        try:
+            snap = self.checker.metrics_snapshot()
+            for stage, values in snap['stages'].items():
+                row = (str(values['count']),) + tuple(f"{values[col]:.1f}" for col in self.PERF_COLUMNS[1:])
+                if self.perf_tree.exists(stage):
+                    self.perf_tree.item(stage, values=row)
+                else:
+                    self.perf_tree.insert('', 'end', iid=stage, text=stage, values=row)
+
+            counters = snap['counters']
+            cache = snap['tile_cache']
+            lines = [
+                f"Frames OCR'd: {counters['frames_ocrd']}   skipped: {counters['frames_skipped']}   "
+                f"scheduler: {counters['scheduler_state']} ({counters['interval']:.2f}s)",
+                f"Tile cache: {cache['entries']} entries, {cache['bytes'] / 1024:.0f} KB, hit rate {cache['hit_rate']:.0%}",
+            ]
+            if self.settings.get('text_regions_enabled', False):
+                lines.append(f"Pixels skipped by text-region pass: {snap['region_skipped_fraction']:.0%}")
+            governor = snap.get('governor')
+            if governor and governor['budget_percent']:
+                lines.append(f"CPU budget: {governor['usage_percent']:.0f}% of {governor['budget_percent']:.0f}% - {governor['state']}")
+            if snap.get('cascade'):
+                cascade = snap['cascade']
+                lines.append(f"Cascade: tier 1 hits {cascade['tier1_hit_rate']:.0%}, escalated {cascade['escalation_rate']:.0%} "
+                             f"({cascade['escalated_area']:.0%} of frame), tier 2 hits {cascade['tier2_hit_rate']:.0%}")
+            if snap.get('scroll'):
+                scroll = snap['scroll']
+                lines.append(f"Scroll OCR: {scroll['incremental_rate']:.0%} of frames incremental "
+                             f"({scroll['ocr_area']:.0%} of frame read), {scroll['full']} full, {scroll['reused_words']} words reused")
+            if snap['pipeline']:
+                depths = ', '.join(f"{name} {st['depth']} (dropped {st['dropped']}, wait {st['wait_ms']:.0f} ms)"
+                                   for name, st in snap['pipeline'].items())
+                lines.append(f'Queues: {depths}')
+            self.perf_info_var.set('\n'.join(lines))
+        except Exception:
+            pass
+        finally:
+            self.root.after(1000, self._refresh_perf_tab)
+
     def start(self):
         self._update_settings_from_ui()
         self.checker.settings = self.settings
         # connect status callback
-        self.checker.on_status = lambda running, count: self.root.after(1, self.update_status, running, count)
+        self.checker.on_status = self._on_status_threadsafe
         self.checker.start_checking()
         self.start_btn.state(['disabled'])
         self.stop_btn.state(['!disabled'])
@@ -679,44 +4784,97 @@ class App:
             self.settings['overlay_alpha'] = float(self.overlay_alpha_var.get())
             self.settings['overlay_fade_ms'] = int(self.overlay_fade_ms_var.get())
             self.settings['overlay_fade_steps'] = int(self.overlay_fade_steps_var.get())
+
+            self.settings['skip_unchanged_frames'] = self.skip_unchanged_var.get()
+            self.settings['change_threshold'] = float(self.change_threshold_var.get())
+            self.settings['tile_ocr_enabled'] = self.tile_ocr_var.get()
+            self.settings['ocr_workers'] = int(self.ocr_workers_var.get())
+            self.settings['tile_size'] = int(self.tile_size_var.get())
+            self.settings['min_check_interval'] = float(self.min_interval_var.get())
+            self.settings['max_check_interval'] = float(self.max_interval_var.get())
+            self.settings['pipeline_enabled'] = self.pipeline_var.get()
+            self.settings['resize_method'] = self.resize_method_var.get()
+            chain = [step for step in preprocess_chain(self.settings) if step not in ('autocontrast', 'threshold')]
+            if self.autocontrast_var.get():
+                chain.append('autocontrast')
+            if self.threshold_var.get():
+                chain.append('threshold')
+            self.settings['preprocess_chain'] = chain
+            self.settings['multi_monitor'] = self.multi_monitor_var.get()
+            self.settings['blur_mode'] = self.blur_mode_var.get()
+            self.settings['blur_region_margin'] = int(self.blur_margin_var.get())
+            self.settings['cascade_enabled'] = self.cascade_var.get()
+            self.settings['cpu_budget_percent'] = float(self.cpu_budget_var.get())
+            self.settings['tesseract_threads'] = int(self.tess_threads_var.get())
+            self.settings['process_priority'] = self.priority_var.get()
+            self.settings['idle_pause_seconds'] = int(self.idle_pause_var.get())
+            self.settings['pause_when_locked'] = self.pause_locked_var.get()
+            self.settings['scroll_incremental'] = self.scroll_var.get()
+            self.settings['script_routing'] = self.script_routing_var.get()
+            self.settings['title_prescreen'] = self.title_prescreen_var.get()
         except Exception as e:
             messagebox.showerror('Invalid settings', f'Please check your settings values.\n\n{e}')
 
     def cleanup_now(self):
         """Manually trigger cleanup."""
-        removed = cleanup_temp_files()
-        self.checker.last_cleanup_time = time.time()
+        removed = self.cleanup_worker.run_now()
         messagebox.showinfo('Cleanup', f'Cleanup complete. Removed {removed} temporary files.')
         print(f'Manual cleanup: removed {removed} files.')
 
+    def _on_status_threadsafe(self, running, check_count):
+        """Called from checker threads; at most one UI update per status_update_interval."""
+        with self._status_lock:
+            pending = self._status_pending is not None
+            self._status_pending = (running, check_count)
+        if not pending:
+            delay = int(float(self.settings.get('status_update_interval', 0.5)) * 1000)
+            self.root.after(max(1, delay), self._flush_status)
+
+    def _flush_status(self):
+        with self._status_lock:
+            status, self._status_pending = self._status_pending, None
+        if status is not None:
+            self.update_status(*status)
+
     def update_status(self, running, check_count):
         # Update status text and checks count in the UI thread
         try:
-            if running:
+            paused = running and any(s in ('away', 'locked') for s in self.checker.scheduler_state.split('/'))
+            if paused:
+                self.status_var.set('Paused')
+                self.status_label.configure(foreground='orange')
+            elif running:
                 self.status_var.set('Running')
                 self.status_label.configure(foreground='green')
             else:
                 self.status_var.set('Idle')
                 self.status_label.configure(foreground='red')
-            self.last_check_var.set(f'Checks: {check_count}')
+            skipped = self.checker.frames_skipped
+            state = self.checker.scheduler_state if running else 'stopped'
+            if running and self.checker.governor.budget:
+                state += f' - CPU {self.checker.governor.usage * 100:.0f}%/{self.checker.governor.budget * 100:.0f}% {self.checker.governor.state}'
+            self.last_check_var.set(f'Checks: {check_count} (OCR: {self.checker.frames_ocrd}, skipped: {skipped}) - {state}')
         except Exception:
             pass
 
-    def show_blur(self, screenshot_image, settings):
+    def show_blur(self, blurred_image, settings, detected_at=None, monitor=None):
+        t0 = time.perf_counter()
+
+        def _on_covered():
+            if detected_at is not None:
+                self.checker.metrics.record('detect_to_cover', time.perf_counter() - detected_at)
+
         try:
-            radius = int(settings.get('blur_radius', 25))
-            # Apply blur to full-size screenshot for visual quality
-            blurred = screenshot_image.filter(ImageFilter.GaussianBlur(radius))
-            self._overlay_active = True
-            self._overlay = BlurOverlay(
-                self.root,
-                blurred,
+            self._active_overlays.add(monitor)
+            self._overlay_for(monitor).show(
+                blurred_image,
                 fade=settings.get('fade_overlay', True),
                 alpha_target=settings.get('overlay_alpha', 0.98),
                 fade_ms=settings.get('overlay_fade_ms', 300),
                 fade_steps=settings.get('overlay_fade_steps', 10),
-                on_close=self._on_overlay_closed,
+                on_covered=_on_covered,
             )
+            self.checker.metrics.record('overlay', time.perf_counter() - t0)
             # Wait until the overlay is dismissed; event loop handles it
             # Update last check label when detection occurs
             try:
@@ -725,22 +4883,149 @@ class App:
                 pass
         except Exception as e:
             print(f'Could not show blur: {e}')
-            self._overlay_active = False
-            self._overlay = None
+            self._active_overlays.discard(monitor)
 
-    def _on_overlay_closed(self):
-        self._overlay_active = False
-        self._overlay = None
+    def _on_overlay_closed(self, monitor=None):
+        self._active_overlays.discard(monitor)
 
     def _test_blur(self):
-        try:
-            img = ImageGrab.grab()
-            self.show_blur(img, self.settings)
-        except Exception as e:
-            messagebox.showerror('Error', f'Failed to capture screen: {e}')
+        threading.Thread(target=self._run_test_blur, daemon=True).start()
+
+    def _run_test_blur(self):
+        # Blur every monitor, each with its own overlay, as a detection there would
+        for checker in self.checker.checkers:
+            try:
+                source = checker.capture_source
+                img = source.color_snapshot(source.grab())
+            except Exception as e:
+                self.root.after(0, lambda e=e: messagebox.showerror('Error', f'Failed to capture screen: {e}'))
+                return
+            self._on_detect_threadsafe(img, self.settings, checker.monitor)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Privacy Screen Guard')
+    parser.add_argument('--daemon', action='store_true',
+                        help='run the screen checker headless, without the Tk window or tray icon')
+    parser.add_argument('--startup-time', action='store_true',
+                        help='report how long start-up took and exit as soon as the app is ready')
+    parser.add_argument('--benchmark', metavar='PATH',
+                        help='replay a directory of PNGs or a frames.jsonl recording headlessly and report timings')
+    parser.add_argument('--bench-preprocess', metavar='PATH',
+                        help='compare preprocessing chains on a corpus and report the fastest that keeps recall')
+    parser.add_argument('--autotune', metavar='PATH',
+                        help='sweep OCR scale, PSM, OEM, blur radius and check interval on a labeled corpus '
+                             'and save the fastest configuration that meets the recall target')
+    parser.add_argument('--recall-target', type=float, metavar='R',
+                        help='recall (0-1) --autotune must reach; defaults to the recall of the current settings')
+    parser.add_argument('--repeat', type=int, default=1, help='benchmark passes over the corpus')
+    parser.add_argument('--output', metavar='FILE', help='write the JSON report here instead of stdout')
+    return parser.parse_args(argv)
+
+
+def _report_startup(mode, metrics=None):
+    seconds = time.perf_counter() - _PROCESS_START
+    if metrics is not None:
+        metrics.record('startup', seconds)
+    print(f'[Startup] {mode} ready in {seconds * 1000:.0f} ms')
+    return seconds
+
+
+def benchmark_main(args):
+    settings = load_settings()
+    registry = TempFileRegistry()
+    registry.install()
+    source = open_capture_source(args.bench_preprocess or args.benchmark)
+    try:
+        if args.bench_preprocess:
+            report = run_preprocess_benchmark(source, settings, repeat=args.repeat)
+        else:
+            report = run_benchmark(source, settings, repeat=args.repeat)
+    finally:
+        source.close()
+        registry.close()
+    data = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data)
+        print(f'Benchmark report written to {args.output}')
+    else:
+        print(data)
+    return 0
+
+
+def autotune_main(args):
+    settings = load_settings()
+    registry = TempFileRegistry()
+    registry.install()
+    source = open_capture_source(args.autotune)
+    try:
+        report = run_autotune(source, settings, recall_target=args.recall_target, repeat=args.repeat)
+    except ValueError as e:
+        print(f'Autotune: {e}')
+        return 2
+    finally:
+        source.close()
+        registry.close()
+    data = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(data)
+        print(f'Autotune report written to {args.output}')
+    else:
+        print(data)
+    if report['recommended'] is None:
+        print(f"Autotune: no configuration reached recall {report['recall_target']:.0%}; settings left unchanged")
+        return 1
+    settings.update(report['recommended'])
+    save_settings(settings)
+    print('Autotune: saved ' + ', '.join(f'{k}={v}' for k, v in report['recommended'].items()) + f' to {CONFIG_PATH}')
+    return 0
+
+
+def daemon_main(args):
+    """Run detection without any GUI; hits are logged, metrics exported as configured."""
+    settings = load_settings()
+    apply_process_limits(settings)
+    checker = MonitorCheckerGroup(settings)
+    exporter = MetricsExporter(checker.metrics_snapshot, settings)
+    stop = threading.Event()
+
+    def _request_stop(signum, frame):
+        stop.set()
 
+    signal.signal(signal.SIGINT, _request_stop)
+    if hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, _request_stop)
+
+    exporter.start()
+    cleanup = start_cleanup(settings, checker.metrics)
+    checker.start_checking()
+    _report_startup('Headless checker', checker.metrics)
+    if args.startup_time:
+        stop.set()
+    else:
+        print('Press Ctrl+C to stop.')
+    try:
+        # Short waits so Ctrl+C is handled promptly on Windows as well
+        while not stop.wait(1.0):
+            pass
+    finally:
+        checker.close()
+        exporter.stop()
+        cleanup.stop()
+    return 0
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.benchmark or args.bench_preprocess:
+        return benchmark_main(args)
+    if args.autotune:
+        return autotune_main(args)
+    if args.daemon:
+        return daemon_main(args)
 
-def main():
     root = tk.Tk()
     app = App(root)
     if app.settings.get('start_minimized', False):
@@ -748,8 +5033,16 @@ def main():
             app.hide_window()
         else:
             root.iconify()
+
+    def _ready():
+        _report_startup('GUI', app.checker.metrics)
+        if args.startup_time:
+            app.quit_app()
+
+    root.after_idle(_ready)
     root.mainloop()
 
 
 if __name__ == '__main__':
-    main()
+    multiprocessing.freeze_support()
+    sys.exit(main())
@@ -42,11 +42,19 @@ hiddenimports = []
 hiddenimports += _try_collect_submodules("PIL")
 hiddenimports += _try_collect_submodules("pytesseract")
 hiddenimports += _try_collect_submodules("pystray")
+hiddenimports += _try_collect_submodules("tesserocr")
 
-# Keep a few explicit ones for robustness
+# Keep a few explicit ones for robustness; the app imports these lazily,
+# so PyInstaller's import scan cannot see them.
 hiddenimports += [
     "tkinter",
+    "tkinter.ttk",
+    "tkinter.messagebox",
     "PIL.ImageGrab",
+    "PIL.ImageTk",
+    "pytesseract",
+    "numpy",
+    "http.server",
 ]
 
 a = Analysis(
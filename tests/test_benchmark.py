@@ -0,0 +1,57 @@
+import os
+
+import pytest
+from PIL import Image
+
+import Blocksoft
+
+
+class CleanBackend(Blocksoft.OcrBackend):
+    name = 'clean'
+
+    def __init__(self, cmd=None):
+        pass
+
+    def image_to_string(self, image, **kwargs):
+        return 'clean'
+
+    def image_to_data(self, image, **kwargs):
+        return []
+
+
+class ClosableSource(Blocksoft.DirectoryCaptureSource):
+    """Fails like a detached SHM segment once closed."""
+
+    closed = False
+
+    def grab(self):
+        if self.closed:
+            raise RuntimeError('source closed')
+        return super().grab()
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture
+def source(tmp_path, monkeypatch):
+    monkeypatch.setitem(Blocksoft.OCR_BACKENDS, 'clean', CleanBackend)
+    for i in range(3):
+        Image.new('RGB', (64, 64), (i * 60,) * 3).save(os.path.join(tmp_path, f'frame_{i}.png'))
+    return ClosableSource(str(tmp_path))
+
+
+def test_checker_leaves_a_passed_source_open(source):
+    checker = Blocksoft.ScreenChecker(dict(Blocksoft.DEFAULT_SETTINGS), capture_source=source,
+                                      idle_source=Blocksoft.ManualIdleSource(),
+                                      title_source=Blocksoft.StaticTitleSource())
+    checker.close()
+    assert not source.closed
+
+
+def test_benchmark_runs_can_share_a_source(source):
+    settings = dict(Blocksoft.DEFAULT_SETTINGS, ocr_backend='clean')
+    first = Blocksoft.run_benchmark(source, settings)
+    second = Blocksoft.run_benchmark(source, settings)
+    assert first['frames'] == second['frames'] == 3
+    assert not source.closed
@@ -0,0 +1,45 @@
+from PIL import Image
+
+import Blocksoft
+
+
+def gray(value, size=(640, 360)):
+    return Image.new('RGB', size, (value, value, value))
+
+
+def test_first_frame_is_changed():
+    detector = Blocksoft.ChangeDetector(threshold=6.0)
+    assert detector.has_changed(gray(200))
+    assert detector.last_score == 255.0
+
+
+def test_static_frames_are_skipped():
+    detector = Blocksoft.ChangeDetector(threshold=6.0)
+    detector.has_changed(gray(200))
+    for _ in range(5):
+        assert not detector.has_changed(gray(200))
+    assert detector.last_score == 0.0
+
+
+def test_changed_frame_is_reported():
+    detector = Blocksoft.ChangeDetector(threshold=6.0)
+    detector.has_changed(gray(200))
+    frame = gray(200)
+    frame.paste((0, 0, 0), (100, 100, 300, 140))
+    assert detector.has_changed(frame)
+    assert not detector.has_changed(frame)
+
+
+def test_gradual_change_is_caught():
+    # Each step moves 2 levels, below the threshold, but the total drift is not
+    detector = Blocksoft.ChangeDetector(threshold=6.0)
+    detector.has_changed(gray(200))
+    results = [detector.has_changed(gray(200 - 2 * step)) for step in range(1, 8)]
+    assert results == [False, False, False, True, False, False, False]
+
+
+def test_reset_forces_a_scan():
+    detector = Blocksoft.ChangeDetector(threshold=6.0)
+    detector.has_changed(gray(200))
+    detector.reset()
+    assert detector.has_changed(gray(200))
@@ -0,0 +1,43 @@
+import os
+import tempfile
+import time
+
+import pytest
+
+import Blocksoft
+
+
+@pytest.fixture
+def worker(tmp_path):
+    registry = Blocksoft.TempFileRegistry(root=str(tmp_path))
+    registry.install()
+    worker = Blocksoft.CleanupWorker(dict(Blocksoft.DEFAULT_SETTINGS), registry=registry)
+    yield worker
+    registry.close()
+    assert tempfile.tempdir is None
+
+
+def write(registry, name, age):
+    path = os.path.join(registry.path, name)
+    with open(path, 'w') as f:
+        f.write('x')
+    then = time.time() - age
+    os.utime(path, (then, then))
+    return path
+
+
+def test_manual_cleanup_spares_files_in_use(worker):
+    old = write(worker.registry, 'tess_old.png', 3600)
+    busy = write(worker.registry, 'tess_busy.png', 1)
+    assert worker.run_now() == 1
+    assert not os.path.exists(old)
+    assert os.path.exists(busy)
+    assert os.path.exists(os.path.join(worker.registry.path, Blocksoft.TEMP_OWNER_MARKER))
+
+
+def test_background_cleanup_spares_files_in_use(worker):
+    worker.settings['temp_max_age_minutes'] = 0
+    busy = write(worker.registry, 'tess_busy.png', 1)
+    old = write(worker.registry, 'tess_old.png', worker.IN_USE_SECONDS + 5)
+    assert worker.step() == 1
+    assert os.path.exists(busy) and not os.path.exists(old)
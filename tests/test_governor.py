@@ -0,0 +1,94 @@
+import pytest
+
+import Blocksoft
+
+
+def make_governor(percent=10):
+    return Blocksoft.CpuGovernor({'cpu_budget_percent': percent, 'cpu_budget_window': 10})
+
+
+class Clock:
+    """Feeds ``observe`` one sample a second at a given CPU rate (fraction of a core)."""
+
+    def __init__(self, governor):
+        self.governor = governor
+        self.now = 0.0
+        self.cpu = 0.0
+
+    def run(self, seconds, rate):
+        for _ in range(int(seconds)):
+            self.now += 1.0
+            self.cpu += rate
+            self.governor.observe(now=self.now, cpu=self.cpu)
+
+
+def test_off_without_budget():
+    governor = make_governor(0)
+    Clock(governor).run(60, 1.0)
+    assert governor.state == 'off'
+    assert governor.delay(2.0) == 2.0
+    assert governor.scale(1.0) == 1.0
+    assert governor.max_boxes is None
+
+
+def test_within_budget_changes_nothing():
+    governor = make_governor(10)
+    Clock(governor).run(60, 0.08)
+    assert governor.usage == pytest.approx(0.08)
+    assert governor.state == 'within budget'
+    assert governor.delay(2.0) == 2.0
+
+
+def test_over_budget_stretches_interval_then_degrades():
+    governor = make_governor(10)
+    clock = Clock(governor)
+    clock.run(6, 0.5)
+    assert governor.interval_factor == pytest.approx(1.5)
+    assert governor.level == 0
+    assert governor.delay(2.0) == pytest.approx(3.0)
+    # One step every half window until the interval is at its cap ...
+    clock.run(25, 0.5)
+    assert governor.interval_factor == governor.MAX_FACTOR
+    assert governor.level == 0
+    # ... then lower the OCR scale, then cap the boxes per frame
+    clock.run(5, 0.5)
+    assert governor.level == 1
+    assert governor.scale(1.0) == pytest.approx(0.75)
+    clock.run(10, 0.5)
+    assert governor.level == 3
+    assert governor.scale(1.0) == pytest.approx(0.5)
+    assert governor.max_boxes == 4
+    assert governor.state == 'degraded (level 3)'
+    clock.run(30, 0.5)
+    assert governor.level == len(governor.LEVELS) - 1
+
+
+def test_under_budget_undoes_steps_in_reverse():
+    governor = make_governor(10)
+    clock = Clock(governor)
+    clock.run(60, 0.5)
+    assert governor.level == 3
+    steps = []
+    for _ in range(120):
+        clock.run(1, 0.0)
+        step = (governor.level, governor.interval_factor)
+        if not steps or steps[-1] != step:
+            steps.append(step)
+    # Levels come back down first, with the interval still stretched, then the interval
+    assert [level for level, _ in steps[:4]] == [3, 2, 1, 0]
+    assert all(factor == governor.MAX_FACTOR for _, factor in steps[:4])
+    assert all(level == 0 for level, _ in steps[4:])
+    factors = [factor for _, factor in steps[3:]]
+    assert factors == sorted(factors, reverse=True)
+    assert governor.interval_factor == 1.0
+    assert governor.state == 'within budget'
+
+
+def test_snapshot():
+    governor = make_governor(10)
+    Clock(governor).run(60, 0.5)
+    snapshot = governor.snapshot()
+    assert snapshot['budget_percent'] == pytest.approx(10.0)
+    assert snapshot['usage_percent'] == pytest.approx(50.0)
+    assert snapshot['level'] == 3
+    assert snapshot['max_boxes'] == 4
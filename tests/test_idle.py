@@ -0,0 +1,94 @@
+import time
+
+import pytest
+from PIL import Image
+
+import Blocksoft
+
+
+class CleanBackend(Blocksoft.OcrBackend):
+    name = 'clean'
+
+    def __init__(self, cmd=None):
+        pass
+
+    def image_to_string(self, image, **kwargs):
+        return 'clean'
+
+    def image_to_data(self, image, **kwargs):
+        return []
+
+
+class WhiteScreen(Blocksoft.CaptureSource):
+    name = 'white'
+
+    def grab(self):
+        return Image.new('RGB', (64, 64), 'white')
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+@pytest.fixture
+def checker(monkeypatch):
+    monkeypatch.setitem(Blocksoft.OCR_BACKENDS, 'clean', CleanBackend)
+    settings = dict(Blocksoft.DEFAULT_SETTINGS, ocr_backend='clean', skip_unchanged_frames=False,
+                    idle_pause_seconds=5, idle_poll_interval=0.02, check_interval=0.02, min_check_interval=0.02)
+    checker = Blocksoft.ScreenChecker(settings, capture_source=WhiteScreen(), idle_source=Blocksoft.ManualIdleSource(0),
+                                      title_source=Blocksoft.StaticTitleSource())
+    checker.statuses = []
+    checker.on_status = lambda running, count: checker.statuses.append((running, checker.scheduler.state))
+    yield checker
+    checker.close()
+    if checker.is_alive():
+        checker.join(2)
+
+
+def test_idle_pause_is_off_by_default():
+    checker = Blocksoft.ScreenChecker(dict(Blocksoft.DEFAULT_SETTINGS, pause_when_locked=False),
+                                      capture_source=WhiteScreen(), idle_source=Blocksoft.ManualIdleSource(3600),
+                                      title_source=Blocksoft.StaticTitleSource())
+    assert checker._pause_reason() is None
+    checker.close()
+
+
+def test_pause_reason(checker):
+    idle = checker.idle_source
+    idle.idle = 4.9
+    assert checker._pause_reason() is None
+    idle.idle = 5.0
+    assert checker._pause_reason() == 'away'
+    idle.idle, idle.locked = 0.0, True
+    assert checker._pause_reason() == 'locked'
+    checker.settings['pause_when_locked'] = False
+    assert checker._pause_reason() is None
+
+
+def test_pauses_when_idle_and_resumes_on_input(checker):
+    checker.start_checking()
+    assert wait_for(lambda: checker.check_count >= 3)
+    checker.idle_source.idle = 10.0
+    assert wait_for(lambda: checker.scheduler.state == 'away')
+    paused_at = checker.check_count
+    time.sleep(0.2)
+    assert checker.check_count == paused_at
+    checker.idle_source.idle = 0.0
+    assert wait_for(lambda: checker.check_count > paused_at, timeout=0.5)
+    assert checker.scheduler.state != 'away'
+
+
+def test_no_wakeups_while_stopped(checker):
+    checker.start_checking()
+    assert wait_for(lambda: checker.check_count >= 2)
+    checker.stop_checking()
+    assert wait_for(lambda: checker.statuses and checker.statuses[-1][0] is False)
+    count, statuses = checker.check_count, len(checker.statuses)
+    time.sleep(0.3)
+    assert checker.check_count == count
+    assert len(checker.statuses) == statuses
@@ -0,0 +1,72 @@
+import pytest
+
+import Blocksoft
+
+
+KEYWORDS = Blocksoft.DEFAULT_SETTINGS['sensitive_keywords']
+
+
+def default_matcher():
+    settings = Blocksoft.DEFAULT_SETTINGS
+    return Blocksoft.KeywordMatcher(KEYWORDS, max_distance=settings['fuzzy_max_distance'],
+                                    split_words=settings['fuzzy_split_words'])
+
+
+def fuzzy_matcher():
+    return Blocksoft.KeywordMatcher(KEYWORDS, max_distance=2, split_words=True)
+
+
+NEAR_MISSES = ["The Gonzaga game", "bonzo", "small sex", "all sexes"]
+SPLIT_WORDS = ["the rapist", "All Sex Toys", "x x x"]
+
+
+@pytest.mark.parametrize('text', NEAR_MISSES + SPLIT_WORDS + ["Lesbia is a poem"])
+def test_defaults_ignore_near_misses(text):
+    assert default_matcher().search(text) == []
+
+
+def test_checker_defaults_match_exactly():
+    checker = Blocksoft.ScreenChecker(dict(Blocksoft.DEFAULT_SETTINGS, sensitive_keywords=KEYWORDS + ['therapist']),
+                                      capture_source=Blocksoft.CaptureSource(), title_source=Blocksoft.StaticTitleSource(),
+                                      idle_source=Blocksoft.ManualIdleSource())
+    matcher = checker._get_matcher()
+    assert not matcher.split_words
+    for text in SPLIT_WORDS:
+        assert matcher.search(text) == []
+    assert [h.keyword for h in matcher.search("ask a therapist")] == ['therapist']
+    checker.settings['fuzzy_max_distance'] = 1
+    assert checker._get_matcher().split_words
+    checker.close()
+
+
+@pytest.mark.parametrize('text', NEAR_MISSES)
+def test_fuzzy_ignores_near_misses(text):
+    assert fuzzy_matcher().search(text) == []
+
+
+def test_ocr_confusions_match_exactly():
+    hits = default_matcher().search("free p0rn here")
+    assert [(h.keyword, h.distance) for h in hits] == [('porn', 0)]
+    assert "free p0rn here"[hits[0].start:hits[0].end] == 'p0rn'
+
+
+def test_misread_letter_matches_with_fuzzy():
+    assert default_matcher().search("brazzcr videos") == []
+    hits = fuzzy_matcher().search("brazzcr videos")
+    assert [(h.keyword, h.distance, h.start, h.end) for h in hits] == [('brazzer', 1, 0, 7)]
+
+
+def test_fuzzy_does_not_reach_into_words():
+    assert fuzzy_matcher().search("xbrazzcrx") == []
+
+
+def test_split_keyword_matches_whole_words():
+    hits = fuzzy_matcher().search("hot mi lf pics")
+    assert [(h.keyword, h.distance) for h in hits] == [('milf', 1)]
+    assert fuzzy_matcher().search("up or not") == []
+
+
+def test_per_keyword_budget():
+    matcher = Blocksoft.KeywordMatcher(['gonzo~1'])
+    assert [h.distance for h in matcher.search("bonzo")] == [1]
+    assert matcher.search("gonzaga") == []
@@ -0,0 +1,70 @@
+import threading
+import time
+
+import pytest
+from PIL import Image
+
+import Blocksoft
+
+
+class CleanBackend(Blocksoft.OcrBackend):
+    name = 'clean'
+
+    def __init__(self, cmd=None):
+        pass
+
+    def image_to_string(self, image, **kwargs):
+        return 'clean'
+
+    def image_to_data(self, image, **kwargs):
+        return []
+
+
+class NoisyScreen(Blocksoft.CaptureSource):
+    """A different frame every grab, so each one goes through the pipeline."""
+
+    name = 'noisy'
+
+    def __init__(self):
+        self.count = 0
+
+    def grab(self):
+        self.count += 1
+        return Image.new('RGB', (64, 64), (self.count * 37 % 256,) * 3)
+
+
+def wait_for(condition, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def test_queue_close_wakes_the_consumer():
+    q = Blocksoft.StageQueue(1)
+    got = []
+    consumer = threading.Thread(target=lambda: got.append(q.get()))
+    consumer.start()
+    q.close()
+    consumer.join(1)
+    assert got == [None]
+    q.put('late')
+    assert q.get() is None
+
+
+def test_close_stops_the_stage_threads(monkeypatch):
+    monkeypatch.setitem(Blocksoft.OCR_BACKENDS, 'clean', CleanBackend)
+    baseline = threading.active_count()
+    settings = dict(Blocksoft.DEFAULT_SETTINGS, ocr_backend='clean', pipeline_enabled=True,
+                    check_interval=0.02, min_check_interval=0.02, title_prescreen=False)
+    checker = Blocksoft.ScreenChecker(settings, capture_source=NoisyScreen(),
+                                      idle_source=Blocksoft.ManualIdleSource(),
+                                      title_source=Blocksoft.StaticTitleSource())
+    checker.start_checking()
+    assert wait_for(lambda: checker.pipeline.stats['match'].processed >= 2)
+    assert threading.active_count() >= baseline + 4
+    checker.close()
+    checker.join(2)
+    assert wait_for(lambda: threading.active_count() == baseline)
@@ -0,0 +1,45 @@
+import errno
+import os
+import sys
+
+import pytest
+from PIL import Image
+
+import Blocksoft
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setenv('OMP_THREAD_LIMIT', '')
+    monkeypatch.setattr(Blocksoft, '_tesseract_priority', 'normal')
+    return monkeypatch
+
+
+@pytest.mark.skipif(not hasattr(os, 'nice'), reason='POSIX only')
+def test_app_process_keeps_its_priority(limits):
+    before = os.nice(0)
+    Blocksoft.apply_process_limits({'process_priority': 'idle', 'tesseract_threads': 2})
+    assert os.nice(0) == before
+    assert os.environ['OMP_THREAD_LIMIT'] == '2'
+
+
+@pytest.mark.skipif(sys.platform == 'win32', reason='POSIX only')
+def test_tesseract_runs_under_nice(limits):
+    pytesseract = pytest.importorskip('pytesseract')
+    commands = []
+
+    def popen(args, **kwargs):
+        commands.append(list(args))
+        raise FileNotFoundError(errno.ENOENT, 'not installed')
+
+    limits.setattr(pytesseract.pytesseract.subprocess, 'Popen', popen)
+    Blocksoft.apply_process_limits({'process_priority': 'below_normal'})
+    backend = Blocksoft.PytesseractBackend()
+    with pytest.raises(pytesseract.TesseractNotFoundError):
+        backend.image_to_string(Image.new('L', (8, 8), 255))
+    assert commands[0][:3] == ['nice', '-n', '10']
+
+    Blocksoft.apply_process_limits({'process_priority': 'normal'})
+    with pytest.raises(pytesseract.TesseractNotFoundError):
+        backend.image_to_string(Image.new('L', (8, 8), 255))
+    assert commands[1][0] != 'nice'
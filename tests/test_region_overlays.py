@@ -0,0 +1,100 @@
+import pytest
+
+import Blocksoft
+
+
+class FakeOverlay:
+    """Records what BlurOverlay would do, without a Tk window."""
+
+    def __init__(self, parent, on_close=None, geometry=None, grab_focus=True):
+        self.geometry = geometry
+        self.visible = False
+        self.shown = 0
+
+    def place(self, geometry):
+        self.geometry = geometry
+
+    def show(self, image, on_covered=None, **kwargs):
+        self.visible = True
+        self.shown += 1
+
+    def close(self, event=None):
+        self.visible = False
+
+
+class FakeRoot:
+    def __init__(self):
+        self.timers = []
+
+    def after(self, ms, func, *args):
+        self.timers.append(func)
+
+
+class FakeChecker:
+    def __init__(self):
+        self.metrics = Blocksoft.StageMetrics()
+
+
+@pytest.fixture
+def app(monkeypatch):
+    monkeypatch.setattr(Blocksoft, 'BlurOverlay', FakeOverlay)
+    app = Blocksoft.App.__new__(Blocksoft.App)
+    app.root = FakeRoot()
+    app.checker = FakeChecker()
+    app._region_overlays = []
+    app._region_shown = {}
+    return app
+
+
+SETTINGS = {'cooldown': 5.0, 'fade_overlay': False}
+MONITOR = (800, 0, 800, 600)
+
+
+def visible(app):
+    return sorted(o.geometry for o in app._region_overlays if o.visible)
+
+
+def test_repeated_hit_reuses_the_overlay(app):
+    for _ in range(5):
+        app.show_region_blur([((10, 10, 110, 60), None)], SETTINGS, monitor=MONITOR)
+    assert visible(app) == [(810, 10, 100, 50)]
+    assert len(app._region_overlays) == 1
+    assert app._region_overlays[0].shown == 1
+
+
+def test_box_inside_a_visible_overlay_is_skipped(app):
+    app.show_region_blur([((10, 10, 210, 110), None)], SETTINGS, monitor=MONITOR)
+    app.show_region_blur([((50, 50, 100, 80), None)], SETTINGS, monitor=MONITOR)
+    assert visible(app) == [(810, 10, 200, 100)]
+
+
+def test_stale_overlays_hide_on_next_hit(app):
+    app.show_region_blur([((10, 10, 110, 60), None)], SETTINGS, monitor=MONITOR)
+    app.show_region_blur([((300, 300, 400, 350), None)], SETTINGS, monitor=MONITOR)
+    assert visible(app) == [(1100, 300, 100, 50)]
+    assert len(app._region_overlays) == 1
+
+
+def test_other_monitors_are_left_alone(app):
+    app.show_region_blur([((10, 10, 110, 60), None)], SETTINGS, monitor=(0, 0, 800, 600))
+    app.show_region_blur([((10, 10, 110, 60), None)], SETTINGS, monitor=MONITOR)
+    assert visible(app) == [(10, 10, 100, 50), (810, 10, 100, 50)]
+
+
+def test_overlays_expire_after_cooldown(app, monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(Blocksoft.time, 'monotonic', lambda: now[0])
+    app.show_region_blur([((10, 10, 110, 60), None)], SETTINGS, monitor=MONITOR)
+    now[0] += 3.0
+    app._expire_region_overlays()
+    assert len(visible(app)) == 1
+    now[0] += 2.5
+    app._expire_region_overlays()
+    assert visible(app) == []
+
+
+def test_pool_is_capped(app):
+    boxes = [((x * 20, 0, x * 20 + 10, 10), None) for x in range(Blocksoft.App.MAX_REGION_OVERLAYS + 4)]
+    app.show_region_blur(boxes, SETTINGS, monitor=MONITOR)
+    assert len(app._region_overlays) == Blocksoft.App.MAX_REGION_OVERLAYS
+    assert len(visible(app)) == Blocksoft.App.MAX_REGION_OVERLAYS
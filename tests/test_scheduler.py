@@ -0,0 +1,70 @@
+import pytest
+
+import Blocksoft
+
+
+SETTINGS = {
+    'check_interval': 2.0,
+    'min_check_interval': 0.5,
+    'max_check_interval': 10.0,
+    'idle_backoff': 1.5,
+    'change_threshold': 6.0,
+    'near_miss_ratio': 0.8,
+    'scan_cpu_budget': 0.5,
+}
+
+
+def make_scheduler(**overrides):
+    return Blocksoft.ScanScheduler(dict(SETTINGS, **overrides))
+
+
+def test_idle_screen_backs_off_to_the_maximum():
+    scheduler = make_scheduler()
+    delays = [scheduler.next_delay(changed=False, now=0.0) for _ in range(6)]
+    assert delays == pytest.approx([3.0, 4.5, 6.75, 10.0, 10.0, 10.0])
+    assert scheduler.state == 'idle'
+
+
+def test_change_returns_to_the_base_interval():
+    scheduler = make_scheduler()
+    for _ in range(3):
+        scheduler.next_delay(changed=False, now=0.0)
+    assert scheduler.next_delay(changed=True, change_score=10.0, now=0.0) == 2.0
+    assert scheduler.state == 'active'
+    # The backoff starts over from the base interval
+    assert scheduler.next_delay(changed=False, now=0.0) == pytest.approx(3.0)
+
+
+def test_big_change_or_near_match_scans_fast():
+    scheduler = make_scheduler()
+    assert scheduler.next_delay(changed=True, change_score=30.0, now=0.0) == 0.5
+    assert scheduler.state == 'fast'
+    scheduler.reset()
+    assert scheduler.next_delay(changed=False, partial=0.8, now=0.0) == 0.5
+    assert scheduler.state == 'fast'
+
+
+def test_cooldown_is_a_state_with_a_deadline():
+    scheduler = make_scheduler()
+    scheduler.enter_cooldown(5.0, now=100.0)
+    assert scheduler.state == 'cooldown'
+    assert scheduler.next_delay(changed=True, change_score=30.0, now=101.0) == pytest.approx(4.0)
+    assert scheduler.next_delay(changed=False, now=104.5) == pytest.approx(0.5)
+    assert scheduler.state == 'cooldown'
+    assert scheduler.next_delay(changed=True, change_score=10.0, now=105.0) == 2.0
+    assert scheduler.state == 'active'
+
+
+def test_cpu_budget_stretches_the_delay():
+    # 3 s of work at a 25% budget needs 9 s of rest
+    scheduler = make_scheduler(scan_cpu_budget=0.25)
+    assert scheduler.next_delay(changed=True, change_score=10.0, busy_seconds=3.0, now=0.0) == pytest.approx(9.0)
+    # ... but never beyond max_check_interval
+    assert scheduler.next_delay(changed=True, change_score=10.0, busy_seconds=30.0, now=0.0) == 10.0
+
+
+def test_bounds_are_respected():
+    scheduler = make_scheduler(check_interval=0.1, min_check_interval=0.01, max_check_interval=0.02)
+    # min_check_interval never drops below 50 ms, and max never below min
+    assert scheduler.next_delay(changed=True, change_score=10.0, now=0.0) == pytest.approx(0.05)
+    assert scheduler.next_delay(changed=False, now=0.0) == pytest.approx(0.05)
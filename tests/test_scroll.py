@@ -0,0 +1,89 @@
+from PIL import Image, ImageDraw
+
+import Blocksoft
+
+
+WIDTH, HEIGHT, VIEW = 300, 1200, 400
+
+
+def make_page():
+    """A page of 'words': solid blocks whose gray value is their id, one line every 30 px."""
+    page = Image.new('L', (WIDTH, HEIGHT), 255)
+    draw = ImageDraw.Draw(page)
+    boxes = {}
+    value = 1
+    for top in range(10, HEIGHT - 30, 30):
+        left = 10
+        for width in (40 + top % 50, 60, 30 + top % 70):
+            draw.rectangle([left, top, left + width - 1, top + 14], fill=value)
+            boxes[value] = (left, top, left + width, top + 15)
+            left += width + 20
+            value += 1
+    return page, boxes
+
+
+def words_in(view, boxes, offset):
+    """OcrWords for the blocks wholly inside the view starting at page row ``offset``."""
+    words = []
+    for value, (l, t, r, b) in boxes.items():
+        if t >= offset and b <= offset + VIEW:
+            words.append(Blocksoft.OcrWord(f'w{value}', (l, t - offset, r, b - offset), 90.0, t))
+    return words
+
+
+def check_scroll(offset):
+    page, boxes = make_page()
+    first = page.crop((0, 0, WIDTH, VIEW))
+    second = page.crop((0, offset, WIDTH, offset + VIEW))
+    tracker = Blocksoft.ScrollTracker()
+    tracker.commit(first, 'key', words_in(first, boxes, 0))
+    plan = tracker.plan(second, 'key', margin=16, max_dirty=0.9)
+    assert plan is not None
+    strips, kept = plan
+    expected = {w.text: w.box for w in words_in(second, boxes, offset)}
+    # Every reused word sits where the block really is in the new frame
+    for word in kept:
+        assert expected[word.text] == word.box
+    # Words not reused are inside a strip that gets OCR'd
+    reused = {w.text for w in kept}
+    for text, (l, t, r, b) in expected.items():
+        if text not in reused:
+            assert any(sl <= l and st <= t and r <= sr and b <= sb for sl, st, sr, sb in strips), text
+    # The strips only cover the newly exposed part (plus margin), not the whole frame
+    assert sum(b - t for _, t, _, b in strips) < min(VIEW, offset + 16 + 30 + 15)
+    return kept
+
+
+def test_scroll_reuses_moved_words():
+    for offset in (7, 45, 200):
+        assert check_scroll(offset)
+
+
+def test_unchanged_frame_reuses_everything():
+    page, boxes = make_page()
+    view = page.crop((0, 0, WIDTH, VIEW))
+    tracker = Blocksoft.ScrollTracker()
+    words = words_in(view, boxes, 0)
+    tracker.commit(view, 'key', words)
+    assert tracker.plan(view.copy(), 'key') == ([], words)
+
+
+def test_commit_keeps_its_own_copy():
+    page, boxes = make_page()
+    view = page.crop((0, 0, WIDTH, VIEW))
+    tracker = Blocksoft.ScrollTracker()
+    tracker.commit(view, 'key', words_in(view, boxes, 0))
+    scrolled = page.crop((0, 45, WIDTH, VIEW + 45))
+    # A capture source reusing its buffer overwrites the committed image in place
+    view.paste(scrolled)
+    strips, kept = tracker.plan(scrolled, 'key', margin=16, max_dirty=0.9)
+    assert strips
+    assert {w.text: w.box for w in kept}.items() <= {w.text: w.box for w in words_in(scrolled, boxes, 45)}.items()
+
+
+def test_other_settings_force_full_pass():
+    page, boxes = make_page()
+    view = page.crop((0, 0, WIDTH, VIEW))
+    tracker = Blocksoft.ScrollTracker()
+    tracker.commit(view, ('eng', 6, 3), [])
+    assert tracker.plan(view, ('rus', 6, 3)) is None
@@ -0,0 +1,75 @@
+import sys
+
+from PIL import Image
+
+import Blocksoft
+
+
+def size(key, text):
+    return sys.getsizeof(key) + sys.getsizeof(text)
+
+
+def test_hit_and_miss_counts():
+    cache = Blocksoft.TileTextCache()
+    assert cache.get('a') is None
+    cache.put('a', 'hello')
+    assert cache.get('a') == 'hello'
+    # A tile without text is cached too
+    cache.put('b', '')
+    assert cache.get('b') == ''
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (2, 1, 2)
+    assert stats['hit_rate'] == 2 / 3
+
+
+def test_bytes_follow_puts_and_replacements():
+    cache = Blocksoft.TileTextCache()
+    cache.put('a', 'x' * 10)
+    cache.put('b', 'y' * 20)
+    assert cache.bytes_used == size('a', 'x' * 10) + size('b', 'y' * 20)
+    cache.put('a', 'z' * 100)
+    assert cache.bytes_used == size('a', 'z' * 100) + size('b', 'y' * 20)
+    cache.clear()
+    assert cache.bytes_used == 0 and cache.stats()['entries'] == 0
+
+
+def test_least_recently_used_is_evicted_first():
+    entry = size('k0', 'x' * 50)
+    cache = Blocksoft.TileTextCache(max_bytes=3 * entry)
+    for i in range(3):
+        cache.put(f'k{i}', 'x' * 50)
+    cache.get('k0')
+    cache.put('k3', 'x' * 50)
+    assert cache.get('k1') is None
+    assert cache.get('k0') == cache.get('k2') == cache.get('k3') == 'x' * 50
+    assert cache.evictions == 1
+    assert cache.bytes_used == 3 * entry <= cache.max_bytes
+
+
+def test_memory_cap_holds():
+    cache = Blocksoft.TileTextCache(max_bytes=4096)
+    for i in range(500):
+        cache.put(f'key{i}', 'text ' * (i % 20))
+        assert cache.bytes_used <= cache.max_bytes
+    assert cache.evictions > 0
+    assert cache.bytes_used == sum(size(k, t) for k, t in cache._entries.items())
+
+
+def test_oversized_entry_is_kept_alone():
+    cache = Blocksoft.TileTextCache(max_bytes=100)
+    cache.put('a', 'small')
+    cache.put('b', 'x' * 1000)
+    assert cache.stats()['entries'] == 1
+    assert cache.get('b') == 'x' * 1000
+
+
+def test_key_follows_pixels_and_settings():
+    tile = Image.new('L', (32, 32), 255)
+    same = Image.new('L', (32, 32), 255)
+    other = Image.new('L', (32, 32), 255)
+    other.putpixel((5, 5), 0)
+    key = Blocksoft.TileTextCache.key_for
+    assert key(tile, 'eng', 6) == key(same, 'eng', 6)
+    assert key(tile, 'eng', 6) != key(other, 'eng', 6)
+    assert key(tile, 'eng', 6) != key(tile, 'deu', 6)
+    assert key(tile) != key(tile.convert('RGB'))
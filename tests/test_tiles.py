@@ -0,0 +1,55 @@
+import pytest
+
+import Blocksoft
+
+
+def covered(width, height, tiles):
+    grid = [[0] * width for _ in range(height)]
+    for left, top, right, bottom in tiles:
+        for y in range(top, bottom):
+            row = grid[y]
+            for x in range(left, right):
+                row[x] += 1
+    return grid
+
+
+@pytest.mark.parametrize('width, height, size, overlap', [
+    (1000, 700, 256, 32),
+    (512, 512, 256, 0),
+    (300, 100, 128, 64),
+    (1279, 721, 200, 48),
+])
+def test_tiles_cover_the_frame(width, height, size, overlap):
+    tiles = Blocksoft.split_tiles(width, height, size, overlap)
+    grid = covered(width, height, tiles)
+    assert all(count for row in grid for count in row)
+    for left, top, right, bottom in tiles:
+        assert 0 <= left < right <= width and 0 <= top < bottom <= height
+        assert right - left <= size and bottom - top <= size
+
+
+def test_neighbours_share_the_overlap():
+    tiles = Blocksoft.split_tiles(1000, 256, 256, 32)
+    lefts = sorted({t[0] for t in tiles})
+    rights = sorted({t[2] for t in tiles})
+    for right, next_left in zip(rights, lefts[1:]):
+        assert right - next_left >= 32
+
+
+def test_word_on_a_boundary_is_whole_in_some_tile():
+    tiles = Blocksoft.split_tiles(1000, 700, 256, 32)
+    # Any box up to the overlap in size fits wholly inside at least one tile
+    for left in range(0, 1000 - 32, 7):
+        for top in range(0, 700 - 20, 11):
+            box = (left, top, left + 32, top + 20)
+            assert any(t[0] <= box[0] and t[1] <= box[1] and t[2] >= box[2] and t[3] >= box[3] for t in tiles)
+
+
+def test_small_frame_is_one_tile():
+    assert Blocksoft.split_tiles(200, 100, 256, 32) == [(0, 0, 200, 100)]
+
+
+def test_limits():
+    # Tiles are at least 64 px and overlap at most half a tile
+    tiles = Blocksoft.split_tiles(200, 64, 10, 500)
+    assert tiles == [(0, 0, 64, 64), (32, 0, 96, 64), (64, 0, 128, 64), (96, 0, 160, 64), (128, 0, 192, 64), (136, 0, 200, 64)]
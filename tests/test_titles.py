@@ -0,0 +1,64 @@
+from PIL import Image
+
+import Blocksoft
+
+
+class WhiteScreen(Blocksoft.CaptureSource):
+    name = 'white'
+
+    def grab(self):
+        return Image.new('RGB', (800, 600), 'white')
+
+
+WINDOWS = [
+    Blocksoft.WindowInfo('Inbox - Mail', (0, 0, 400, 300), False),
+    Blocksoft.WindowInfo('P0rn Hub - Firefox', (1000, 100, 1500, 500), True),
+]
+
+
+def make_checker(monitor, blur_mode='full', windows=WINDOWS):
+    detections = []
+    settings = dict(Blocksoft.DEFAULT_SETTINGS, sensitive_keywords=['porn'], blur_mode=blur_mode,
+                    blur_region_margin=16, idle_pause_seconds=0, pause_when_locked=False)
+    checker = Blocksoft.ScreenChecker(
+        settings, on_detect=lambda image, s, mon, regions=None: detections.append((mon, regions)),
+        capture_source=WhiteScreen(), monitor=monitor, title_source=Blocksoft.StaticTitleSource(windows))
+    return checker, detections
+
+
+def test_title_hit_on_its_monitor():
+    checker, detections = make_checker((800, 0, 800, 600))
+    frame = checker._check_titles()
+    assert frame is not None
+    assert [h.keyword for h in frame.hits] == ['porn']
+    assert detections == [((800, 0, 800, 600), None)]
+    checker.close()
+
+
+def test_title_on_other_monitor_is_ignored():
+    checker, detections = make_checker((0, 0, 800, 600))
+    assert checker._check_titles() is None
+    assert detections == []
+    checker.close()
+
+
+def test_regions_mode_blurs_the_window():
+    checker, detections = make_checker((800, 0, 800, 600), blur_mode='regions')
+    checker._check_titles()
+    # Window box (1000, 100, 1500, 500) made monitor-relative, grown by the margin
+    assert detections == [((800, 0, 800, 600), [(184, 84, 716, 516)])]
+    checker.close()
+
+
+def test_clean_titles_do_not_grab():
+    checker, detections = make_checker(None, windows=[Blocksoft.WindowInfo('Inbox - Mail', None, True)])
+    assert checker._check_titles() is None
+    assert detections == []
+    checker.close()
+
+
+def test_title_prescreen_off():
+    checker, detections = make_checker((800, 0, 800, 600))
+    checker.settings['title_prescreen'] = False
+    assert checker._check_titles() is None
+    checker.close()
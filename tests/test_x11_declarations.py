@@ -0,0 +1,41 @@
+import inspect
+import re
+
+import Blocksoft
+
+
+class FakeFunction:
+    pass
+
+
+class FakeLib:
+    """Stands in for a ctypes CDLL: attributes are functions that accept argtypes/restype."""
+
+    def __init__(self):
+        self.functions = {}
+
+    def __getattr__(self, name):
+        if name.startswith('__'):
+            raise AttributeError(name)
+        return self.functions.setdefault(name, FakeFunction())
+
+
+def called(source, lib):
+    """Names of the functions the source calls on ``lib`` (``x11.X...(`` or ``self._x11.X...(``)."""
+    return set(re.findall(r'\b(?:self\._)?%s\.(\w+)\(' % lib, source))
+
+
+def test_every_shm_capture_call_has_argtypes():
+    source = inspect.getsource(Blocksoft.X11ShmCaptureSource)
+    capture = Blocksoft.X11ShmCaptureSource.__new__(Blocksoft.X11ShmCaptureSource)
+    libs = {'x11': FakeLib(), 'xext': FakeLib(), 'libc': FakeLib()}
+    capture._x11, capture._xext, capture._libc = libs['x11'], libs['xext'], libs['libc']
+    capture._declare()
+    missing = []
+    for lib, fake in libs.items():
+        names = called(source, lib)
+        assert names, lib
+        for name in sorted(names):
+            if not hasattr(fake.functions.get(name), 'argtypes'):
+                missing.append(f'{lib}.{name}')
+    assert missing == []